@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Analysis Cache for PayRox Go Beyond
+Content-addressed, size-bounded LRU store of per-contract analysis results
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import time
+from typing import Dict, List, Any, Iterable, Optional, TextIO
+
+DEFAULT_CACHE_DIR = '.security-cache/analysis'
+
+# Keeps the cache comfortably inside the GitHub Actions cache quota
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+# Bump when the cached result format changes to invalidate old entries
+CACHE_FORMAT = 2
+
+INDEX_FILE = 'index.json'
+
+_IMPORT = re.compile(r'^\s*import\s+(?:[^;]*?\s+from\s+)?["\']([^"\']+)["\']', re.MULTILINE)
+
+def discover_contracts(root: str) -> List[str]:
+    """Find every Solidity source under the contracts root"""
+    contracts = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.endswith('.sol'):
+                contracts.append(os.path.join(dirpath, filename).replace(os.sep, '/'))
+    return contracts
+
+def detect_tool_version(command: List[str]) -> str:
+    """Version string reported by an analysis tool, or '' if it cannot be run"""
+    try:
+        proc = subprocess.run(command, capture_output=True, text=True, timeout=60)
+        return (proc.stdout or proc.stderr).strip()
+    except (OSError, subprocess.TimeoutExpired):
+        return ''
+
+def load_config(config_path: str) -> Any:
+    """Parsed tool configuration file, or its raw text if it is not JSON"""
+    try:
+        with open(config_path, 'r') as f:
+            text = f.read()
+    except OSError:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+class SourceHasher:
+    """Hashes contracts together with their transitive imports, memoizing per file"""
+
+    def __init__(self, search_paths: Optional[List[str]] = None):
+        self.search_paths = search_paths or ['.', 'node_modules']
+        self._digests: Dict[str, str] = {}
+        self._imports: Dict[str, List[str]] = {}
+
+    def _read(self, path: str) -> None:
+        try:
+            with open(path, 'rb') as f:
+                source = f.read()
+        except OSError:
+            self._digests[path] = 'missing'
+            self._imports[path] = []
+            return
+        self._digests[path] = hashlib.sha256(source).hexdigest()
+        text = source.decode('utf-8', errors='replace')
+        self._imports[path] = [self._resolve(path, target) for target in _IMPORT.findall(text)]
+
+    def _resolve(self, importer: str, target: str) -> str:
+        """Resolve a Solidity import path the way the Hardhat compiler would"""
+        if target.startswith('.'):
+            return os.path.normpath(os.path.join(os.path.dirname(importer), target)).replace(os.sep, '/')
+        for base in self.search_paths:
+            candidate = os.path.normpath(os.path.join(base, target)).replace(os.sep, '/')
+            if os.path.exists(candidate):
+                return candidate
+        # Unresolvable imports still contribute their name to the key
+        return target
+
+    def closure(self, path: str) -> List[str]:
+        """The contract and every file it imports, transitively"""
+        seen = set()
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            if current not in self._digests:
+                self._read(current)
+            stack.extend(self._imports[current])
+        return sorted(seen)
+
+    def key(self, path: str, tool: str, tool_version: str, config: Any) -> str:
+        """Cache key for one contract under one tool configuration"""
+        h = hashlib.sha256()
+        h.update(json.dumps([CACHE_FORMAT, tool, tool_version, config], sort_keys=True).encode())
+        for source in self.closure(path):
+            h.update(f"\0{source}\0{self._digests[source]}".encode())
+        return h.hexdigest()
+
+def contract_keys(contracts: List[str], tool: str, tool_version: str, config: Any) -> Dict[str, str]:
+    """Cache keys for a set of contracts, sharing import hashing between them"""
+    hasher = SourceHasher()
+    return {contract: hasher.key(contract, tool, tool_version, config) for contract in contracts}
+
+def project_key(keys: Dict[str, str]) -> str:
+    """Cache key for results outside any keyed contract, valid while no contract changes"""
+    h = hashlib.sha256()
+    for contract, key in sorted(keys.items()):
+        h.update(f"\0{contract}\0{key}".encode())
+    return h.hexdigest()
+
+class AnalysisCache:
+    """Per-contract result store keyed by content hash with LRU eviction"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict[str, float]]:
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Warning: Resetting unreadable cache index: {e}")
+            return {}
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, key: str, count: bool = True) -> Optional[Any]:
+        """Cached result for a key, refreshing its recency; `count` tallies hits and misses"""
+        if key not in self._index:
+            self.misses += count
+            return None
+        try:
+            with open(self._entry_path(key), 'r') as f:
+                data = json.load(f)
+        except Exception:
+            del self._index[key]
+            self.misses += count
+            return None
+        self._index[key]['last_used'] = time.time()
+        self.hits += count
+        return data
+
+    def put(self, key: str, data: Any) -> None:
+        """Store a result and evict least recently used entries over the bound"""
+        path = self._entry_path(key)
+        with open(path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        self._adopt(key, path)
+
+    def _adopt(self, key: str, path: str) -> None:
+        """Index an entry file written at `path`, moving it into place"""
+        entry_path = self._entry_path(key)
+        if path != entry_path:
+            os.replace(path, entry_path)
+        self._index[key] = {'size': os.path.getsize(entry_path), 'last_used': time.time()}
+        self._evict()
+
+    def total_bytes(self) -> int:
+        return sum(entry['size'] for entry in self._index.values())
+
+    def _evict(self) -> None:
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+        for key in sorted(self._index, key=lambda k: self._index[k]['last_used']):
+            if total <= self.max_bytes:
+                break
+            total -= self._index.pop(key)['size']
+            try:
+                os.remove(self._entry_path(key))
+            except OSError:
+                pass
+
+    def save(self) -> None:
+        """Persist the index; call once after a run"""
+        with open(os.path.join(self.cache_dir, INDEX_FILE), 'w') as f:
+            json.dump(self._index, f)
+
+class PendingEntries:
+    """List results streamed to disk per key, entering the cache only on commit
+
+    Items are appended to a staging file per key as they arrive, so a large
+    result is never held in memory, and nothing reaches the cache before the
+    caller knows the analysis that produced it is complete.
+    """
+
+    def __init__(self, cache: AnalysisCache):
+        self.cache = cache
+        self._files: Dict[str, TextIO] = {}
+
+    def _staging_path(self, key: str) -> str:
+        return os.path.join(self.cache.cache_dir, f"{key}.pending")
+
+    def add(self, key: str, item: Any) -> None:
+        f = self._files.get(key)
+        if f is None:
+            f = self._files[key] = open(self._staging_path(key), 'w')
+            f.write('[')
+        else:
+            f.write(',')
+        json.dump(item, f, separators=(',', ':'))
+
+    def commit(self, keys: Iterable[str]) -> None:
+        """Store the staged lists of `keys` (empty if nothing was added) and drop the rest"""
+        keys = set(keys)
+        for key, f in self._files.items():
+            if key in keys:
+                f.write(']')
+            f.close()
+        for key in keys:
+            if key in self._files:
+                self.cache._adopt(key, self._staging_path(key))
+            else:
+                self.cache.put(key, [])
+        self._files = {key: f for key, f in self._files.items() if key not in keys}
+        self.discard()
+
+    def discard(self) -> None:
+        for key, f in self._files.items():
+            f.close()
+            try:
+                os.remove(self._staging_path(key))
+            except OSError:
+                pass
+        self._files = {}
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect the PayRox Go Beyond analysis cache')
+    parser.add_argument('command', choices=['stale', 'stats'],
+                        help='stale: list contracts without a cached Slither result; stats: cache usage')
+    parser.add_argument('--slither-version', help='Slither version (default: ask slither)')
+    parser.add_argument('--config', default='.github/security/slither.config.json',
+                        help='Slither configuration file folded into the key')
+    parser.add_argument('--contracts-root', default='contracts', help='Directory searched for .sol files')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Cache directory')
+
+    args = parser.parse_args()
+    cache = AnalysisCache(args.cache_dir)
+
+    if args.command == 'stats':
+        print(f"Entries: {len(cache)}")
+        print(f"Size: {cache.total_bytes() / (1024 * 1024):.1f} MB of {cache.max_bytes / (1024 * 1024):.0f} MB")
+        return
+
+    version = args.slither_version
+    if version is None:
+        version = detect_tool_version(['slither', '--version'])
+    keys = contract_keys(discover_contracts(args.contracts_root), 'slither', version, load_config(args.config))
+    # Findings outside the contracts root can only be restored together with
+    # every contract's, so without them the whole project is stale
+    everything = bool(keys) and project_key(keys) not in cache
+    for contract, key in keys.items():
+        if everything or key not in cache:
+            print(contract)
+
+if __name__ == "__main__":
+    main()
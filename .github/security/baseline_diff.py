@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Baseline Diff for PayRox Go Beyond
+Stable finding fingerprints and new/resolved/unchanged comparison against a baseline run
+"""
+
+import hashlib
+import json
+from collections import Counter
+from typing import Dict, List, Any, Iterable, Tuple
+
+from findings import Finding
+
+def normalize_path(path: str) -> str:
+    """Repo-relative POSIX path, independent of where the tool was run"""
+    path = path.replace('\\', '/')
+    marker = path.find('/contracts/')
+    if marker != -1:
+        path = path[marker + 1:]
+    return path[2:] if path.startswith('./') else path
+
+def normalized_spans(finding: Finding) -> Tuple[Tuple[str, int, int], ...]:
+    """Spans re-based to the first span in each file, so line shifts elsewhere don't matter"""
+    anchors: Dict[str, int] = {}
+    spans = []
+    for filename, start, end in finding.spans:
+        anchor = anchors.setdefault(filename, start)
+        spans.append((normalize_path(filename), start - anchor, end - anchor))
+    return tuple(spans)
+
+def fingerprint(finding: Finding) -> str:
+    """Stable identity of a finding across runs, ignoring the volatile `id`"""
+    if finding.tool == 'mythril':
+        # Mythril reports a single line and no stable span shape
+        parts = (finding.tool, finding.swc_id or finding.check,
+                 normalize_path(finding.filename), finding.function)
+    else:
+        parts = (finding.tool, finding.check, finding.contract, finding.function,
+                 normalized_spans(finding))
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+def diff_findings(current: Iterable[Finding], baseline: Iterable[Finding]) -> Dict[str, Any]:
+    """Split findings into added, resolved and unchanged using fingerprint multisets"""
+    baseline_counts: Counter = Counter()
+    baseline_severity: Dict[str, str] = {}
+    for finding in baseline:
+        fp = fingerprint(finding)
+        baseline_counts[fp] += 1
+        baseline_severity.setdefault(fp, finding.severity)
+
+    added: Dict[str, List[Finding]] = {}
+    unchanged: Counter = Counter()
+    for finding in current:
+        fp = fingerprint(finding)
+        if baseline_counts[fp] > 0:
+            baseline_counts[fp] -= 1
+            unchanged[finding.severity] += 1
+        else:
+            added.setdefault(finding.severity, []).append(finding)
+
+    resolved: Counter = Counter()
+    for fp, count in baseline_counts.items():
+        if count > 0:
+            resolved[baseline_severity[fp]] += count
+
+    return {'added': added, 'resolved': dict(resolved), 'unchanged': dict(unchanged)}
+
+def gated_findings(diff: Dict[str, Any], gate_severities: Iterable[str]) -> List[Finding]:
+    """New findings at severities that should fail the build"""
+    return [finding for severity in gate_severities for finding in diff['added'].get(severity, [])]
+
+def write_diff_markdown(diff: Dict[str, Any], severities: List[str], gate_severities: List[str],
+                        title: str, path: str) -> None:
+    """Write the counts-only diff summary used in place of the full listing"""
+    gated = gated_findings(diff, gate_severities)
+
+    with open(path, 'w') as f:
+        f.write(f"# {title} (changes vs. baseline)\n\n")
+        f.write("| Severity | New | Resolved | Unchanged |\n")
+        f.write("|----------|-----|----------|-----------|\n")
+        for severity in severities:
+            f.write(f"| {severity.capitalize()} | {len(diff['added'].get(severity, []))} "
+                    f"| {diff['resolved'].get(severity, 0)} | {diff['unchanged'].get(severity, 0)} |\n")
+        f.write("\n")
+
+        gate_label = '/'.join(severity.lower() for severity in gate_severities)
+        if gated:
+            f.write(f"🚨 **{len(gated)} new {gate_label} findings introduced by this change**\n")
+        else:
+            f.write(f"✅ **No new {gate_label} findings**\n")
+        f.write("\n📝 *Full detailed report available in security artifacts*\n")
+
+def write_diff_json(diff: Dict[str, Any], gate_severities: List[str], path: str) -> None:
+    """Machine-readable counts plus the gating findings for CI"""
+    with open(path, 'w') as f:
+        json.dump({
+            'added': {severity: len(findings) for severity, findings in diff['added'].items()},
+            'resolved': diff['resolved'],
+            'unchanged': diff['unchanged'],
+            'gated': [{
+                'fingerprint': fingerprint(finding),
+                'severity': finding.severity,
+                'check': finding.check,
+                'contract': finding.contract or finding.filename,
+                'function': finding.function
+            } for finding in gated_findings(diff, gate_severities)]
+        }, f, indent=2)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Security Processor Benchmarks for PayRox Go Beyond
+Times each processing stage on synthetic reports and records peak memory and allocations
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+import mythril_processor
+import slither_processor
+import synthetic_reports
+from report_renderer import ReportContext, render_report, report_sinks
+from security_pipeline import mythril_data_from_categories, slither_data_from_categories
+from security_summary import calculate_security_score, generate_security_summary
+from source_snippets import SnippetIndex
+
+DEFAULT_SCALES = [1, 100, 10000]
+
+# Synthetic findings point at the real contracts, resolved from the repo root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# json.load of the whole report needs several times the file size in memory;
+# skip the legacy loader above this size instead of OOM-killing the benchmark
+DEFAULT_LEGACY_MAX_MB = 512
+
+def _slither_categories(paths: Dict[str, str]) -> Any:
+    return slither_processor.stream_slither_report(paths['slither_report'])
+
+def _mythril_issues(paths: Dict[str, str]) -> Any:
+    return mythril_processor.load_mythril_reports(paths['mythril_dir'])
+
+def _mythril_categories(paths: Dict[str, str]) -> Any:
+    return mythril_processor.categorize_mythril_findings(_mythril_issues(paths))
+
+def _render_summary(paths: Dict[str, str], data: Tuple[Any, Any]) -> None:
+    slither_data = slither_data_from_categories(data[0])
+    mythril_data = mythril_data_from_categories(data[1])
+    calculate_security_score(slither_data, mythril_data)
+    generate_security_summary(slither_data, mythril_data, os.path.join(paths['output_dir'], 'security-summary.md'))
+
+def _render_reports(paths: Dict[str, str], data: Tuple[Any, Any],
+                    snippets: Optional[SnippetIndex] = None) -> None:
+    tools = [slither_processor.tool_results(data[0]), mythril_processor.tool_results(data[1])]
+    render_report(ReportContext(tools, snippets=snippets), report_sinks(paths['output_dir']))
+
+# stage name -> (untimed setup, timed body); each runs in a fresh process
+STAGES: Dict[str, Tuple[Callable[[Dict[str, str]], Any], Callable[[Dict[str, str], Any], Any]]] = {
+    'slither_load_legacy': (
+        lambda paths: None,
+        lambda paths, _: slither_processor.load_slither_report(paths['slither_report'])),
+    'slither_categorize_legacy': (
+        lambda paths: slither_processor.load_slither_report(paths['slither_report']),
+        lambda paths, report: slither_processor.categorize_findings(report)),
+    'slither_stream_categorize': (
+        lambda paths: None,
+        lambda paths, _: _slither_categories(paths)),
+    'slither_render': (
+        _slither_categories,
+        lambda paths, categories: slither_processor.write_slither_outputs(categories, paths['output_dir'])),
+    'mythril_load': (
+        lambda paths: None,
+        lambda paths, _: _mythril_issues(paths)),
+    'mythril_categorize': (
+        _mythril_issues,
+        lambda paths, issues: mythril_processor.categorize_mythril_findings(issues)),
+    'mythril_render': (
+        _mythril_categories,
+        lambda paths, categories: mythril_processor.generate_mythril_summary(categories, paths['output_dir'])),
+    'summary_render': (
+        lambda paths: (_slither_categories(paths), _mythril_categories(paths)),
+        _render_summary),
+    'report_render': (
+        lambda paths: (_slither_categories(paths), _mythril_categories(paths)),
+        _render_reports),
+    'report_render_snippets': (
+        lambda paths: (_slither_categories(paths), _mythril_categories(paths)),
+        lambda paths, data: _render_reports(paths, data, SnippetIndex([REPO_ROOT]))),
+}
+
+LEGACY_STAGES = ('slither_load_legacy', 'slither_categorize_legacy')
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _stage_worker(stage: str, paths: Dict[str, str], trace: bool, conn) -> None:
+    """Run one stage in a fresh process and report its measurements"""
+    setup, body = STAGES[stage]
+    data = setup(paths)
+    gc.collect()
+    rss_before = _peak_rss_mb()
+    if trace:
+        tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    result = body(paths, data)
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    measurement = {
+        'wall_s': round(wall, 6),
+        'cpu_s': round(cpu, 6),
+        'peak_rss_mb': round(_peak_rss_mb(), 2),
+        'setup_peak_rss_mb': round(rss_before, 2),
+        'retained_blocks': sys.getallocatedblocks() - blocks_before
+    }
+    if trace:
+        snapshot = tracemalloc.take_snapshot()
+        measurement['traced_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 3)
+        measurement['live_allocations'] = sum(stat.count for stat in snapshot.statistics('filename'))
+        tracemalloc.stop()
+    del result
+    conn.send(measurement)
+    conn.close()
+
+def measure_stage(stage: str, paths: Dict[str, str], trace: bool) -> Dict[str, Any]:
+    """Measure a stage in a spawned interpreter so RSS is not inherited"""
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_stage_worker, args=(stage, paths, trace, sender))
+    process.start()
+    sender.close()
+    try:
+        measurement = receiver.recv()
+    except EOFError:
+        measurement = {'error': f"stage process exited with code {process.join() or process.exitcode}"}
+    process.join()
+    return measurement
+
+def run_scale(scale: int, seed: int, work_dir: str, stages: List[str], trace: bool,
+              legacy_max_mb: float, template: str) -> Dict[str, Any]:
+    """Generate one scaled report set and benchmark every stage on it"""
+    report_dir = os.path.join(work_dir, f"scale-{scale}")
+    output_dir = os.path.join(report_dir, 'out')
+    os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    info = synthetic_reports.generate(report_dir, scale, seed, template)
+    print(f"📦 {scale}x: {info['slither_findings']} Slither findings "
+          f"({info['slither_bytes'] / (1024 * 1024):.1f} MB), {info['mythril_findings']} Mythril issues "
+          f"generated in {time.perf_counter() - start:.1f}s")
+
+    paths = {'slither_report': info['slither_report'], 'mythril_dir': info['mythril_dir'],
+             'output_dir': output_dir}
+    results: Dict[str, Any] = {}
+    for stage in stages:
+        if stage in LEGACY_STAGES and info['slither_bytes'] > legacy_max_mb * 1024 * 1024:
+            results[stage] = {'skipped': f"report larger than {legacy_max_mb:.0f} MB"}
+            continue
+        results[stage] = measure_stage(stage, paths, trace)
+        m = results[stage]
+        if 'error' in m:
+            print(f"  {stage:<28} ❌ {m['error']}")
+        else:
+            print(f"  {stage:<28} {m['wall_s']:>9.3f}s wall {m['cpu_s']:>9.3f}s cpu "
+                  f"{m['peak_rss_mb']:>9.1f} MB peak RSS")
+
+    shutil.rmtree(report_dir, ignore_errors=True)
+    return {
+        'scale': scale,
+        'slither_findings': info['slither_findings'],
+        'mythril_findings': info['mythril_findings'],
+        'slither_report_bytes': info['slither_bytes'],
+        'stages': results
+    }
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(current: Dict[str, Any], baseline_path: str) -> None:
+    """Print wall time and peak RSS ratios against an earlier results file"""
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)
+    baseline_runs = {run['scale']: run for run in baseline.get('runs', [])}
+    print(f"\n📈 Compared with {baseline_path} ({(baseline.get('commit') or 'unknown')[:12]}):")
+    for run in current['runs']:
+        previous = baseline_runs.get(run['scale'])
+        if not previous:
+            continue
+        for stage, m in run['stages'].items():
+            old = previous['stages'].get(stage, {})
+            if 'wall_s' not in m or 'wall_s' not in old or not old['wall_s']:
+                continue
+            print(f"  {run['scale']:>6}x {stage:<28} wall x{m['wall_s'] / old['wall_s']:.2f}  "
+                  f"RSS x{m['peak_rss_mb'] / max(old['peak_rss_mb'], 0.01):.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the PayRox Go Beyond security processors')
+    parser.add_argument('--scales', default=','.join(map(str, DEFAULT_SCALES)),
+                        help='Comma-separated finding count multipliers')
+    parser.add_argument('--seed', type=int, default=0, help='Synthetic report seed')
+    parser.add_argument('--stages', default=','.join(STAGES), help='Comma-separated stages to run')
+    parser.add_argument('--no-trace', action='store_true', help='Skip tracemalloc allocation tracking')
+    parser.add_argument('--legacy-max-mb', type=float, default=DEFAULT_LEGACY_MAX_MB,
+                        help='Largest report the whole-file json.load stages are run on')
+    parser.add_argument('--template', default=synthetic_reports.DEFAULT_TEMPLATE, help='Real Slither report to model')
+    parser.add_argument('--work-dir', help='Scratch directory for generated reports (default: temp dir)')
+    parser.add_argument('--output', help='Results JSON (default: security-reports/benchmarks/benchmark-<commit>.json)')
+    parser.add_argument('--compare', help='Earlier results JSON to compare against')
+
+    args = parser.parse_args()
+    stages = [stage for stage in args.stages.split(',') if stage]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+
+    commit = current_commit()
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix='payrox-bench-')
+    results = {
+        'commit': commit,
+        'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'traced': not args.no_trace,
+        'runs': []
+    }
+    try:
+        for scale in (int(value) for value in args.scales.split(',') if value):
+            results['runs'].append(run_scale(scale, args.seed, work_dir, stages, not args.no_trace,
+                                             args.legacy_max_mb, args.template))
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = args.output or os.path.join('security-reports', 'benchmarks',
+                                         f"benchmark-{(commit or 'local')[:12]}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📝 Results written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
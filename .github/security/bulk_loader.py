@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Bulk Report Loader for PayRox Go Beyond
+Concurrent reads of many result files, with large ones decoded in worker processes
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Callable, Iterator, Optional, Sequence, Tuple
+
+# Reads are I/O bound (artifact storage is often network mounted), so the
+# thread pool is sized for outstanding requests rather than cores
+DEFAULT_IO_WORKERS = 16
+
+# Files at least this large are decoded in a worker process; below it the
+# pickling round trip costs more than decoding in the reading thread
+LARGE_REPORT_BYTES = 4 * 1024 * 1024
+
+# Worker processes are started while reader threads are running, which fork
+# does not survive reliably
+_POOL_CONTEXT = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+class LoadError:
+    """One file that could not be read or decoded"""
+
+    __slots__ = ('path', 'stage', 'error')
+
+    def __init__(self, path: str, stage: str, error: BaseException):
+        self.path = path
+        self.stage = stage
+        self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> Dict[str, str]:
+        return {'path': self.path, 'stage': self.stage, 'error': self.error}
+
+class LoadErrors:
+    """Structured error report of one or more bulk loads"""
+
+    def __init__(self):
+        self.files = 0
+        self.errors: List[LoadError] = []
+
+    def __len__(self) -> int:
+        return len(self.errors)
+
+    def __iter__(self) -> Iterator[LoadError]:
+        return iter(self.errors)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'files': self.files, 'failed': len(self.errors),
+                'errors': [error.to_dict() for error in sorted(self.errors, key=lambda error: error.path)]}
+
+    def write(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+def read_file(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+class BulkLoader:
+    """Read many files concurrently and decode each as its read completes
+
+    `load()` yields results in completion order, so a consumer works on
+    early files while later ones are still in flight and the whole load
+    takes about as long as the slowest file. `decode` must be a module-level
+    function so large files can be handed to a worker process; `processes=0`
+    decodes everything in the reading threads (e.g. inside a pool worker).
+    Failures are recorded in `errors` instead of being raised or printed.
+    """
+
+    def __init__(self, io_workers: int = DEFAULT_IO_WORKERS, processes: Optional[int] = None,
+                 large_bytes: int = LARGE_REPORT_BYTES):
+        self.io_workers = max(1, io_workers)
+        self.processes = (os.cpu_count() or 1) if processes is None else processes
+        self.large_bytes = large_bytes
+        self.errors = LoadErrors()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.processes,
+                                                 mp_context=multiprocessing.get_context(_POOL_CONTEXT))
+            return self._pool
+
+    def _load(self, path: str, decode: Callable[[bytes], Any]) -> Tuple[Optional[LoadError], Any]:
+        try:
+            data = read_file(path)
+        except OSError as e:
+            return LoadError(path, 'read', e), None
+        try:
+            if self.processes and len(data) >= self.large_bytes:
+                return None, self._process_pool().submit(decode, data).result()
+            return None, decode(data)
+        except Exception as e:
+            return LoadError(path, 'decode', e), None
+
+    def load(self, paths: Sequence[str], decode: Callable[[bytes], Any]) -> Iterator[Tuple[int, str, Any]]:
+        """Yield (index in paths, path, decoded value) for every file that loaded"""
+        self.errors.files += len(paths)
+        if not paths:
+            return
+        try:
+            with ThreadPoolExecutor(min(self.io_workers, len(paths))) as executor:
+                futures = {executor.submit(self._load, path, decode): index for index, path in enumerate(paths)}
+                for future in as_completed(futures):
+                    index = futures[future]
+                    error, value = future.result()
+                    if error is not None:
+                        self.errors.errors.append(error)
+                    else:
+                        yield index, paths[index], value
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Changed-Line Index for PayRox Go Beyond
+Unified-diff hunk reader and per-file interval trees over finding spans
+"""
+
+import argparse
+import re
+import sys
+from typing import Dict, List, Iterable, Iterator, Optional, Set, Tuple
+
+from baseline_diff import normalize_path
+from findings import Finding
+
+_HUNK = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+Hunks = Dict[str, List[Tuple[int, int]]]
+
+def parse_unified_diff(lines: Iterable[str]) -> Hunks:
+    """New-side line ranges touched by each file in a unified diff
+
+    Pure deletions count as touching the line they were removed after, so a
+    finding spanning the deletion point is still considered changed.
+    """
+    hunks: Hunks = {}
+    current: Optional[List[Tuple[int, int]]] = None
+    for line in lines:
+        if line.startswith('+++ '):
+            path = line[4:].rstrip('\n').split('\t', 1)[0]
+            if path == '/dev/null':
+                current = None
+                continue
+            if path.startswith('b/'):
+                path = path[2:]
+            current = hunks.setdefault(normalize_path(path), [])
+            continue
+        if current is None or not line.startswith('@@'):
+            continue
+        match = _HUNK.match(line)
+        if not match:
+            continue
+        start = int(match.group(1))
+        count = int(match.group(2)) if match.group(2) is not None else 1
+        if count == 0:
+            current.append((max(start, 1), max(start, 1)))
+        else:
+            current.append((start, start + count - 1))
+    return hunks
+
+def read_diff(path: str) -> Hunks:
+    """Parse a unified diff file, or stdin when path is '-'"""
+    if path == '-':
+        return parse_unified_diff(sys.stdin)
+    with open(path, 'r', errors='replace') as f:
+        return parse_unified_diff(f)
+
+class IntervalTree:
+    """Static interval tree over closed integer intervals
+
+    Intervals are sorted by start and laid out as an implicit balanced BST
+    (the middle of each slice is its root), with each node also storing the
+    largest end in its subtree. Overlap queries cost O(log n + k).
+    """
+
+    __slots__ = ('starts', 'ends', 'values', 'max_end')
+
+    def __init__(self, intervals: Iterable[Tuple[int, int, int]]):
+        ordered = sorted(intervals)
+        self.starts = [start for start, _, _ in ordered]
+        self.ends = [end for _, end, _ in ordered]
+        self.values = [value for _, _, value in ordered]
+        self.max_end = list(self.ends)
+        self._augment(0, len(ordered))
+
+    def _augment(self, lo: int, hi: int) -> int:
+        if lo >= hi:
+            return -1
+        mid = (lo + hi) // 2
+        best = max(self.ends[mid], self._augment(lo, mid), self._augment(mid + 1, hi))
+        self.max_end[mid] = best
+        return best
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlapping(self, start: int, end: int) -> Iterator[int]:
+        """Values of every interval intersecting [start, end]"""
+        stack = [(0, len(self.starts))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            # Nothing in this subtree reaches the query
+            if self.max_end[mid] < start:
+                continue
+            stack.append((lo, mid))
+            if self.starts[mid] <= end:
+                if self.ends[mid] >= start:
+                    yield self.values[mid]
+                stack.append((mid + 1, hi))
+
+class SpanIndex:
+    """Findings indexed by the source lines they cover, one tree per file"""
+
+    def __init__(self, findings: Iterable[Finding]):
+        self.findings: List[Finding] = []
+        by_file: Dict[str, List[Tuple[int, int, int]]] = {}
+        for finding in findings:
+            index = len(self.findings)
+            self.findings.append(finding)
+            for filename, start, end in finding.spans:
+                if filename:
+                    by_file.setdefault(normalize_path(filename), []).append((start, end, index))
+        self.trees = {filename: IntervalTree(intervals) for filename, intervals in by_file.items()}
+
+    def query(self, filename: str, start: int, end: int) -> Set[int]:
+        tree = self.trees.get(normalize_path(filename))
+        return set(tree.overlapping(start, end)) if tree else set()
+
+    def touched(self, hunks: Hunks) -> List[Finding]:
+        """Findings with any span intersecting a changed hunk, in input order"""
+        hits: Set[int] = set()
+        for filename, ranges in hunks.items():
+            tree = self.trees.get(filename)
+            if tree is None:
+                continue
+            for start, end in ranges:
+                hits.update(tree.overlapping(start, end))
+        return [self.findings[index] for index in sorted(hits)]
+
+def findings_on_changed_lines(findings: Iterable[Finding], hunks: Hunks) -> List[Finding]:
+    return SpanIndex(findings).touched(hunks)
+
+def write_changed_markdown(findings: List[Finding], severities: List[str], path: str,
+                           limit: int = 20) -> None:
+    """Append the changed-lines section to an already written summary"""
+    by_severity: Dict[str, List[Finding]] = {}
+    for finding in findings:
+        by_severity.setdefault(finding.severity, []).append(finding)
+
+    with open(path, 'a') as f:
+        f.write("\n## 🎯 Findings on Changed Lines\n\n")
+        if not findings:
+            f.write("✅ No findings touch the lines changed in this diff\n")
+            return
+        f.write("| Severity | Count |\n")
+        f.write("|----------|-------|\n")
+        for severity in severities:
+            f.write(f"| {severity.capitalize()} | {len(by_severity.get(severity, []))} |\n")
+        f.write("\n")
+        for severity in severities:
+            for finding in by_severity.get(severity, [])[:limit]:
+                location = ', '.join(f"{normalize_path(filename)}#L{start}-L{end}"
+                                     for filename, start, end in finding.spans[:3])
+                f.write(f"- **{severity.capitalize()}** `{finding.check}` {location}\n")
+
+def main():
+    parser = argparse.ArgumentParser(description='List findings that touch lines changed in a unified diff')
+    parser.add_argument('diff', help="Unified diff (e.g. `git diff -U0 base...HEAD`), or '-' for stdin")
+    parser.add_argument('--slither-report', help='Slither JSON report')
+    parser.add_argument('--mythril-dir', help='Directory containing mythril-*.json reports')
+
+    args = parser.parse_args()
+    # Imported here so the index itself only depends on findings
+    from findings_history import load_run_findings
+
+    hunks = read_diff(args.diff)
+    touched = findings_on_changed_lines(load_run_findings(args.slither_report, args.mythril_dir), hunks)
+    print(f"{sum(len(ranges) for ranges in hunks.values())} hunks in {len(hunks)} files; "
+          f"{len(touched)} findings on changed lines")
+    for finding in touched:
+        filename, start, end = finding.spans[0] if finding.spans else (finding.filename, 0, 0)
+        print(f"  {finding.tool:<8} {finding.severity:<14} {finding.check:<40} "
+              f"{normalize_path(filename)}:{start}-{end}")
+
+if __name__ == "__main__":
+    main()
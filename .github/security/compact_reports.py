@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Compact Report Format for PayRox Go Beyond
+gzip/lzma-compressed reports with redundant filename and line data normalized away
+"""
+
+import argparse
+import gzip
+import json
+import lzma
+import os
+import shutil
+import sys
+from collections import Counter
+from typing import Dict, List, Any, IO, Iterable, Iterator, Optional
+
+from findings import line_ranges
+
+COMPACT_FORMAT = 1
+
+# Compressed report suffixes in the order loaders look for them
+COMPRESSED_SUFFIXES = {'gz': '.gz', 'xz': '.xz'}
+REPORT_SUFFIXES = ('.json', '.json.gz', '.json.xz')
+
+_GZIP_MAGIC = b'\x1f\x8b'
+_XZ_MAGIC = b'\xfd7zXZ\x00'
+
+# Key order Slither emits source mappings in, restored on expansion so raw
+# detectors dumped from a compact report match the original byte for byte
+SOURCE_MAPPING_KEYS = ['start', 'length', 'filename_relative', 'filename_absolute', 'filename_short',
+                       'is_dependency', 'lines', 'starting_column', 'ending_column']
+
+def open_report(path: str) -> IO[str]:
+    """Open a plain, gzip or xz JSON file as a streamed text file
+
+    The format is detected from the leading bytes, not the file name.
+    """
+    with open(path, 'rb') as f:
+        magic = f.read(len(_XZ_MAGIC))
+    if magic.startswith(_GZIP_MAGIC):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if magic.startswith(_XZ_MAGIC):
+        return lzma.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r')
+
+def load_report(path: str) -> Any:
+    """Whole-document load of a plain or compressed JSON file, expanded if compact"""
+    with open_report(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict) and 'compact' in data:
+        return expand_report(data)
+    return data
+
+def decode_report(data: bytes) -> Any:
+    """load_report() of a file already read into memory"""
+    if data.startswith(_GZIP_MAGIC):
+        data = gzip.decompress(data)
+    elif data.startswith(_XZ_MAGIC):
+        data = lzma.decompress(data)
+    report = json.loads(data)
+    if isinstance(report, dict) and 'compact' in report:
+        return expand_report(report)
+    return report
+
+def find_report(path: str) -> Optional[str]:
+    """The legacy path if present, else its compressed counterpart"""
+    for suffix in ('',) + tuple(COMPRESSED_SUFFIXES.values()):
+        if os.path.exists(path + suffix):
+            return path + suffix
+    return None
+
+def is_report_file(filename: str) -> bool:
+    return filename.endswith(REPORT_SUFFIXES)
+
+def report_stem(filename: str) -> str:
+    """`mythril-X.json.gz` -> `mythril-X`"""
+    for suffix in sorted(REPORT_SUFFIXES, key=len, reverse=True):
+        if filename.endswith(suffix):
+            return filename[:-len(suffix)]
+    return filename
+
+def is_raw_mythril_report(filename: str) -> bool:
+    """Per-contract Mythril report, plain or compressed, as opposed to a rendered summary"""
+    return (filename.startswith('mythril-') and is_report_file(filename)
+            and report_stem(filename) not in ('mythril-summary', 'mythril-diff', 'mythril-load-errors'))
+
+def _source_mappings(node: Any) -> Iterator[Dict[str, Any]]:
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            mapping = node.get('source_mapping')
+            if isinstance(mapping, dict):
+                yield mapping
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+def filename_root(detectors: Iterable[Dict[str, Any]]) -> str:
+    """Most common absolute-path prefix in front of the relative filenames"""
+    roots: Counter = Counter()
+    for detector in detectors:
+        for mapping in _source_mappings(detector):
+            absolute = mapping.get('filename_absolute', '')
+            relative = mapping.get('filename_relative', '')
+            if relative and absolute.endswith(relative):
+                roots[absolute[:len(absolute) - len(relative)]] += 1
+    return roots.most_common(1)[0][0] if roots else ''
+
+def compact_source_mapping(mapping: Dict[str, Any], root: str) -> Dict[str, Any]:
+    """Drop derivable filenames and collapse `lines` into ranges, in place"""
+    relative = mapping.get('filename_relative')
+    if relative is not None:
+        if mapping.get('filename_absolute') == root + relative:
+            del mapping['filename_absolute']
+        if mapping.get('filename_short') == relative:
+            del mapping['filename_short']
+    lines = mapping.pop('lines', None)
+    if lines is not None:
+        mapping['line_ranges'] = line_ranges(lines)
+    return mapping
+
+def expand_source_mapping(mapping: Dict[str, Any], root: str) -> Dict[str, Any]:
+    """Restore the legacy source_mapping shape"""
+    relative = mapping.get('filename_relative')
+    if relative is not None:
+        mapping.setdefault('filename_absolute', root + relative)
+        mapping.setdefault('filename_short', relative)
+    ranges = mapping.pop('line_ranges', None)
+    if ranges is not None:
+        mapping['lines'] = [line for start, end in ranges for line in range(start, end + 1)]
+    ordered = {key: mapping[key] for key in SOURCE_MAPPING_KEYS if key in mapping}
+    ordered.update(mapping)
+    return ordered
+
+def _rewrite_mappings(node: Any, rewrite) -> None:
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            mapping = node.get('source_mapping')
+            if isinstance(mapping, dict):
+                node['source_mapping'] = rewrite(mapping)
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+def compact_detector(detector: Dict[str, Any], root: str) -> Dict[str, Any]:
+    _rewrite_mappings(detector, lambda mapping: compact_source_mapping(mapping, root))
+    return detector
+
+def expand_detector(detector: Dict[str, Any], root: str) -> Dict[str, Any]:
+    _rewrite_mappings(detector, lambda mapping: expand_source_mapping(mapping, root))
+    return detector
+
+def expand_report(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Legacy Slither report from a compact one loaded whole"""
+    root = report.pop('compact').get('filename_root', '')
+    results = report.pop('results', {})
+    for detector in results.get('detectors', []):
+        expand_detector(detector, root)
+    # Slither writes `success` and `error` ahead of `results`
+    report['results'] = results
+    return report
+
+def open_output(path: str) -> IO[str]:
+    """Text writer compressed according to the file extension"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wt', encoding='utf-8', compresslevel=9)
+    if path.endswith('.xz'):
+        return lzma.open(path, 'wt', encoding='utf-8', preset=6)
+    return open(path, 'w')
+
+def write_compact_slither_report(report_path: str, output_path: str) -> None:
+    """Rewrite a Slither report in compact form, one detector at a time"""
+    # Imported here: slither_processor loads reports through this module
+    from slither_processor import iter_slither_detectors
+
+    # Two streaming passes: the first only finds the common filename root
+    root = filename_root(iter_slither_detectors(report_path))
+    header: Dict[str, Any] = {}
+    with open_output(output_path) as out:
+        # `compact` goes first so streaming readers know how to expand detectors
+        out.write('{"compact":' + json.dumps({'format': COMPACT_FORMAT, 'filename_root': root}))
+        out.write(',"results":{"detectors":[')
+        for index, detector in enumerate(iter_slither_detectors(report_path, header)):
+            if index:
+                out.write(',')
+            out.write(json.dumps(compact_detector(detector, root), separators=(',', ':')))
+        out.write(']}')
+        for key, value in header.items():
+            out.write(f',{json.dumps(key)}:{json.dumps(value, separators=(",", ":"))}')
+        out.write('}')
+
+def write_compact_json(report_path: str, output_path: str) -> None:
+    """Recompress any other report (e.g. Mythril) as-is, streaming the bytes through"""
+    with open_report(report_path) as f, open_output(output_path) as out:
+        shutil.copyfileobj(f, out)
+
+def compact_reports(paths: List[str], compression: str = 'xz', keep: bool = False) -> List[str]:
+    """Replace each report with a compressed compact copy; returns the new paths"""
+    written = []
+    for path in paths:
+        output_path = report_stem(path) + '.json' + COMPRESSED_SUFFIXES[compression]
+        if output_path == path:
+            continue
+        # Write under a temporary name with the same compression suffix
+        temp_path = output_path[:-len(COMPRESSED_SUFFIXES[compression])] + '.tmp' + COMPRESSED_SUFFIXES[compression]
+        if os.path.basename(path).startswith('slither-report'):
+            write_compact_slither_report(path, temp_path)
+        else:
+            write_compact_json(path, temp_path)
+        os.replace(temp_path, output_path)
+        if not keep:
+            os.remove(path)
+        written.append(output_path)
+    return written
+
+def raw_mythril_reports(reports_dir: str) -> List[str]:
+    """Uncompressed per-contract Mythril reports, excluding rendered summaries"""
+    return [os.path.join(reports_dir, name) for name in sorted(os.listdir(reports_dir))
+            if name.endswith('.json') and is_raw_mythril_report(name)]
+
+def main():
+    parser = argparse.ArgumentParser(description='Compress PayRox Go Beyond security reports')
+    parser.add_argument('paths', nargs='+', help='Report files, or directories of slither-report/mythril-* reports')
+    parser.add_argument('--format', choices=sorted(COMPRESSED_SUFFIXES), default='xz', help='Compression')
+    parser.add_argument('--keep', action='store_true', help='Keep the uncompressed reports')
+
+    args = parser.parse_args()
+    paths = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            # The same selection the loaders use, so rendered summaries are left alone
+            paths.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                         if (is_report_file(name) and report_stem(name) == 'slither-report')
+                         or is_raw_mythril_report(name))
+        elif os.path.exists(path):
+            paths.append(path)
+        else:
+            print(f"Error: {path} not found")
+            sys.exit(1)
+
+    for path in paths:
+        before = os.path.getsize(path)
+        output_path = compact_reports([path], args.format, args.keep)
+        if output_path:
+            after = os.path.getsize(output_path[0])
+            print(f"{os.path.basename(path)} -> {os.path.basename(output_path[0])}: "
+                  f"{before / 1024:.1f} KB -> {after / 1024:.1f} KB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Cross-Tool Finding Correlation for PayRox Go Beyond
+Groups Slither and Mythril findings about the same underlying issue into clusters scored once
+"""
+
+from collections import deque
+from typing import Dict, List, Any, Deque, Iterable, Optional, Tuple
+
+from baseline_diff import fingerprint, normalize_path
+from findings import Finding
+
+# Tools whose findings are paired up; findings of one tool are never merged
+CORRELATED_TOOLS = ('slither', 'mythril')
+
+# Slither detectors and the SWC weakness class Mythril reports for the same bug
+CHECK_SWC = {
+    'arbitrary-send-erc20': '105',
+    'arbitrary-send-erc20-permit': '105',
+    'arbitrary-send-eth': '105',
+    'calls-loop': '113',
+    'controlled-array-length': '124',
+    'controlled-delegatecall': '112',
+    'costly-loop': '128',
+    'delegatecall-loop': '112',
+    'deprecated-standards': '111',
+    'encode-packed-collision': '133',
+    'incorrect-equality': '132',
+    'msg-value-loop': '113',
+    'reentrancy-benign': '107',
+    'reentrancy-eth': '107',
+    'reentrancy-events': '107',
+    'reentrancy-no-eth': '107',
+    'reentrancy-unlimited-gas': '107',
+    'rtlo': '130',
+    'shadowing-abstract': '119',
+    'shadowing-builtin': '119',
+    'shadowing-local': '119',
+    'shadowing-state': '119',
+    'suicidal': '106',
+    'timestamp': '116',
+    'tx-origin': '115',
+    'uninitialized-local': '109',
+    'uninitialized-state': '109',
+    'uninitialized-storage': '109',
+    'unchecked-lowlevel': '104',
+    'unchecked-send': '104',
+    'unchecked-transfer': '104',
+    'unused-return': '104',
+    'unused-state': '131',
+    'weak-prng': '120'
+}
+
+# Score inputs of calculate_security_score, most heavily weighted first. A
+# cluster counts once, under its most heavily weighted member.
+SCORE_FIELDS = [
+    (('slither', 'critical'), 'critical_issues'),
+    (('mythril', 'High'), 'high_severity'),
+    (('mythril', 'Medium'), 'medium_severity')
+]
+_FIELD_RANK = {key: rank for rank, (key, _) in enumerate(SCORE_FIELDS)}
+
+# Lines of a finding's primary span entered into the line join; whole-function
+# Slither spans rarely exceed this, and the cap keeps the join linear
+SPAN_LINES = 64
+
+def issue_class(finding: Finding) -> str:
+    """SWC id shared by both tools, else a tool-specific check name"""
+    if finding.tool == 'mythril':
+        return f"SWC-{finding.swc_id}" if finding.swc_id else f"mythril:{finding.check}"
+    swc = CHECK_SWC.get(finding.check)
+    return f"SWC-{swc}" if swc else f"slither:{finding.check}"
+
+def function_name(finding: Finding) -> str:
+    """Bare function name; Mythril reports signatures like `stage(bytes)`"""
+    name = finding.function.split('(', 1)[0]
+    return '' if name == 'Unknown' else name
+
+def _join_keys(finding: Finding, cls: str) -> Iterable[Tuple[Any, ...]]:
+    """Hash keys under which findings of the same class from two tools are the same issue"""
+    filename = normalize_path(finding.filename)
+    function = function_name(finding)
+    if function:
+        yield cls, filename, function
+    if finding.spans:
+        span_file, start, end = finding.spans[0]
+        if start and start >= 1:
+            span_file = normalize_path(span_file)
+            for line in range(start, min(max(start, end), start + SPAN_LINES - 1) + 1):
+                yield cls, span_file, line
+
+def _lead_rank(finding: Finding) -> int:
+    return _FIELD_RANK.get((finding.tool, finding.severity), len(SCORE_FIELDS))
+
+class Cluster:
+    """Findings judged to be one issue; `lead` is the one that counts towards the score"""
+
+    __slots__ = ('issue', 'findings', 'lead')
+
+    def __init__(self, issue: str, findings: List[Finding]):
+        self.issue = issue
+        self.findings = findings
+        self.lead = min(findings, key=_lead_rank)
+
+    @property
+    def tools(self) -> List[str]:
+        return sorted({finding.tool for finding in self.findings})
+
+    def score_field(self) -> Optional[str]:
+        rank = _lead_rank(self.lead)
+        return SCORE_FIELDS[rank][1] if rank < len(SCORE_FIELDS) else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'issue': self.issue,
+            'file': normalize_path(self.lead.filename),
+            'function': function_name(self.lead),
+            'tools': self.tools,
+            'findings': [{'tool': finding.tool, 'check': finding.check, 'severity': finding.severity,
+                          'fingerprint': fingerprint(finding)} for finding in self.findings]
+        }
+
+class Correlation:
+    """Clusters over one run's findings, most heavily weighted first"""
+
+    def __init__(self, clusters: List[Cluster]):
+        self.clusters = sorted(clusters, key=lambda cluster: _lead_rank(cluster.lead))
+        self._index = {id(finding): index for index, cluster in enumerate(self.clusters)
+                       for finding in cluster.findings}
+        self.tools = {finding.tool for cluster in self.clusters for finding in cluster.findings}
+
+    @property
+    def findings(self) -> int:
+        return len(self._index)
+
+    @property
+    def merged(self) -> int:
+        """Findings folded into another finding's cluster"""
+        return self.findings - len(self.clusters)
+
+    def cluster_of(self, finding: Finding) -> Optional[int]:
+        return self._index.get(id(finding))
+
+    def multi(self) -> List[Cluster]:
+        """Clusters holding more than one finding"""
+        return [cluster for cluster in self.clusters if len(cluster.findings) > 1]
+
+    def score_counts(self) -> Dict[str, int]:
+        counts = {field: 0 for _, field in SCORE_FIELDS}
+        for cluster in self.clusters:
+            field = cluster.score_field()
+            if field is not None:
+                counts[field] += 1
+        return counts
+
+    def apply(self, slither_data: Dict[str, Any], mythril_data: Dict[str, Any]) -> None:
+        """Replace the score inputs with per-cluster counts, in place
+
+        `correlated` records how many findings each input lost to a cluster
+        led by another finding. Inputs of tools without correlated findings,
+        e.g. loaded from rendered summaries, are left alone.
+        """
+        counts = self.score_counts()
+        for (tool, _), field in SCORE_FIELDS:
+            data = slither_data if tool == 'slither' else mythril_data
+            if tool not in self.tools or field not in data:
+                continue
+            folded = data[field] - counts[field]
+            data[field] = counts[field]
+            if folded:
+                data.setdefault('correlated', {})[field] = folded
+
+    def summary(self) -> Dict[str, int]:
+        return {'findings': self.findings, 'clusters': len(self.clusters), 'merged': self.merged,
+                'cross_tool': sum(1 for cluster in self.multi() if len(cluster.tools) > 1)}
+
+def correlate(findings: Iterable[Finding]) -> Correlation:
+    """Pair up Slither and Mythril findings about the same issue with hash-bucketed joins
+
+    Every finding is entered under its (class, file, function) key and its
+    (class, file, line) keys. A finding joins the first cluster waiting in
+    one of its buckets that has no finding of its own tool yet, so only
+    findings of different tools are ever merged: two Slither findings in
+    one function stay separate clusters and separate score inputs. Buckets
+    are per tool and only ever read by the other tool's findings, so a
+    cluster that has been paired is dropped from the front for good and the
+    whole pass stays linear in the number of findings.
+    """
+    members: List[List[Finding]] = []
+    tools: List[set] = []
+    classes: List[str] = []
+    buckets: Dict[Tuple[Any, ...], Deque[int]] = {}
+
+    for finding in findings:
+        cls = issue_class(finding)
+        keys = list(_join_keys(finding, cls))
+        joined = None
+        for key in keys:
+            for other in CORRELATED_TOOLS:
+                if other == finding.tool:
+                    continue
+                waiting = buckets.get((other,) + key)
+                while waiting and finding.tool in tools[waiting[0]]:
+                    waiting.popleft()
+                if waiting:
+                    joined = waiting.popleft()
+                    break
+            if joined is not None:
+                break
+
+        if joined is not None:
+            members[joined].append(finding)
+            tools[joined].add(finding.tool)
+            continue
+        index = len(members)
+        members.append([finding])
+        tools.append({finding.tool})
+        classes.append(cls)
+        for key in keys:
+            buckets.setdefault((finding.tool,) + key, deque()).append(index)
+
+    return Correlation([Cluster(cls, findings) for cls, findings in zip(classes, members)])
+
+def correlate_categories(*categories: Optional[Dict[str, List[Finding]]]) -> Correlation:
+    """Correlate the categorized findings of any number of tools"""
+    return correlate(finding for tool_categories in categories if tool_categories
+                     for findings in tool_categories.values() for finding in findings)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Compact Finding Model for PayRox Go Beyond
+Slotted, string-interned finding records shared by the security processors
+"""
+
+import sys
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+# (filename, first line, last line) of one contiguous source region
+Span = Tuple[str, int, int]
+
+# (byte start, byte length) of the primary location within `filename`
+Offset = Tuple[int, int]
+
+def intern(value: Any) -> str:
+    """Intern a repeated string (tool, check, severity, contract, filename)"""
+    return sys.intern(str(value)) if value else ''
+
+def line_ranges(lines: Iterable[int]) -> List[Tuple[int, int]]:
+    """Collapse a per-line integer list into (start, end) pairs"""
+    ranges = []
+    start = end = None
+    for line in sorted(set(lines)):
+        if end is not None and line == end + 1:
+            end = line
+            continue
+        if start is not None:
+            ranges.append((start, end))
+        start = end = line
+    if start is not None:
+        ranges.append((start, end))
+    return ranges
+
+def _slither_scope(element: Dict[str, Any]) -> Tuple[str, str]:
+    """Resolve the enclosing (contract, function) names of a Slither element"""
+    contract = function = ''
+    node = element
+    while node:
+        kind = node.get('type')
+        if kind == 'function' and not function:
+            function = node.get('name', '')
+        elif kind == 'contract':
+            contract = node.get('name', '')
+            break
+        node = node.get('type_specific_fields', {}).get('parent')
+    return contract, function
+
+class Finding:
+    """A single normalized finding from Slither or Mythril"""
+
+    __slots__ = (
+        'tool', 'check', 'severity', 'impact', 'confidence', 'contract',
+        'filename', 'function', 'spans', 'offset', 'description', 'finding_id',
+        'swc_id', 'raw'
+    )
+
+    def __init__(self, tool: str, check: str, severity: str, description: str = '',
+                 impact: str = '', confidence: str = '', contract: str = '',
+                 filename: str = '', function: str = '', spans: Tuple[Span, ...] = (),
+                 offset: Optional[Offset] = None, finding_id: str = '', swc_id: str = '',
+                 raw: Optional[Dict[str, Any]] = None):
+        self.tool = intern(tool)
+        self.check = intern(check)
+        self.severity = intern(severity)
+        self.impact = intern(impact)
+        self.confidence = intern(confidence)
+        self.contract = intern(contract)
+        self.filename = intern(filename)
+        self.function = intern(function)
+        self.spans = spans
+        self.offset = offset
+        self.description = description
+        self.finding_id = finding_id
+        self.swc_id = intern(swc_id)
+        # Original JSON, only retained where an output needs it verbatim
+        self.raw = raw
+
+    @classmethod
+    def from_slither(cls, detector: Dict[str, Any], severity: str,
+                     keep_raw: bool = False) -> 'Finding':
+        """Build a finding from a Slither detector result"""
+        elements = detector.get('elements') or []
+        spans = []
+        offset = None
+        for element in elements:
+            mapping = element.get('source_mapping') or {}
+            filename = intern(mapping.get('filename_relative', ''))
+            lines = mapping.get('lines') or ()
+            # The element that provides `filename` also provides the byte range
+            if offset is None and lines and isinstance(mapping.get('start'), int):
+                offset = (mapping['start'], mapping.get('length') or 0)
+            for start, end in line_ranges(lines):
+                span = (filename, start, end)
+                if span not in spans:
+                    spans.append(span)
+        contract, function = _slither_scope(elements[0]) if elements else ('', '')
+        return cls(
+            tool='slither',
+            check=detector.get('check', ''),
+            severity=severity,
+            description=detector.get('description', ''),
+            impact=detector.get('impact', ''),
+            confidence=detector.get('confidence', ''),
+            contract=contract,
+            filename=spans[0][0] if spans else '',
+            function=function,
+            spans=tuple(spans),
+            offset=offset,
+            finding_id=detector.get('id', ''),
+            raw=detector if keep_raw else None
+        )
+
+    @classmethod
+    def from_mythril(cls, issue: Dict[str, Any], severity: str) -> 'Finding':
+        """Build a finding from a raw Mythril issue"""
+        filename = intern(issue.get('filename', 'Unknown'))
+        lineno = issue.get('lineno')
+        return cls(
+            tool='mythril',
+            check=issue.get('title', 'Unknown Issue'),
+            severity=severity,
+            description=issue.get('description', ''),
+            contract=issue.get('contract', ''),
+            filename=filename,
+            function=issue.get('function', 'Unknown'),
+            spans=((filename, lineno, lineno),) if isinstance(lineno, int) else (),
+            swc_id=issue.get('swc-id', '')
+        )
+
+    @classmethod
+    def from_mythril_summary(cls, entry: Dict[str, Any]) -> 'Finding':
+        """Build a finding from a mythril-summary.json entry"""
+        return cls(
+            tool='mythril',
+            check=entry.get('title', 'Unknown Issue'),
+            severity=entry.get('severity', 'Low'),
+            description=entry.get('description', ''),
+            filename=entry.get('contract', 'Unknown'),
+            function=entry.get('function', 'Unknown'),
+            swc_id=entry.get('swc_id', '')
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form, e.g. for the analysis cache"""
+        data = {slot: getattr(self, slot) for slot in self.__slots__ if slot != 'raw'}
+        data['spans'] = [list(span) for span in self.spans]
+        if self.raw is not None:
+            data['raw'] = self.raw
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Finding':
+        """Rebuild a finding serialized with to_dict()"""
+        spans = tuple((intern(filename), start, end) for filename, start, end in data.get('spans', ()))
+        offset = tuple(data['offset']) if data.get('offset') else None
+        return cls(**{**data, 'spans': spans, 'offset': offset})
+
+    def to_mythril_summary(self) -> Dict[str, Any]:
+        """Entry format used by mythril-summary.json"""
+        return {
+            'severity': self.severity,
+            'title': self.check,
+            'description': self.description,
+            'contract': self.filename,
+            'function': self.function,
+            'swc_id': self.swc_id
+        }
+
+def count_by_severity(findings: Iterable[Finding]) -> Dict[str, int]:
+    """Count findings per severity category"""
+    counts: Dict[str, int] = {}
+    for finding in findings:
+        counts[finding.severity] = counts.get(finding.severity, 0) + 1
+    return counts
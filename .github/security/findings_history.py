@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Findings History Store for PayRox Go Beyond
+SQLite-backed record of every processed run with trend and first-seen queries
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import mythril_processor
+import slither_processor
+from baseline_diff import fingerprint, normalize_path
+from bulk_loader import BulkLoader
+from compact_reports import find_report
+from correlation import correlate
+from findings import Finding
+from security_summary import calculate_security_score
+from severity_policy import SeverityPolicy, add_policy_arguments, policy_from_args
+from triage import TriageStore, add_triage_arguments, triage_from_args
+
+DEFAULT_DB = '.security-cache/findings-history.db'
+
+# PRAGMA user_version of the current layout; 1 keys contracts on their
+# repo-relative path rather than the file name
+SCHEMA_VERSION = 1
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    commit_sha TEXT NOT NULL,
+    ref TEXT,
+    recorded_at TEXT NOT NULL,
+    score INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS findings (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    tool TEXT NOT NULL,
+    contract TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    check_name TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    function TEXT,
+    fingerprint TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS contract_scores (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    contract TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    PRIMARY KEY (contract, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_runs_commit ON runs(commit_sha);
+CREATE INDEX IF NOT EXISTS idx_findings_contract ON findings(contract, check_name, run_id);
+CREATE INDEX IF NOT EXISTS idx_findings_filename ON findings(filename, check_name, run_id);
+CREATE INDEX IF NOT EXISTS idx_findings_check ON findings(check_name, run_id);
+CREATE INDEX IF NOT EXISTS idx_findings_severity ON findings(severity, run_id);
+CREATE INDEX IF NOT EXISTS idx_findings_fingerprint ON findings(fingerprint, run_id);
+CREATE INDEX IF NOT EXISTS idx_findings_run ON findings(run_id);
+'''
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Open (creating if needed) the history database"""
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(SCHEMA)
+    if conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+        _migrate(conn)
+    return conn
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Re-key contracts on their path; file-name scores cannot be attributed and are dropped"""
+    with conn:
+        conn.execute('UPDATE findings SET contract = filename')
+        conn.execute("DELETE FROM contract_scores WHERE contract NOT LIKE '%/%'")
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+def contract_path(finding: Finding) -> str:
+    """Contracts are keyed on their repo-relative path, so same-named files stay apart"""
+    return normalize_path(finding.filename)
+
+def _contract_filter(contract: str) -> Tuple[str, List[str]]:
+    """Match full paths exactly, bare file names in any directory"""
+    if '/' in contract:
+        return 'f.contract = ?', [normalize_path(contract)]
+    return '(f.contract = ? OR f.contract LIKE ?)', [contract, f'%/{contract}']
+
+def contract_scores(findings: List[Finding], known_contracts: Iterable[str]) -> Dict[str, int]:
+    """Per-contract score using the same deductions as calculate_security_score
+
+    Correlated findings count once, against the contract of the cluster's lead.
+    """
+    leads = {id(cluster.lead) for cluster in correlate(findings).clusters}
+    slither_counts: Dict[str, int] = {}
+    mythril_counts: Dict[str, Dict[str, int]] = {}
+    for finding in findings:
+        contract = contract_path(finding)
+        counted = id(finding) in leads
+        if finding.tool == 'slither':
+            if counted and finding.severity == 'critical':
+                slither_counts[contract] = slither_counts.get(contract, 0) + 1
+            else:
+                slither_counts.setdefault(contract, 0)
+        else:
+            counts = mythril_counts.setdefault(contract, {'High': 0, 'Medium': 0})
+            if counted and finding.severity in counts:
+                counts[finding.severity] += 1
+
+    # Contracts scored in earlier runs recover to 100 once their findings are gone
+    contracts = set(known_contracts) | set(slither_counts) | set(mythril_counts)
+    scores = {}
+    for contract in contracts:
+        counts = mythril_counts.get(contract, {})
+        scores[contract] = calculate_security_score(
+            {'critical_issues': slither_counts.get(contract, 0)},
+            {'high_severity': counts.get('High', 0), 'medium_severity': counts.get('Medium', 0)}
+        )['score']
+    return scores
+
+def ingest_run(conn: sqlite3.Connection, commit_sha: str, findings: List[Finding],
+               score: int, ref: Optional[str] = None) -> int:
+    """Append one run's findings and scores in a single transaction"""
+    known = [row[0] for row in conn.execute('SELECT DISTINCT contract FROM contract_scores')]
+    scores = contract_scores(findings, known)
+
+    with conn:
+        cursor = conn.execute(
+            'INSERT INTO runs (commit_sha, ref, recorded_at, score) VALUES (?, ?, ?, ?)',
+            (commit_sha, ref, datetime.now(timezone.utc).isoformat(timespec='seconds'), score)
+        )
+        run_id = cursor.lastrowid
+        conn.executemany(
+            'INSERT INTO findings (run_id, tool, contract, filename, check_name, severity, function, fingerprint) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            ((run_id, finding.tool, contract_path(finding),
+              normalize_path(finding.filename), finding.check, finding.severity,
+              finding.function, fingerprint(finding)) for finding in findings)
+        )
+        conn.executemany(
+            'INSERT INTO contract_scores (run_id, contract, score) VALUES (?, ?, ?)',
+            ((run_id, contract, contract_score) for contract, contract_score in scores.items())
+        )
+    return run_id
+
+def trend(conn: sqlite3.Connection, contract: Optional[str] = None,
+          check: Optional[str] = None, limit: int = 50) -> List[Tuple[str, str, int]]:
+    """Finding counts per run, oldest first, optionally for one contract and/or check"""
+    conditions = []
+    params: List[Any] = []
+    if contract:
+        condition, values = _contract_filter(contract)
+        conditions.append(condition)
+        params.extend(values)
+    if check:
+        conditions.append('f.check_name = ?')
+        params.append(check)
+    where = ' AND '.join(conditions) or '1'
+    rows = conn.execute(
+        f'SELECT r.commit_sha, r.recorded_at, COALESCE(c.n, 0) FROM runs r '
+        f'LEFT JOIN (SELECT run_id, COUNT(*) AS n FROM findings f WHERE {where} GROUP BY run_id) c '
+        f'ON c.run_id = r.id ORDER BY r.id DESC LIMIT ?',
+        params + [limit]
+    ).fetchall()
+    return rows[::-1]
+
+def first_seen(conn: sqlite3.Connection, fingerprint_value: Optional[str] = None,
+               contract: Optional[str] = None, check: Optional[str] = None) -> Optional[Tuple[str, str]]:
+    """Commit and time of the first run containing a matching finding"""
+    conditions = []
+    params: List[Any] = []
+    if fingerprint_value:
+        conditions.append('f.fingerprint = ?')
+        params.append(fingerprint_value)
+    if contract:
+        condition, values = _contract_filter(contract)
+        conditions.append(condition)
+        params.extend(values)
+    if check:
+        conditions.append('f.check_name = ?')
+        params.append(check)
+    where = ' AND '.join(conditions) or '1'
+    return conn.execute(
+        f'SELECT r.commit_sha, r.recorded_at FROM findings f JOIN runs r ON r.id = f.run_id '
+        f'WHERE {where} ORDER BY f.run_id LIMIT 1',
+        params
+    ).fetchone()
+
+def latest_scores(conn: sqlite3.Connection) -> List[Tuple[str, int, str]]:
+    """Most recent score for every contract ever scored"""
+    return conn.execute(
+        'SELECT cs.contract, cs.score, r.commit_sha FROM contract_scores cs '
+        'JOIN runs r ON r.id = cs.run_id '
+        'WHERE cs.run_id = (SELECT MAX(run_id) FROM contract_scores WHERE contract = cs.contract) '
+        'ORDER BY cs.score, cs.contract'
+    ).fetchall()
+
+def load_run_findings(slither_report: Optional[str], mythril_dir: Optional[str],
+                      policy: Optional[SeverityPolicy] = None,
+                      loader: Optional[BulkLoader] = None,
+                      triage: Optional[TriageStore] = None) -> List[Finding]:
+    """Categorize tool output into findings for ingestion
+
+    The Slither report is the one process-slither.py rewrote to include
+    cached findings. Findings in the `triage` store are suppressed or
+    downgraded, as they are for the gate. Mythril reports that could not be
+    loaded are recorded in `loader.errors`.
+    """
+    categorized = []
+    # Accept the legacy report path after the artifact was compacted
+    if slither_report and not os.path.exists(slither_report):
+        slither_report = find_report(slither_report)
+    if slither_report:
+        categorized.append((slither_processor.stream_slither_report(slither_report, policy=policy),
+                            slither_processor.SEVERITIES[-1]))
+    if mythril_dir and os.path.isdir(mythril_dir):
+        categorized.append((mythril_processor.categorize_mythril_reports(mythril_dir, loader, policy),
+                            mythril_processor.SEVERITIES[-1]))
+
+    findings: List[Finding] = []
+    for categories, lowest in categorized:
+        if triage is not None:
+            triage.apply(categories, lowest)
+        for severity_findings in categories.values():
+            findings.extend(severity_findings)
+    return findings
+
+def run_score(findings: List[Finding]) -> int:
+    """Overall score for a run, as calculate_security_score would report it"""
+    counts = correlate(findings).score_counts()
+    return calculate_security_score(
+        {'critical_issues': counts['critical_issues']},
+        {'high_severity': counts['high_severity'], 'medium_severity': counts['medium_severity']}
+    )['score']
+
+def main():
+    parser = argparse.ArgumentParser(description='Record and query PayRox Go Beyond findings history')
+    parser.add_argument('--db', default=DEFAULT_DB, help='History database path')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest = subparsers.add_parser('ingest', help='Append a processed run')
+    ingest.add_argument('--commit', required=True, help='Commit SHA the reports belong to')
+    ingest.add_argument('--ref', help='Branch or tag')
+    ingest.add_argument('--slither-report', help='Slither JSON report')
+    ingest.add_argument('--mythril-dir', help='Directory containing mythril-*.json reports')
+    add_policy_arguments(ingest)
+    add_triage_arguments(ingest)
+
+    trend_parser = subparsers.add_parser('trend', help='Finding counts per run')
+    trend_parser.add_argument('--contract', help='Contract path, or file name to match in any directory')
+    trend_parser.add_argument('--check', help='Slither check or Mythril title')
+    trend_parser.add_argument('--limit', type=int, default=50, help='Most recent runs to show')
+
+    first = subparsers.add_parser('first-seen', help='First commit where a finding appeared')
+    first.add_argument('--fingerprint', help='Finding fingerprint')
+    first.add_argument('--contract', help='Contract path, or file name to match in any directory')
+    first.add_argument('--check', help='Slither check or Mythril title')
+
+    subparsers.add_parser('scores', help='Latest score per contract')
+
+    args = parser.parse_args()
+    conn = connect(args.db)
+
+    if args.command == 'ingest':
+        policy_from_args(args)
+        loader = BulkLoader()
+        findings = load_run_findings(args.slither_report, args.mythril_dir, loader=loader,
+                                     triage=triage_from_args(args))
+        for error in loader.errors:
+            print(f"⚠️ Skipped {error.path}: {error.error}")
+        run_id = ingest_run(conn, args.commit, findings, run_score(findings), args.ref)
+        print(f"Recorded run {run_id} for {args.commit[:12]}: {len(findings)} findings")
+    elif args.command == 'trend':
+        for commit_sha, recorded_at, count in trend(conn, args.contract, args.check, args.limit):
+            print(f"{recorded_at}  {commit_sha[:12]}  {count}")
+    elif args.command == 'first-seen':
+        if not (args.fingerprint or args.contract or args.check):
+            print("Error: first-seen needs --fingerprint, --contract or --check")
+            sys.exit(1)
+        row = first_seen(conn, args.fingerprint, args.contract, args.check)
+        if row is None:
+            print("No matching finding recorded")
+            sys.exit(1)
+        print(f"{row[0]}  {row[1]}")
+    elif args.command == 'scores':
+        for contract, contract_score, commit_sha in latest_scores(conn):
+            print(f"{contract_score:>4}  {contract}  ({commit_sha[:12]})")
+    conn.close()
+
+if __name__ == "__main__":
+    main()
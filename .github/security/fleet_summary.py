@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Fleet Security Summary for PayRox Go Beyond
+Aggregates many downloaded artifact sets into one scored, ranked summary
+"""
+
+import heapq
+import json
+import os
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+import mythril_processor
+import slither_processor
+from bulk_loader import BulkLoader
+from compact_reports import find_report
+from correlation import correlate_categories
+from findings import Finding
+from security_pipeline import find_raw_reports, mythril_data_from_categories, slither_data_from_categories
+from security_summary import calculate_security_score, load_json_file, load_mythril_data, load_slither_data
+from severity_policy import use_policy_file
+from triage import TriageStore, load_triage
+
+# Folder names used by the security-audit workflow's artifacts, as uploaded
+# and as laid out by download-artifact
+SLITHER_ARTIFACT_DIRS = ('slither-reports', 'slither-security-reports')
+MYTHRIL_ARTIFACT_DIRS = ('mythril-reports', 'mythril-security-reports')
+
+FLEET_JSON = 'fleet-summary.json'
+FLEET_SCORES = 'fleet-scores.jsonl'
+DEFAULT_WORST = 20
+
+def discover_artifact_sets(root: str) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+    """Yield (label, slither_dir, mythril_dir) for every artifact set under root
+
+    A set is any directory holding a Slither and/or Mythril artifact folder;
+    its label is the path relative to root, e.g. `client/commit`.
+    """
+    artifact_dirs = set(SLITHER_ARTIFACT_DIRS) | set(MYTHRIL_ARTIFACT_DIRS)
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames.sort()
+        slither_dir = next((os.path.join(dirpath, name) for name in SLITHER_ARTIFACT_DIRS
+                            if name in dirnames), None)
+        mythril_dir = next((os.path.join(dirpath, name) for name in MYTHRIL_ARTIFACT_DIRS
+                            if name in dirnames), None)
+        if slither_dir or mythril_dir:
+            yield os.path.relpath(dirpath, root), slither_dir, mythril_dir
+        # Never descend into the artifact folders themselves
+        dirnames[:] = [name for name in dirnames if name not in artifact_dirs]
+
+def _check_counts(findings) -> Dict[str, int]:
+    return dict(Counter(finding.check for finding in findings))
+
+@lru_cache(maxsize=None)
+def _worker_triage(triage_path: Optional[str]) -> Optional[TriageStore]:
+    """Triage store loaded once per pool worker"""
+    return load_triage(triage_path) if triage_path else None
+
+def summarize_artifact_set(label: str, slither_dir: Optional[str],
+                           mythril_dir: Optional[str], triage_path: Optional[str] = None) -> Dict[str, Any]:
+    """Score one artifact set without writing into it; runs in a pool worker
+
+    Only counts leave the worker, so the parent never holds any set's findings.
+    """
+    try:
+        triage = _worker_triage(triage_path)
+        slither_report, raw_mythril = find_raw_reports(slither_dir or '', mythril_dir or '')
+        checks: Dict[str, Dict[str, int]] = {'slither': {}, 'mythril': {}}
+        slither_categories = mythril_categories = None
+
+        if slither_report:
+            categories = slither_categories = slither_processor.stream_slither_report(slither_report)
+            if triage is not None:
+                triage.apply(categories, slither_processor.SEVERITIES[-1])
+            slither_data = slither_data_from_categories(categories)
+            checks['slither'] = _check_counts(f for findings in categories.values() for f in findings)
+            slither_counts = {severity: len(findings) for severity, findings in categories.items()}
+        else:
+            # Older artifacts only carry the rendered summaries
+            slither_data = load_slither_data(slither_dir, triage) if slither_dir else slither_data_from_categories(None)
+            critical_path = find_report(os.path.join(slither_dir, 'critical-issues.json')) if slither_dir else None
+            critical = load_json_file(critical_path) if critical_path else None
+            checks['slither'] = dict(Counter(detector.get('check', 'unknown') for detector in critical or []))
+            slither_counts = {'critical': slither_data['critical_issues']}
+
+        if raw_mythril:
+            # Already in a pool worker: read concurrently but decode in-thread
+            categories = mythril_categories = mythril_processor.categorize_mythril_reports(
+                raw_mythril, BulkLoader(processes=0))
+            if triage is not None:
+                triage.apply(categories, mythril_processor.SEVERITIES[-1])
+            mythril_data = mythril_data_from_categories(categories)
+            checks['mythril'] = _check_counts(f for findings in categories.values() for f in findings)
+        else:
+            mythril_data = load_mythril_data(mythril_dir, triage) if mythril_dir else mythril_data_from_categories(None)
+            summary_path = find_report(os.path.join(mythril_dir, 'mythril-summary.json')) if mythril_dir else None
+            entries = load_json_file(summary_path) if summary_path else None
+            checks['mythril'] = _check_counts(Finding.from_mythril_summary(entry) for entry in entries or [])
+
+        # Per-tool counts stay per finding; the score counts each issue cluster once
+        mythril_counts = {'High': mythril_data['high_severity'], 'Medium': mythril_data['medium_severity'],
+                          'Low': mythril_data['low_severity']}
+        correlate_categories(slither_categories, mythril_categories).apply(slither_data, mythril_data)
+        security_score = calculate_security_score(slither_data, mythril_data)
+        return {
+            'label': label,
+            'score': security_score['score'],
+            'status': security_score['status'],
+            'issues': security_score['issues'],
+            'source': 'reports' if slither_report or raw_mythril else 'summaries',
+            'slither': slither_counts if slither_data.get('has_summary') else None,
+            'mythril': mythril_counts if mythril_data.get('has_results') else None,
+            'checks': checks
+        }
+    except Exception as e:
+        return {'label': label, 'error': f"{type(e).__name__}: {e}"}
+
+class _Offender:
+    """Heap entry whose root is the first to evict: highest score, then last label"""
+
+    __slots__ = ('score', 'label', 'row')
+
+    def __init__(self, row: Dict[str, Any]):
+        self.score = row['score']
+        self.label = row['label']
+        self.row = row
+
+    def __lt__(self, other: '_Offender') -> bool:
+        return (self.score, self.label) > (other.score, other.label)
+
+class FleetAggregate:
+    """Running merge of per-set results in memory independent of fleet size
+
+    Only the worst-scoring sets are kept (a bounded heap); score rows can be
+    streamed to a JSON Lines file as they arrive.
+    """
+
+    def __init__(self, worst_limit: int = DEFAULT_WORST):
+        self.worst_limit = worst_limit
+        self.sets = 0
+        self.errors: List[Dict[str, str]] = []
+        self.score_total = 0
+        self.statuses: Counter = Counter()
+        self.check_histogram: Dict[str, Counter] = {'slither': Counter(), 'mythril': Counter()}
+        self.sets_with_check: Dict[str, Counter] = {'slither': Counter(), 'mythril': Counter()}
+        self.severity_totals: Dict[str, Counter] = {'slither': Counter(), 'mythril': Counter()}
+        self._worst: List[_Offender] = []
+
+    def add(self, result: Dict[str, Any]) -> None:
+        if 'error' in result:
+            self.errors.append({'label': result['label'], 'error': result['error']})
+            return
+        self.sets += 1
+        self.score_total += result['score']
+        self.statuses[result['status']] += 1
+        for tool in ('slither', 'mythril'):
+            counts = result['checks'].get(tool, {})
+            self.check_histogram[tool].update(counts)
+            self.sets_with_check[tool].update(counts.keys())
+            self.severity_totals[tool].update(result[tool] or {})
+
+        offender = _Offender({key: result[key] for key in
+                              ('label', 'score', 'status', 'issues', 'slither', 'mythril')})
+        if len(self._worst) < self.worst_limit:
+            heapq.heappush(self._worst, offender)
+        elif self._worst and self._worst[0] < offender:
+            heapq.heapreplace(self._worst, offender)
+
+    def worst_offenders(self) -> List[Dict[str, Any]]:
+        """Lowest-scoring sets, worst first (ties broken by label)"""
+        return [offender.row for offender in sorted(self._worst, key=lambda o: (o.score, o.label))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'sets': self.sets,
+            'errors': self.errors,
+            'average_score': round(self.score_total / self.sets, 1) if self.sets else None,
+            'statuses': dict(self.statuses),
+            'severity_totals': {tool: dict(counts) for tool, counts in self.severity_totals.items()},
+            'worst_offenders': self.worst_offenders(),
+            'check_histogram': {
+                tool: [{'check': check, 'findings': count, 'sets': self.sets_with_check[tool][check]}
+                       for check, count in histogram.most_common()]
+                for tool, histogram in self.check_histogram.items()
+            }
+        }
+
+def aggregate_fleet(root: str, jobs: Optional[int] = None, worst_limit: int = DEFAULT_WORST,
+                    scores_path: Optional[str] = None, triage_path: Optional[str] = None,
+                    policy_path: Optional[str] = None) -> FleetAggregate:
+    """Score every artifact set under root in a process pool and merge the results"""
+    jobs = jobs or os.cpu_count() or 1
+    aggregate = FleetAggregate(worst_limit)
+    pending = discover_artifact_sets(root)
+    scores = open(scores_path, 'w') if scores_path else None
+
+    try:
+        # Workers compile the severity policy once, before their first set
+        with ProcessPoolExecutor(max_workers=jobs, initializer=use_policy_file, initargs=(policy_path,)) as pool:
+            in_flight = {}
+            exhausted = False
+            while not exhausted or in_flight:
+                # Keep a bounded window of submissions instead of queueing the whole tree
+                while not exhausted and len(in_flight) < jobs * 2:
+                    artifact_set = next(pending, None)
+                    if artifact_set is None:
+                        exhausted = True
+                        break
+                    in_flight[pool.submit(summarize_artifact_set, *artifact_set, triage_path)] = artifact_set[0]
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    label = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {'label': label, 'error': f"{type(e).__name__}: {e}"}
+                    aggregate.add(result)
+                    if scores is not None:
+                        row = {key: result.get(key) for key in ('label', 'score', 'status', 'source', 'error')}
+                        scores.write(json.dumps({k: v for k, v in row.items() if v is not None}) + '\n')
+                    if 'error' in result:
+                        print(f"❌ {label}: {result['error']}")
+                    else:
+                        print(f"✅ {label}: {result['score']}/100 ({result['status']})")
+    finally:
+        if scores is not None:
+            scores.close()
+
+    return aggregate
+
+def generate_fleet_summary(fleet: Dict[str, Any], output_path: str, histogram_limit: int = 25) -> None:
+    """Write the combined fleet report"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
+
+    with open(output_path, 'w') as f:
+        f.write("# 🛡️ PayRox Go Beyond Fleet Security Report\n\n")
+        f.write(f"**Generated**: {timestamp}\n")
+        f.write(f"**Artifact Sets**: {fleet['sets']}\n")
+        if fleet['average_score'] is not None:
+            f.write(f"**Average Security Score**: {fleet['average_score']}/100\n")
+        if fleet['errors']:
+            f.write(f"**Unreadable Sets**: {len(fleet['errors'])}\n")
+        f.write("\n")
+
+        f.write("## 📊 Status Distribution\n\n")
+        f.write("| Status | Sets |\n")
+        f.write("|--------|------|\n")
+        for status in ('EXCELLENT', 'GOOD', 'FAIR', 'NEEDS_ATTENTION'):
+            f.write(f"| {status} | {fleet['statuses'].get(status, 0)} |\n")
+        f.write("\n")
+
+        f.write("## 🚨 Worst Offenders\n\n")
+        if fleet['worst_offenders']:
+            f.write("| Set | Score | Status | Issues |\n")
+            f.write("|-----|-------|--------|--------|\n")
+            for offender in fleet['worst_offenders']:
+                issues = '; '.join(offender['issues']) or '-'
+                f.write(f"| {offender['label']} | {offender['score']} | {offender['status']} | {issues} |\n")
+        else:
+            f.write("✅ No artifact sets scored\n")
+        f.write("\n")
+
+        f.write("## 🔍 Findings by Check\n\n")
+        for tool, title in (('slither', '🐍 Slither'), ('mythril', '🔮 Mythril')):
+            rows = fleet['check_histogram'][tool]
+            f.write(f"### {title}\n\n")
+            if not rows:
+                f.write("No findings\n\n")
+                continue
+            f.write("| Check | Findings | Sets |\n")
+            f.write("|-------|----------|------|\n")
+            for row in rows[:histogram_limit]:
+                f.write(f"| {row['check']} | {row['findings']} | {row['sets']} |\n")
+            if len(rows) > histogram_limit:
+                f.write(f"\n*... and {len(rows) - histogram_limit} more checks in {FLEET_JSON}*\n")
+            f.write("\n")
+
+        if fleet['errors']:
+            f.write("## ⚠️ Unreadable Artifact Sets\n\n")
+            for error in fleet['errors']:
+                f.write(f"- {error['label']}: {error['error']}\n")
+            f.write("\n")
+
+def run_fleet(root: str, output_path: str, jobs: Optional[int] = None,
+              worst_limit: int = DEFAULT_WORST, triage_path: Optional[str] = None,
+              policy_path: Optional[str] = None) -> Dict[str, Any]:
+    """Aggregate a fleet tree and write the markdown, JSON and per-set score files"""
+    output_dir = os.path.dirname(output_path) or '.'
+    os.makedirs(output_dir, exist_ok=True)
+    aggregate = aggregate_fleet(root, jobs, worst_limit, os.path.join(output_dir, FLEET_SCORES),
+                                triage_path, policy_path)
+    fleet = aggregate.to_dict()
+    generate_fleet_summary(fleet, output_path)
+    with open(os.path.join(output_dir, FLEET_JSON), 'w') as f:
+        json.dump(fleet, f, indent=2)
+    return fleet
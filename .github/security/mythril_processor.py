@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Mythril Results Processor for PayRox Go Beyond
+Processes symbolic execution results and formats for CI/CD pipeline
+"""
+
+import os
+import glob
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+from bulk_loader import BulkLoader, LoadError, LoadErrors, read_file
+from compact_reports import REPORT_SUFFIXES, decode_report, is_raw_mythril_report, load_report
+from findings import Finding
+from report_renderer import JsonArraySink, ReportContext, ReportSink, ToolResults, markdown_snippet, render_report
+from severity_policy import TOOL_SEVERITIES, SeverityPolicy, active_policy
+from source_snippets import SnippetIndex
+
+SEVERITIES = TOOL_SEVERITIES['mythril']
+
+# New findings at these severities fail the build in baseline diff mode
+DIFF_GATE_SEVERITIES = ['High']
+
+def mythril_issues(data: bytes) -> List[Dict[str, Any]]:
+    """The issues of one Mythril JSON report (plain or compressed) read into memory"""
+    report = decode_report(data)
+    if 'issues' in report:
+        return report['issues']
+    return []
+
+def load_mythril_report(report_path: str, errors: LoadErrors) -> List[Dict[str, Any]]:
+    """Load the issues from a single Mythril JSON report (plain or compressed)
+
+    An unreadable report has no issues and is recorded in `errors`, as
+    BulkLoader records the reports of a directory.
+    """
+    errors.files += 1
+    try:
+        data = read_file(report_path)
+    except OSError as e:
+        errors.errors.append(LoadError(report_path, 'read', e))
+        return []
+    try:
+        return mythril_issues(data)
+    except Exception as e:
+        errors.errors.append(LoadError(report_path, 'decode', e))
+        return []
+
+def mythril_report_paths(reports_dir: str) -> List[str]:
+    """Per-contract reports in directory, skipping the summaries rendered next to them"""
+    paths = []
+    for suffix in REPORT_SUFFIXES:
+        paths.extend(path for path in glob.glob(os.path.join(reports_dir, f"mythril-*{suffix}"))
+                     if is_raw_mythril_report(os.path.basename(path)))
+    return sorted(paths)
+
+def stream_mythril_reports(reports_dir: str,
+                           loader: Optional[BulkLoader] = None) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """(report index, issues) for every report, in the order the loads complete
+
+    Unreadable reports are recorded in `loader.errors`.
+    """
+    loader = loader or BulkLoader()
+    for index, _, issues in loader.load(mythril_report_paths(reports_dir), mythril_issues):
+        yield index, issues
+
+def load_mythril_reports(reports_dir: str, loader: Optional[BulkLoader] = None) -> List[Dict[str, Any]]:
+    """Load all Mythril JSON reports from directory"""
+    loaded = dict(stream_mythril_reports(reports_dir, loader))
+    return [issue for index in sorted(loaded) for issue in loaded[index]]
+
+def categorize_mythril_findings(issues: Iterable[Dict[str, Any]],
+                                categories: Optional[Dict[str, List[Finding]]] = None,
+                                policy: Optional[SeverityPolicy] = None) -> Dict[str, List[Finding]]:
+    """Categorize Mythril findings by severity, optionally adding to existing categories"""
+    if categories is None:
+        categories = {severity: [] for severity in SEVERITIES}
+    policy = policy or active_policy()
+    
+    for issue in issues:
+        finding = Finding.from_mythril(issue, '')
+        finding.severity = policy.mythril_severity(issue.get('severity', ''), finding.swc_id,
+                                                   finding.check, finding.filename)
+        categories[finding.severity].append(finding)
+    
+    return categories
+
+def categorize_mythril_reports(reports_dir: str, loader: Optional[BulkLoader] = None,
+                               policy: Optional[SeverityPolicy] = None) -> Dict[str, List[Finding]]:
+    """Load and categorize all Mythril reports from directory
+
+    Each report is categorized as soon as it has loaded, while the rest are
+    still being read. The per-report results are merged in path order, so
+    the outputs don't depend on which file happened to finish first.
+    """
+    loaded = {index: categorize_mythril_findings(issues, policy=policy)
+              for index, issues in stream_mythril_reports(reports_dir, loader)}
+    categories: Dict[str, List[Finding]] = {severity: [] for severity in SEVERITIES}
+    for index in sorted(loaded):
+        for severity, findings in loaded[index].items():
+            categories[severity].extend(findings)
+    return categories
+
+# Issues listed per severity in mythril-summary.md before the rest are counted
+MARKDOWN_LISTED = 5
+
+class MythrilMarkdownSink(ReportSink):
+    """mythril-summary.md"""
+
+    tools = ('mythril',)
+
+    def begin_tool(self, tool: ToolResults) -> None:
+        self._listed = 0
+        self._empty = tool.total() == 0
+        self.write("# 🔮 Mythril Symbolic Analysis Summary\n\n")
+        
+        if self._empty:
+            self.write("✅ **No vulnerabilities detected!**\n\n")
+            self.write("Mythril symbolic execution found no security issues in the analyzed contracts.\n")
+            return
+        
+        self.write(f"📊 **Total Issues Found**: {tool.total()}\n\n")
+
+    def begin_group(self, tool: ToolResults, severity: str, findings: List[Finding]) -> None:
+        self._listed = 0
+        if findings:
+            icon = {'High': '🚨', 'Medium': '⚠️', 'Low': '🔶'}[severity]
+            self.write(f"{icon} **{severity} Severity**: {len(findings)} issues\n\n")
+
+    def finding(self, tool: ToolResults, severity: str, finding: Finding) -> None:
+        if self._listed < MARKDOWN_LISTED:  # Limit to first 5 for readability
+            contract = finding.filename.split('/')[-1]
+            self.write(f"- **{finding.check}** in `{contract}`\n")
+            snippet = self.snippet(finding)
+            if snippet is not None:
+                self.write('\n' + markdown_snippet(snippet))
+            self._listed += 1
+
+    def end_group(self, tool: ToolResults, severity: str, findings: List[Finding]) -> None:
+        if not findings:
+            return
+        if len(findings) > MARKDOWN_LISTED:
+            self.write(f"- *(and {len(findings) - MARKDOWN_LISTED} more)*\n")
+        self.write("\n")
+
+    def end_tool(self, tool: ToolResults) -> None:
+        if self._empty:
+            return
+        
+        self.write("## 🔍 Analysis Notes\n\n")
+        self.write("- Mythril uses symbolic execution to find potential vulnerabilities\n")
+        self.write("- Some findings may be false positives - manual review recommended\n")
+        self.write("- Focus on High severity issues for immediate attention\n")
+        self.write("\n📝 *Detailed analysis available in security artifacts*\n")
+
+def report_sinks(output_dir: str, markdown: bool = True) -> List[ReportSink]:
+    """mythril-summary.json for CI/CD and, unless a diff summary replaces it, the markdown for humans"""
+    sinks: List[ReportSink] = [JsonArraySink(os.path.join(output_dir, 'mythril-summary.json'), 'mythril',
+                                             Finding.to_mythril_summary)]
+    if markdown:
+        sinks.append(MythrilMarkdownSink(os.path.join(output_dir, 'mythril-summary.md')))
+    return sinks
+
+def tool_results(categories: Dict[str, List[Finding]]) -> ToolResults:
+    return ToolResults('mythril', SEVERITIES, categories)
+
+def generate_mythril_summary(categories: Dict[str, List[Finding]], output_dir: str,
+                             snippets: Optional[SnippetIndex] = None) -> None:
+    """Generate summary of Mythril findings"""
+    render_report(ReportContext([tool_results(categories)], snippets=snippets), report_sinks(output_dir))
+
+def load_baseline_findings(baseline_path: str) -> List[Finding]:
+    """Load baseline findings from a reports directory or a mythril-summary.json"""
+    if os.path.isdir(baseline_path):
+        categories = categorize_mythril_reports(baseline_path)
+        return [finding for findings in categories.values() for finding in findings]
+    
+    return [Finding.from_mythril_summary(entry) for entry in load_report(baseline_path)]
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+PR Comment Digest for PayRox Go Beyond
+Size-bounded findings digest for pull request comments, with per-contract detail shards
+"""
+
+import heapq
+import os
+from collections import OrderedDict
+from typing import Dict, List, IO, Optional, Tuple
+
+from baseline_diff import normalize_path
+from findings import Finding
+from report_renderer import (SECURITY_SEVERITY, TOOL_INFO, WRITE_BUFFER_SIZE, ReportContext, ReportSink,
+                             ToolResults, markdown_snippet)
+
+# GitHub rejects comment bodies over 65536 characters; the byte budget stays
+# below that with room for the heading the workflow puts in front
+DEFAULT_COMMENT_BYTES = 60000
+DEFAULT_TOP = 25
+SHARD_DIR = 'pr-shards'
+
+# Shard files kept open at once; others are reopened for append when needed
+MAX_OPEN_SHARDS = 32
+
+# Characters of a finding's description quoted in the digest
+DESCRIPTION_CHARS = 200
+
+_ICONS = {'critical': '🚨', 'high': '⚠️', 'medium': '🔶', 'low': '🔷', 'informational': 'ℹ️'}
+
+def severity_rank(severity: str) -> float:
+    """Common scale for both tools' severities (higher is worse)"""
+    return SECURITY_SEVERITY.get(severity.lower(), 0.0)
+
+def shard_name(filename: str) -> str:
+    """Flat file name of a contract's shard, e.g. contracts__factory__Factory.sol.md"""
+    path = normalize_path(filename) or 'unknown'
+    return path.replace('/', '__') + '.md'
+
+def _first_line(text: str) -> str:
+    line = text.strip().split('\n', 1)[0].strip()
+    return line if len(line) <= DESCRIPTION_CHARS else line[:DESCRIPTION_CHARS - 1] + '…'
+
+def _location(finding: Finding) -> str:
+    if finding.spans:
+        filename, start, end = finding.spans[0]
+        return f"{normalize_path(filename)}#L{start}-L{end}"
+    return normalize_path(finding.filename) or 'unknown'
+
+class ContractShardSink(ReportSink):
+    """One markdown file per contract, appended to as findings stream past
+
+    Findings arrive grouped by tool and severity rather than by contract, so
+    shards are written incrementally; at most MAX_OPEN_SHARDS handles are
+    open at once and the least recently used one is closed to make room.
+    """
+
+    def __init__(self, shard_dir: str):
+        super().__init__(os.path.join(shard_dir, 'README.md'))
+        self.shard_dir = shard_dir
+        self._open: 'OrderedDict[str, IO[str]]' = OrderedDict()
+        self.counts: Dict[str, int] = {}
+        self.worst: Dict[str, str] = {}
+
+    def open(self) -> None:
+        os.makedirs(self.shard_dir, exist_ok=True)
+        super().open()
+
+    def _shard(self, contract: str) -> IO[str]:
+        handle = self._open.get(contract)
+        if handle is not None:
+            self._open.move_to_end(contract)
+            return handle
+        if len(self._open) >= MAX_OPEN_SHARDS:
+            self._open.popitem(last=False)[1].close()
+        path = os.path.join(self.shard_dir, shard_name(contract))
+        started = contract in self.counts
+        handle = open(path, 'a' if started else 'w', buffering=WRITE_BUFFER_SIZE)
+        if not started:
+            handle.write(f"# 🔍 {contract}\n\n")
+            self.counts[contract] = 0
+        self._open[contract] = handle
+        return handle
+
+    def finding(self, tool: ToolResults, severity: str, finding: Finding) -> None:
+        contract = normalize_path(finding.filename) or 'unknown'
+        shard = self._shard(contract)
+        self.counts[contract] += 1
+        worst = self.worst.get(contract)
+        if worst is None or severity_rank(severity) > severity_rank(worst):
+            self.worst[contract] = severity
+        name = TOOL_INFO.get(tool.name, (tool.name, ''))[0]
+        shard.write(f"### {_ICONS.get(severity.lower(), '')} {severity} · {name} · `{finding.check}`\n\n")
+        shard.write(f"`{_location(finding)}`")
+        if finding.function:
+            shard.write(f" in `{finding.function}`")
+        shard.write("\n\n")
+        if finding.description.strip():
+            shard.write(finding.description.strip() + "\n\n")
+        snippet = self.snippet(finding)
+        if snippet is not None:
+            shard.write(markdown_snippet(snippet, indent=''))
+
+    def end(self, report: ReportContext) -> None:
+        # The index lists every shard, worst contracts first
+        self.write("# 🔍 Findings by Contract\n\n| Contract | Findings | Worst | Details |\n|---|---|---|---|\n")
+        for contract in sorted(self.counts, key=lambda c: (-severity_rank(self.worst[c]), -self.counts[c], c)):
+            self.write(f"| `{contract}` | {self.counts[contract]} | {self.worst[contract]} | "
+                       f"[{shard_name(contract)}]({shard_name(contract)}) |\n")
+
+    def close(self) -> None:
+        while self._open:
+            self._open.popitem(last=False)[1].close()
+        super().close()
+
+class _Budget:
+    """Lines accepted while they fit in a byte budget"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self.lines: List[str] = []
+
+    def add(self, line: str, reserve: int = 0) -> bool:
+        size = len(line.encode('utf-8'))
+        if self.used + size + reserve > self.limit:
+            return False
+        self.lines.append(line)
+        self.used += size
+        return True
+
+class DigestSink(ReportSink):
+    """Compact PR comment: counts, then the top findings, then the worst contracts
+
+    The top findings are kept in a heap bounded to `top` entries, so the sink
+    holds references to at most that many findings and never sorts the full
+    list; text is only rendered for the survivors, and lines are added while
+    they fit in `max_bytes`.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_COMMENT_BYTES, top: int = DEFAULT_TOP,
+                 shards: Optional[ContractShardSink] = None):
+        super().__init__(path)
+        self.max_bytes = max_bytes
+        self.top = top
+        self.shards = shards
+        self._heap: List[Tuple[float, int, Finding, str]] = []
+        self._seen = 0
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def begin_tool(self, tool: ToolResults) -> None:
+        self._counts[tool.name] = {severity: len(tool.categories.get(severity, [])) for severity in tool.severities}
+
+    def finding(self, tool: ToolResults, severity: str, finding: Finding) -> None:
+        # Earlier findings win ties: -seq is larger for them
+        entry = (severity_rank(severity), -self._seen, finding, severity)
+        self._seen += 1
+        if len(self._heap) < self.top:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def _shard_note(self) -> str:
+        if self.shards is None:
+            return ''
+        return f" Per-contract details: `{os.path.basename(self.shards.shard_dir)}/` in the security artifacts."
+
+    def end(self, report: ReportContext) -> None:
+        budget = _Budget(self.max_bytes)
+        budget.add("# 🔒 Security Findings Digest\n\n")
+        score = report.security_score
+        if score:
+            budget.add(f"**Security Score**: {score['score']}/100 ({score['status']})\n\n")
+        for name, counts in self._counts.items():
+            label = TOOL_INFO.get(name, (name, ''))[0]
+            parts = ' · '.join(f"{severity} {count}" for severity, count in counts.items() if count)
+            budget.add(f"- **{label}**: {sum(counts.values())} findings{': ' + parts if parts else ''}\n")
+        if report.correlation is not None and report.correlation.merged:
+            summary = report.correlation.summary()
+            budget.add(f"- **Correlated**: {summary['findings']} findings form {summary['clusters']} distinct issues\n")
+        budget.add("\n")
+
+        top = sorted(self._heap, reverse=True)
+        footer = f"\n_… {{}} more findings not shown.{self._shard_note()}_\n"
+        reserve = len(footer.encode('utf-8')) + 16
+        shown = 0
+        if top and budget.add("## Top findings\n\n", reserve):
+            for rank, (_, _, finding, severity) in enumerate(top, 1):
+                line = (f"{rank}. {_ICONS.get(severity.lower(), '')} **{severity}** `{finding.check}` "
+                        f"— `{_location(finding)}` — {_first_line(finding.description)}\n")
+                if not budget.add(line, reserve):
+                    break
+                shown += 1
+
+        if self.shards is not None and self.shards.counts:
+            counts, worst = self.shards.counts, self.shards.worst
+            contracts = heapq.nlargest(self.top, counts, key=lambda c: (severity_rank(worst[c]), counts[c]))
+            if budget.add("\n## Contracts\n\n| Contract | Findings | Worst |\n|---|---|---|\n", reserve):
+                for contract in contracts:
+                    if not budget.add(f"| `{contract}` | {counts[contract]} | {worst[contract]} |\n", reserve):
+                        break
+
+        hidden = self._seen - shown
+        if hidden:
+            budget.add(footer.format(hidden))
+        elif self.shards is not None:
+            budget.add(f"\n_{self._shard_note().strip()}_\n")
+        for line in budget.lines:
+            self.write(line)
+
+def add_digest_arguments(parser) -> None:
+    """--pr-comment options shared by the security scripts"""
+    parser.add_argument('--pr-comment', help='Write a size-bounded digest for a PR comment to this path, '
+                                             f"with per-contract shards in {SHARD_DIR}/ next to it")
+    parser.add_argument('--comment-bytes', type=int, default=DEFAULT_COMMENT_BYTES,
+                        help='Byte budget of the PR comment digest')
+    parser.add_argument('--comment-top', type=int, default=DEFAULT_TOP, help='Findings listed in the digest')
+
+def digest_sinks(path: str, max_bytes: int = DEFAULT_COMMENT_BYTES, top: int = DEFAULT_TOP) -> List[ReportSink]:
+    """The digest and its shards; shards come first so the digest can list them"""
+    shards = ContractShardSink(os.path.join(os.path.dirname(path) or '.', SHARD_DIR))
+    return [shards, DigestSink(path, max_bytes, top, shards)]
+
+def digest_sinks_from_args(args) -> List[ReportSink]:
+    if not args.pr_comment:
+        return []
+    return digest_sinks(args.pr_comment, args.comment_bytes, args.comment_top)
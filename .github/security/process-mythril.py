@@ -4,129 +4,84 @@ Mythril Results Processor for PayRox Go Beyond
 Processes symbolic execution results and formats for CI/CD pipeline
 """
 
-import json
+import argparse
 import sys
 import os
-import glob
-from pathlib import Path
-from typing import Dict, List, Any
 
-def load_mythril_reports(reports_dir: str) -> List[Dict[str, Any]]:
-    """Load all Mythril JSON reports from directory"""
-    reports = []
-    pattern = os.path.join(reports_dir, "mythril-*.json")
-    
-    for report_path in glob.glob(pattern):
-        try:
-            with open(report_path, 'r') as f:
-                data = json.load(f)
-                if 'issues' in data:
-                    reports.extend(data['issues'])
-        except Exception as e:
-            print(f"Warning: Could not load {report_path}: {e}")
-    
-    return reports
-
-def categorize_mythril_findings(issues: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
-    """Categorize Mythril findings by severity"""
-    categories = {
-        'High': [],
-        'Medium': [],
-        'Low': []
-    }
-    
-    for issue in issues:
-        severity = issue.get('severity', 'Low')
-        if severity in categories:
-            categories[severity].append(issue)
-        else:
-            categories['Low'].append(issue)  # Default to Low for unknown severity
-    
-    return categories
-
-def generate_mythril_summary(categories: Dict[str, List[Any]], output_dir: str) -> None:
-    """Generate summary of Mythril findings"""
-    summary_path = os.path.join(output_dir, 'mythril-summary.json')
-    markdown_path = os.path.join(output_dir, 'mythril-summary.md')
-    
-    # JSON summary for CI/CD
-    all_issues = []
-    for severity, issues in categories.items():
-        for issue in issues:
-            all_issues.append({
-                'severity': severity,
-                'title': issue.get('title', 'Unknown Issue'),
-                'description': issue.get('description', ''),
-                'contract': issue.get('filename', 'Unknown'),
-                'function': issue.get('function', 'Unknown'),
-                'swc_id': issue.get('swc-id', '')
-            })
-    
-    with open(summary_path, 'w') as f:
-        json.dump(all_issues, f, indent=2)
-    
-    # Markdown summary for humans
-    with open(markdown_path, 'w') as f:
-        f.write("# 🔮 Mythril Symbolic Analysis Summary\n\n")
-        
-        total_issues = len(all_issues)
-        if total_issues == 0:
-            f.write("✅ **No vulnerabilities detected!**\n\n")
-            f.write("Mythril symbolic execution found no security issues in the analyzed contracts.\n")
-            return
-        
-        f.write(f"📊 **Total Issues Found**: {total_issues}\n\n")
-        
-        for severity in ['High', 'Medium', 'Low']:
-            severity_issues = categories.get(severity, [])
-            if severity_issues:
-                icon = {'High': '🚨', 'Medium': '⚠️', 'Low': '🔶'}[severity]
-                f.write(f"{icon} **{severity} Severity**: {len(severity_issues)} issues\n\n")
-                
-                for issue in severity_issues[:5]:  # Limit to first 5 for readability
-                    title = issue.get('title', 'Unknown Issue')
-                    contract = issue.get('filename', 'Unknown').split('/')[-1]
-                    f.write(f"- **{title}** in `{contract}`\n")
-                
-                if len(severity_issues) > 5:
-                    f.write(f"- *(and {len(severity_issues) - 5} more)*\n")
-                f.write("\n")
-        
-        f.write("## 🔍 Analysis Notes\n\n")
-        f.write("- Mythril uses symbolic execution to find potential vulnerabilities\n")
-        f.write("- Some findings may be false positives - manual review recommended\n")
-        f.write("- Focus on High severity issues for immediate attention\n")
-        f.write("\n📝 *Detailed analysis available in security artifacts*\n")
+from changed_lines import read_diff
+from compact_reports import COMPRESSED_SUFFIXES, compact_reports, raw_mythril_reports
+from security_pipeline import MYTHRIL_LOAD_ERRORS, run_pipeline
+from pr_digest import add_digest_arguments, digest_sinks_from_args
+from severity_policy import add_policy_arguments, policy_from_args
+from source_snippets import add_snippet_arguments, snippets_from_args
+from triage import add_triage_arguments, triage_from_args
+from stage_profiler import add_profile_arguments, profiler_from_args
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python3 process-mythril.py <reports-directory>")
-        sys.exit(1)
-    
-    reports_dir = sys.argv[1]
+    parser = argparse.ArgumentParser(description='Process Mythril results for PayRox Go Beyond')
+    parser.add_argument('reports_dir', help='Directory containing mythril-*.json reports')
+    parser.add_argument('--baseline', help='Baseline reports directory or mythril-summary.json; '
+                                           'report and gate only on changes')
+    parser.add_argument('--compress', choices=sorted(COMPRESSED_SUFFIXES),
+                        help='Replace the raw reports with compressed copies after processing')
+    parser.add_argument('--changed-lines', help="Unified diff ('-' for stdin); gate only on findings it touches")
+    add_policy_arguments(parser)
+    add_snippet_arguments(parser)
+    add_digest_arguments(parser)
+    add_triage_arguments(parser)
+    add_profile_arguments(parser)
     
-    if not os.path.exists(reports_dir):
-        print(f"Error: Reports directory {reports_dir} not found")
-        sys.exit(1)
+    args = parser.parse_args()
+    policy_from_args(args)
+    reports_dir = args.reports_dir
     
-    # Load and process results
-    issues = load_mythril_reports(reports_dir)
-    categories = categorize_mythril_findings(issues)
+    for path in filter(None, [reports_dir, args.baseline,
+                              args.changed_lines if args.changed_lines != '-' else None]):
+        if not os.path.exists(path):
+            print(f"Error: Reports directory {path} not found")
+            sys.exit(1)
     
-    # Generate outputs
-    generate_mythril_summary(categories, reports_dir)
+    # Load, categorize and render in one pass
+    result = run_pipeline(mythril_dir=reports_dir, mythril_baseline=args.baseline,
+                          profiler=profiler_from_args(args),
+                          changed_lines=read_diff(args.changed_lines) if args.changed_lines else None,
+                          triage=triage_from_args(args), snippets=snippets_from_args(args),
+                          extra_sinks=digest_sinks_from_args(args))
+    mythril = result['mythril']
+    categories = mythril['categories']
     
     # Print summary
-    total = len(issues)
     high_count = len(categories.get('High', []))
     medium_count = len(categories.get('Medium', []))
     low_count = len(categories.get('Low', []))
+    total = high_count + medium_count + low_count
     
     print(f"Mythril analysis complete:")
     print(f"  High: {high_count}")
     print(f"  Medium: {medium_count}")
     print(f"  Low: {low_count}")
     print(f"  Total: {total}")
+    if mythril['changed'] is not None:
+        print(f"  On changed lines: {len(mythril['changed'])}")
+    if mythril['triage'] is not None:
+        print(f"  Triaged: {mythril['triage']['suppressed']} suppressed, {mythril['triage']['accepted']} accepted")
+    if mythril['load_errors']:
+        print(f"  Unreadable reports: {len(mythril['load_errors'])} (see {MYTHRIL_LOAD_ERRORS})")
+    
+    if args.compress:
+        compacted = compact_reports(raw_mythril_reports(reports_dir), args.compress)
+        print(f"  Compacted reports: {len(compacted)}")
+    
+    # In diff mode only newly introduced high-severity findings gate the build
+    diff = mythril['diff']
+    if diff is not None:
+        print(f"  New: {sum(len(findings) for findings in diff['added'].values())}")
+        print(f"  Resolved: {sum(diff['resolved'].values())}")
+        if mythril['gating']:
+            print(f"❌ {len(mythril['gating'])} new high-severity findings introduced - failing build")
+        else:
+            print("✅ No new high-severity vulnerabilities found")
+        sys.exit(result['verdict']['exit_code'])
     
     # Mythril often has false positives, so we don't fail the build
     # but we do flag high-severity issues for review
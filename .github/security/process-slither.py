@@ -4,136 +4,67 @@ Slither Results Processor for PayRox Go Beyond
 Filters and categorizes security findings for CI/CD pipeline
 """
 
-import json
-import sys
+import argparse
 import os
-from pathlib import Path
-from typing import Dict, List, Any
-
-def load_slither_report(report_path: str) -> Dict[str, Any]:
-    """Load Slither JSON report"""
-    try:
-        with open(report_path, 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Error loading Slither report: {e}")
-        return {}
-
-def categorize_findings(results: Dict[str, Any]) -> Dict[str, List[Any]]:
-    """Categorize findings by severity"""
-    categories = {
-        'critical': [],
-        'high': [],
-        'medium': [],
-        'low': [],
-        'informational': []
-    }
-    
-    if 'results' not in results:
-        return categories
-    
-    for detector in results['results']['detectors']:
-        impact = detector.get('impact', '').lower()
-        confidence = detector.get('confidence', '').lower()
-        
-        # Critical: High impact + High confidence
-        if impact == 'high' and confidence == 'high':
-            categories['critical'].append(detector)
-        # High: High impact + Medium confidence OR Medium impact + High confidence
-        elif (impact == 'high' and confidence == 'medium') or \
-             (impact == 'medium' and confidence == 'high'):
-            categories['high'].append(detector)
-        # Medium: Medium impact + Medium confidence OR High impact + Low confidence
-        elif (impact == 'medium' and confidence == 'medium') or \
-             (impact == 'high' and confidence == 'low'):
-            categories['medium'].append(detector)
-        # Low: Low impact OR Low confidence
-        elif impact == 'low' or confidence == 'low':
-            categories['low'].append(detector)
-        else:
-            categories['informational'].append(detector)
-    
-    return categories
+import sys
 
-def generate_summary_markdown(categories: Dict[str, List[Any]], output_dir: str) -> None:
-    """Generate markdown summary of findings"""
-    summary_path = os.path.join(output_dir, 'slither-summary.md')
-    
-    total_findings = sum(len(findings) for findings in categories.values())
-    
-    with open(summary_path, 'w') as f:
-        f.write("# 🐍 Slither Security Analysis Summary\n\n")
-        
-        if total_findings == 0:
-            f.write("✅ **No security issues found!**\n\n")
-            f.write("The PayRox Go Beyond contracts passed all Slither security checks.\n")
-            return
-        
-        f.write(f"📊 **Total Findings**: {total_findings}\n\n")
-        
-        # Critical findings
-        if categories['critical']:
-            f.write(f"🚨 **Critical Issues**: {len(categories['critical'])}\n")
-            for finding in categories['critical']:
-                f.write(f"- **{finding['check']}**: {finding['description']}\n")
-            f.write("\n")
-        
-        # High severity findings
-        if categories['high']:
-            f.write(f"⚠️ **High Severity**: {len(categories['high'])}\n")
-            for finding in categories['high']:
-                f.write(f"- **{finding['check']}**: {finding['description']}\n")
-            f.write("\n")
-        
-        # Medium severity findings
-        if categories['medium']:
-            f.write(f"🔶 **Medium Severity**: {len(categories['medium'])}\n")
-            for finding in categories['medium']:
-                f.write(f"- **{finding['check']}**: {finding['description']}\n")
-            f.write("\n")
-        
-        # Low severity findings
-        if categories['low']:
-            f.write(f"🔷 **Low Severity**: {len(categories['low'])}\n")
-            f.write(f"*(Note: {len(categories['low'])} low-severity findings - see full report for details)*\n\n")
-        
-        # Recommendations
-        f.write("## 🔧 Recommendations\n\n")
-        if categories['critical']:
-            f.write("1. **Immediate Action Required**: Address all critical issues before deployment\n")
-        if categories['high']:
-            f.write("2. **High Priority**: Review and fix high-severity findings\n")
-        if categories['medium']:
-            f.write("3. **Medium Priority**: Consider fixing medium-severity findings\n")
-        
-        f.write("\n📝 *Full detailed report available in security artifacts*\n")
-
-def save_critical_issues(categories: Dict[str, List[Any]], output_dir: str) -> None:
-    """Save critical issues to separate JSON for CI/CD failure checks"""
-    critical_path = os.path.join(output_dir, 'critical-issues.json')
-    
-    with open(critical_path, 'w') as f:
-        json.dump(categories['critical'], f, indent=2)
+from analysis_cache import DEFAULT_MAX_BYTES
+from changed_lines import read_diff
+from compact_reports import COMPRESSED_SUFFIXES, compact_reports
+from security_pipeline import run_pipeline
+from slither_processor import DEFAULT_CONFIG, open_slither_cache
+from pr_digest import add_digest_arguments, digest_sinks_from_args
+from severity_policy import add_policy_arguments, policy_from_args
+from source_snippets import add_snippet_arguments, snippets_from_args
+from triage import add_triage_arguments, triage_from_args
+from stage_profiler import add_profile_arguments, profiler_from_args
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python3 process-slither.py <slither-report.json>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description='Process Slither results for PayRox Go Beyond')
+    parser.add_argument('report', help='Slither JSON report')
+    parser.add_argument('--cache-dir', help='Reuse cached findings for unchanged contracts')
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help='Analysis cache size bound')
+    parser.add_argument('--contracts-root', default='contracts', help='Contracts covered by the cache')
+    parser.add_argument('--config', default=DEFAULT_CONFIG, help='Slither configuration folded into cache keys')
+    parser.add_argument('--slither-version', help='Slither version for cache keys (default: ask slither)')
+    parser.add_argument('--baseline', help='Baseline Slither report; report and gate only on changes')
+    parser.add_argument('--compress', choices=sorted(COMPRESSED_SUFFIXES),
+                        help='Replace the report with a compressed compact copy after processing')
+    parser.add_argument('--changed-lines', help="Unified diff ('-' for stdin); gate only on findings it touches")
+    add_policy_arguments(parser)
+    add_snippet_arguments(parser)
+    add_digest_arguments(parser)
+    add_triage_arguments(parser)
+    add_profile_arguments(parser)
     
-    report_path = sys.argv[1]
-    output_dir = os.path.dirname(report_path)
+    args = parser.parse_args()
+    policy_from_args(args)
+    report_path = args.report
     
-    if not os.path.exists(report_path):
-        print(f"Error: Report file {report_path} not found")
-        sys.exit(1)
+    for path in filter(None, [report_path, args.baseline,
+                              args.changed_lines if args.changed_lines != '-' else None]):
+        if not os.path.exists(path):
+            print(f"Error: Report file {path} not found")
+            sys.exit(1)
     
-    # Load and process results
-    results = load_slither_report(report_path)
-    categories = categorize_findings(results)
+    slither_cache = None
+    if args.cache_dir:
+        slither_cache = open_slither_cache(args.cache_dir, args.cache_max_mb * 1024 * 1024,
+                                           args.contracts_root, args.config, args.slither_version)
     
-    # Generate outputs
-    generate_summary_markdown(categories, output_dir)
-    save_critical_issues(categories, output_dir)
+    # Stream, categorize and render in one pass. With the cache, the report is
+    # rewritten to hold cached findings too, so downstream jobs see every finding
+    merged_report = report_path if slither_cache and report_path.endswith('.json') else None
+    result = run_pipeline(slither_report=report_path, slither_baseline=args.baseline,
+                          slither_cache=slither_cache, profiler=profiler_from_args(args),
+                          changed_lines=read_diff(args.changed_lines) if args.changed_lines else None,
+                          triage=triage_from_args(args), snippets=snippets_from_args(args),
+                          extra_sinks=digest_sinks_from_args(args), slither_merged_report=merged_report)
+    slither = result['slither']
+    categories = slither['categories']
+    if slither['cache'] is not None:
+        print(f"Analysis cache: {slither['cache'].hits} contracts reused, {slither['cache'].misses} refreshed")
     
     # Print summary
     total = sum(len(findings) for findings in categories.values())
@@ -143,14 +74,32 @@ def main():
     print(f"  Medium: {len(categories['medium'])}")
     print(f"  Low: {len(categories['low'])}")
     print(f"  Total: {total}")
+    if slither['changed'] is not None:
+        print(f"  On changed lines: {len(slither['changed'])}")
+    if slither['triage'] is not None:
+        print(f"  Triaged: {slither['triage']['suppressed']} suppressed, {slither['triage']['accepted']} accepted")
+    
+    if args.compress and report_path.endswith('.json'):
+        for path in compact_reports([report_path], args.compress):
+            print(f"Compacted report: {path} ({os.path.getsize(path) / 1024:.1f} KB)")
     
     # Exit with appropriate code
-    if categories['critical']:
-        print("❌ Critical issues found - failing build")
-        sys.exit(1)
+    diff = slither['diff']
+    scope = ' on changed lines' if slither['changed'] is not None else ''
+    if diff is not None:
+        print(f"  New: {sum(len(findings) for findings in diff['added'].values())}")
+        print(f"  Resolved: {sum(diff['resolved'].values())}")
+        if slither['gating']:
+            print(f"❌ {len(slither['gating'])} new critical/high issues found{scope} - failing build")
+        else:
+            print(f"✅ No new critical/high issues found{scope}")
+    elif slither['gating']:
+        print(f"❌ Critical issues found{scope} - failing build")
     else:
-        print("✅ No critical issues found")
-        sys.exit(0)
+        print(f"✅ No critical issues found{scope}")
+    if slither['incomplete']:
+        print(f"❌ Slither analysis incomplete - failing build: {slither['incomplete']}")
+    sys.exit(result['verdict']['exit_code'])
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Report Renderer for PayRox Go Beyond
+Single traversal of categorized findings feeding buffered Markdown, JSON, SARIF and HTML sinks
+"""
+
+import argparse
+import html
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Any, Callable, IO, Iterable, Optional
+
+from baseline_diff import fingerprint, normalize_path
+from correlation import Correlation
+from findings import Finding
+from source_snippets import Snippet, SnippetIndex
+
+# Write buffer per sink: output reaches disk in chunks of this size and no
+# sink ever holds its whole document in memory
+WRITE_BUFFER_SIZE = 256 * 1024
+
+# Combined formats written next to the security summary
+REPORT_FORMATS = ('json', 'sarif', 'html')
+REPORT_FILES = {
+    'json': 'security-report.json',
+    'sarif': 'security-report.sarif',
+    'html': 'security-report.html'
+}
+
+SARIF_VERSION = '2.1.0'
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+
+# Severity categories of both tools, lowercased
+SARIF_LEVELS = {'critical': 'error', 'high': 'error', 'medium': 'warning', 'low': 'note', 'informational': 'note'}
+# GitHub code scanning ranks alerts by the rule's `security-severity`
+SECURITY_SEVERITY = {'critical': 9.5, 'high': 7.5, 'medium': 5.0, 'low': 3.0, 'informational': 0.0}
+
+TOOL_INFO = {
+    'slither': ('Slither', 'https://github.com/crytic/slither'),
+    'mythril': ('Mythril', 'https://github.com/Consensys/mythril')
+}
+
+class ToolResults:
+    """One tool's categorized findings, with its severities in rendering order"""
+
+    __slots__ = ('name', 'severities', 'categories')
+
+    def __init__(self, name: str, severities: List[str], categories: Dict[str, List[Finding]]):
+        self.name = name
+        self.severities = severities
+        self.categories = categories
+
+    def total(self) -> int:
+        return sum(len(self.categories.get(severity, [])) for severity in self.severities)
+
+class ReportContext:
+    """Everything a sink may need besides the findings themselves"""
+
+    __slots__ = ('tools', 'security_score', 'slither_data', 'mythril_data', 'timestamp', 'snippets', 'correlation')
+
+    def __init__(self, tools: Iterable[ToolResults] = (), security_score: Optional[Dict[str, Any]] = None,
+                 slither_data: Optional[Dict[str, Any]] = None, mythril_data: Optional[Dict[str, Any]] = None,
+                 timestamp: Optional[str] = None, snippets: Optional[SnippetIndex] = None,
+                 correlation: Optional[Correlation] = None):
+        self.tools = list(tools)
+        self.security_score = security_score
+        self.slither_data = slither_data
+        self.mythril_data = mythril_data
+        self.timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
+        # Source of flagged code embedded by the sinks; None leaves it out
+        self.snippets = snippets
+        # Issue clusters across tools, when the findings were correlated
+        self.correlation = correlation
+
+    def snippet(self, finding: Finding) -> Optional[Snippet]:
+        return self.snippets.snippet(finding) if self.snippets is not None else None
+
+class ReportSink:
+    """One output file fed by render_report(); subclasses override the hooks they need
+
+    `tools` limits which tools' findings reach the sink (None for all).
+    """
+
+    tools: Optional[Iterable[str]] = None
+
+    def __init__(self, path: str):
+        self.path = path
+        self.report: Optional[ReportContext] = None
+        self._file: Optional[IO[str]] = None
+
+    def open(self) -> None:
+        self._file = open(self.path, 'w', buffering=WRITE_BUFFER_SIZE)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def write(self, text: str) -> None:
+        self._file.write(text)
+
+    def accepts(self, tool: str) -> bool:
+        return self.tools is None or tool in self.tools
+
+    def snippet(self, finding: Finding) -> Optional[Snippet]:
+        return self.report.snippet(finding) if self.report is not None else None
+
+    def begin(self, report: ReportContext) -> None:
+        pass
+
+    def begin_tool(self, tool: ToolResults) -> None:
+        pass
+
+    def begin_group(self, tool: ToolResults, severity: str, findings: List[Finding]) -> None:
+        pass
+
+    def finding(self, tool: ToolResults, severity: str, finding: Finding) -> None:
+        pass
+
+    def end_group(self, tool: ToolResults, severity: str, findings: List[Finding]) -> None:
+        pass
+
+    def end_tool(self, tool: ToolResults) -> None:
+        pass
+
+    def end(self, report: ReportContext) -> None:
+        pass
+
+def render_report(report: ReportContext, sinks: List[ReportSink]) -> None:
+    """Walk every finding once, handing it to all sinks interested in its tool"""
+    opened: List[ReportSink] = []
+    try:
+        for sink in sinks:
+            sink.open()
+            opened.append(sink)
+            sink.report = report
+            sink.begin(report)
+
+        for tool in report.tools:
+            active = [sink for sink in sinks if sink.accepts(tool.name)]
+            if not active:
+                continue
+            handlers = [sink.finding for sink in active]
+            for sink in active:
+                sink.begin_tool(tool)
+            for severity in tool.severities:
+                findings = tool.categories.get(severity, [])
+                for sink in active:
+                    sink.begin_group(tool, severity, findings)
+                for finding in findings:
+                    for handler in handlers:
+                        handler(tool, severity, finding)
+                for sink in active:
+                    sink.end_group(tool, severity, findings)
+            for sink in active:
+                sink.end_tool(tool)
+
+        for sink in sinks:
+            sink.end(report)
+    finally:
+        for sink in opened:
+            sink.close()
+
+def indented_json(value: Any, level: int = 1, indent: int = 2) -> str:
+    """json.dumps(value, indent=indent) as it appears nested `level` deep
+
+    JSON strings never contain raw newlines, so re-indenting line breaks is
+    safe and matches what json.dump produces for the enclosing document.
+    """
+    return json.dumps(value, indent=indent).replace('\n', '\n' + ' ' * (indent * level))
+
+def markdown_snippet(snippet: Snippet, indent: str = '  ') -> str:
+    """Fenced Solidity block for a snippet, indented to sit under a list item"""
+    lines = [f"{indent}`{snippet.filename}#L{snippet.start_line}-L{snippet.end_line}`", '',
+             f"{indent}```solidity"]
+    lines.extend(f"{indent}{line}".rstrip() for line in snippet.text.split('\n'))
+    if snippet.truncated:
+        lines.append(f"{indent}// … through line {snippet.end_line}")
+    lines.append(f"{indent}```")
+    return '\n'.join(lines) + '\n\n'
+
+class JsonArraySink(ReportSink):
+    """Indented JSON array with one entry per finding, identical to json.dump(entries, f, indent=2)"""
+
+    def __init__(self, path: str, tool: str, entry: Callable[[Finding], Any],
+                 severities: Optional[Iterable[str]] = None):
+        super().__init__(path)
+        self.tools = (tool,)
+        self._entry = entry
+        self._severities = set(severities) if severities is not None else None
+        self._count = 0
+
+    def finding(self, tool: ToolResults, severity: str, finding: Finding) -> None:
+        if self._severities is not None and severity not in self._severities:
+            return
+        self.write(',\n  ' if self._count else '[\n  ')
+        self.write(indented_json(self._entry(finding)))
+        self._count += 1
+
+    def end(self, report: ReportContext) -> None:
+        self.write('\n]' if self._count else '[]')
+
+def finding_location(filename: str, start: int, end: int) -> Dict[str, Any]:
+    return {'file': normalize_path(filename), 'start_line': start, 'end_line': end}
+
+def snippet_entry(snippet: Snippet) -> Dict[str, Any]:
+    return {'file': snippet.filename, 'start_line': snippet.start_line, 'end_line': snippet.end_line,
+            'text': snippet.text, 'truncated': snippet.truncated}
+
+def finding_entry(finding: Finding, snippet: Optional[Snippet] = None) -> Dict[str, Any]:
+    """Tool-neutral finding record used by the combined JSON report"""
+    entry = {
+        'tool': finding.tool,
+        'severity': finding.severity,
+        'check': finding.check,
+        'description': finding.description,
+        'impact': finding.impact,
+        'confidence': finding.confidence,
+        'contract': finding.contract,
+        'function': finding.function,
+        'file': normalize_path(finding.filename),
+        'locations': [finding_location(*span) for span in finding.spans],
+        'id': finding.finding_id,
+        'swc_id': finding.swc_id,
+        'fingerprint': fingerprint(finding)
+    }
+    if snippet is not None:
+        entry['snippet'] = snippet_entry(snippet)
+    return entry
+
+class JsonReportSink(ReportSink):
+    """Combined machine-readable report: score, counts, then one finding per line"""
+
+    def begin(self, report: ReportContext) -> None:
+        header = {
+            'generated': report.timestamp,
+            'security_score': report.security_score,
+            'counts': {tool.name: {severity: len(tool.categories.get(severity, []))
+                                   for severity in tool.severities}
+                       for tool in report.tools}
+        }
+        if report.correlation is not None:
+            header['correlation'] = report.correlation.summary()
+            header['clusters'] = [cluster.to_dict() for cluster in report.correlation.multi()]
+        self.write(json.dumps(header)[:-1] + ', "findings": [')
+        self._count = 0
+
+    def finding(self, tool: ToolResults, severity: str, finding: Finding) -> None:
+        self.write(',\n' if self._count else '\n')
+        entry = finding_entry(finding, self.snippet(finding))
+        if self.report.correlation is not None:
+            entry['cluster'] = self.report.correlation.cluster_of(finding)
+        self.write(json.dumps(entry))
+        self._count += 1
+
+    def end(self, report: ReportContext) -> None:
+        self.write('\n]}\n' if self._count else ']}\n')
+
+def _sarif_location(filename: str, start: int, end: int) -> Dict[str, Any]:
+    physical: Dict[str, Any] = {'artifactLocation': {'uri': normalize_path(filename)}}
+    if start and start >= 1:
+        physical['region'] = {'startLine': start, 'endLine': max(start, end)}
+    return {'physicalLocation': physical}
+
+class SarifSink(ReportSink):
+    """SARIF 2.1.0 log with one run per tool, for code scanning upload
+
+    Results are streamed as they arrive; each run's rules are collected along
+    the way and written after its results, which SARIF's key order allows.
+    """
+
+    def begin(self, report: ReportContext) -> None:
+        self.write(f'{{"$schema": {json.dumps(SARIF_SCHEMA)}, "version": {json.dumps(SARIF_VERSION)}, "runs": [')
+        self._runs = 0
+
+    def begin_tool(self, tool: ToolResults) -> None:
+        self.write(',\n{"results": [' if self._runs else '\n{"results": [')
+        self._rules: Dict[str, Dict[str, Any]] = {}
+        self._results = 0
+
+    def _rule(self, finding: Finding, severity: str) -> Dict[str, Any]:
+        rule = self._rules.get(finding.check)
+        if rule is None:
+            rule = {'id': finding.check, 'name': finding.check,
+                    'shortDescription': {'text': finding.check},
+                    'properties': {'tags': ['security'], 'security-severity': '0.0'}}
+            if finding.swc_id:
+                rule['helpUri'] = f"https://swcregistry.io/docs/SWC-{finding.swc_id}"
+            self._rules[finding.check] = rule
+        # A rule is as severe as its worst result
+        score = SECURITY_SEVERITY.get(severity.lower(), 0.0)
+        if score > float(rule['properties']['security-severity']):
+            rule['properties']['security-severity'] = f"{score:.1f}"
+        return rule
+
+    def finding(self, tool: ToolResults, severity: str, finding: Finding) -> None:
+        self._rule(finding, severity)
+        result: Dict[str, Any] = {
+            'ruleId': finding.check,
+            'level': SARIF_LEVELS.get(severity.lower(), 'note'),
+            'message': {'text': finding.description.strip() or finding.check}
+        }
+        if finding.spans:
+            result['locations'] = [_sarif_location(*finding.spans[0])]
+            if len(finding.spans) > 1:
+                result['relatedLocations'] = [dict(_sarif_location(*span), id=index)
+                                              for index, span in enumerate(finding.spans[1:], 1)]
+        elif finding.filename and finding.filename != 'Unknown':
+            result['locations'] = [_sarif_location(finding.filename, 0, 0)]
+        snippet = self.snippet(finding)
+        if snippet is not None and 'locations' in result:
+            # The snippet covers whole lines, so it replaces the primary region;
+            # a cut-short snippet would not be the region's text
+            region = {'startLine': snippet.start_line, 'endLine': snippet.end_line}
+            if not snippet.truncated:
+                region['snippet'] = {'text': snippet.text}
+            result['locations'][0]['physicalLocation']['region'] = region
+        result['partialFingerprints'] = {'payroxFindingHash/v1': fingerprint(finding)}
+        properties = {'severity': severity}
+        if finding.confidence:
+            properties['confidence'] = finding.confidence
+        if finding.swc_id:
+            properties['swc_id'] = finding.swc_id
+        result['properties'] = properties
+
+        self.write(',\n' if self._results else '\n')
+        self.write(json.dumps(result))
+        self._results += 1
+
+    def end_tool(self, tool: ToolResults) -> None:
+        name, uri = TOOL_INFO.get(tool.name, (tool.name, ''))
+        driver = {'name': name, 'informationUri': uri, 'rules': list(self._rules.values())}
+        self.write(f'\n], "tool": {json.dumps({"driver": driver})}}}')
+        self._runs += 1
+
+    def end(self, report: ReportContext) -> None:
+        self.write('\n]}\n')
+
+_HTML_STYLE = """body { font-family: -apple-system, "Segoe UI", Helvetica, Arial, sans-serif; margin: 2em; color: #24292f; }
+table { border-collapse: collapse; width: 100%; margin-bottom: 1.5em; }
+th, td { border: 1px solid #d0d7de; padding: 4px 8px; text-align: left; vertical-align: top; }
+th { background: #f6f8fa; }
+td.description { white-space: pre-wrap; }
+pre.snippet { background: #f6f8fa; border: 1px solid #d0d7de; padding: 6px; margin: 6px 0 0; overflow-x: auto; white-space: pre; }
+pre.snippet .line { color: #8c959f; user-select: none; }
+.critical, .High { color: #cf222e; }
+.high { color: #d1242f; }
+.medium, .Medium { color: #bc4c00; }
+.low, .Low { color: #9a6700; }
+.informational { color: #57606a; }
+"""
+
+class HtmlReportSink(ReportSink):
+    """Static single-file HTML report with one table per tool and severity"""
+
+    def begin(self, report: ReportContext) -> None:
+        self.write('<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n')
+        self.write('<title>PayRox Go Beyond Security Analysis Report</title>\n')
+        self.write(f'<style>\n{_HTML_STYLE}</style>\n</head>\n<body>\n')
+        self.write('<h1>🛡️ PayRox Go Beyond Security Analysis Report</h1>\n')
+        self.write(f'<p><strong>Generated</strong>: {html.escape(report.timestamp)}</p>\n')
+        score = report.security_score
+        if score:
+            self.write(f'<p><strong>Security Score</strong>: {score["score"]}/100 '
+                       f'(<span style="color: {html.escape(score["color"])}">{html.escape(score["status"])}</span>)</p>\n')
+            if score['issues']:
+                self.write('<ul>\n')
+                for issue in score['issues']:
+                    self.write(f'<li>{html.escape(issue)}</li>\n')
+                self.write('</ul>\n')
+
+    def begin_tool(self, tool: ToolResults) -> None:
+        name = TOOL_INFO.get(tool.name, (tool.name, ''))[0]
+        self.write(f'<h2>{html.escape(name)}: {tool.total()} findings</h2>\n')
+        if not tool.total():
+            self.write('<p>✅ No findings</p>\n')
+
+    def begin_group(self, tool: ToolResults, severity: str, findings: List[Finding]) -> None:
+        if not findings:
+            return
+        self.write(f'<h3 class="{html.escape(severity)}">{html.escape(severity.capitalize())} ({len(findings)})</h3>\n')
+        self.write('<table>\n<thead><tr><th>Check</th><th>Location</th><th>Description</th></tr></thead>\n<tbody>\n')
+
+    def finding(self, tool: ToolResults, severity: str, finding: Finding) -> None:
+        locations = '<br>'.join(f"{html.escape(normalize_path(filename))}#L{start}-L{end}"
+                                for filename, start, end in finding.spans[:3])
+        if not locations:
+            locations = html.escape(normalize_path(finding.filename))
+        self.write(f'<tr><td><code>{html.escape(finding.check)}</code></td><td>{locations}</td>'
+                   f'<td class="description">{html.escape(finding.description.strip())}')
+        snippet = self.snippet(finding)
+        if snippet is not None:
+            self.write('<pre class="snippet">')
+            for number, line in enumerate(snippet.text.split('\n'), snippet.start_line):
+                self.write(f'<span class="line">{number:>5} </span>{html.escape(line)}\n')
+            if snippet.truncated:
+                self.write(f'<span class="line">      </span>… through line {snippet.end_line}\n')
+            self.write('</pre>')
+        self.write('</td></tr>\n')
+
+    def end_group(self, tool: ToolResults, severity: str, findings: List[Finding]) -> None:
+        if findings:
+            self.write('</tbody>\n</table>\n')
+
+    def end(self, report: ReportContext) -> None:
+        self.write('</body>\n</html>\n')
+
+REPORT_SINKS = {'json': JsonReportSink, 'sarif': SarifSink, 'html': HtmlReportSink}
+
+def report_sinks(output_dir: str, formats: Iterable[str] = REPORT_FORMATS) -> List[ReportSink]:
+    """Sinks for the combined report formats, written into output_dir"""
+    return [REPORT_SINKS[fmt](os.path.join(output_dir, REPORT_FILES[fmt])) for fmt in formats]
+
+def parse_formats(value: str) -> List[str]:
+    """argparse type for a comma-separated subset of REPORT_FORMATS ('' for none)"""
+    formats = [fmt.strip() for fmt in value.split(',') if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in REPORT_SINKS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown format(s) {', '.join(unknown)}; "
+                                         f"choose from {', '.join(REPORT_FORMATS)}")
+    return formats
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Parallel Mythril Runner for PayRox Go Beyond
+Schedules per-contract symbolic analysis across a process pool within a global time budget
+"""
+
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Any, Optional, Tuple
+
+import mythril_processor
+from analysis_cache import DEFAULT_MAX_BYTES, AnalysisCache, SourceHasher, detect_tool_version, discover_contracts
+from bulk_loader import LoadErrors
+from changed_lines import read_diff
+from compact_reports import COMPRESSED_SUFFIXES, compact_reports, raw_mythril_reports
+from findings import Finding
+from pr_digest import add_digest_arguments, digest_sinks_from_args
+from security_pipeline import run_pipeline
+from severity_policy import add_policy_arguments, policy_from_args
+from source_snippets import add_snippet_arguments, snippets_from_args
+from triage import add_triage_arguments, triage_from_args
+from stage_profiler import add_profile_arguments, profiler_from_args
+
+DEFAULT_HISTORY = '.security-cache/mythril-runtimes.json'
+
+# Fraction of a contract's slice handed to Mythril's own execution timeout,
+# leaving headroom for solc compilation and report serialization
+EXECUTION_TIMEOUT_RATIO = 0.8
+
+# Execution timeouts are rounded down to this many steps per doubling, so
+# slices that differ by seconds from run to run grant the same timeout
+EXECUTION_TIMEOUT_STEPS = 4
+
+def report_names(contracts: List[str]) -> Dict[str, str]:
+    """Map contracts to mythril-<name>.json, qualifying names that collide"""
+    basenames: Dict[str, int] = {}
+    for contract in contracts:
+        name = os.path.splitext(os.path.basename(contract))[0]
+        basenames[name] = basenames.get(name, 0) + 1
+
+    names = {}
+    for contract in contracts:
+        name = os.path.splitext(os.path.basename(contract))[0]
+        if basenames[name] > 1:
+            name = os.path.splitext(contract)[0].strip('./').replace('/', '_')
+        names[contract] = f"mythril-{name}.json"
+    return names
+
+def load_runtime_history(history_path: str) -> Dict[str, float]:
+    """Load recorded per-contract runtimes from earlier runs"""
+    try:
+        with open(history_path, 'r') as f:
+            return {k: float(v) for k, v in json.load(f).items()}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Warning: Could not load runtime history {history_path}: {e}")
+        return {}
+
+def save_runtime_history(history: Dict[str, float], history_path: str) -> None:
+    """Persist per-contract runtimes for the next run's scheduling"""
+    directory = os.path.dirname(history_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(history_path, 'w') as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+
+def estimate_runtimes(contracts: List[str], history: Dict[str, float]) -> Dict[str, float]:
+    """Expected seconds per contract: recorded runtime, else scaled by source size"""
+    sizes = {contract: max(os.path.getsize(contract), 1) for contract in contracts}
+
+    # Seconds per byte observed on contracts with history, used for new contracts
+    known = [history[c] / sizes[c] for c in contracts if c in history]
+    rate = sorted(known)[len(known) // 2] if known else 1.0
+
+    return {c: history[c] if c in history else sizes[c] * rate for c in contracts}
+
+def slice_timeout(estimate: float, pending_estimate: float, remaining: float,
+                  workers: int, min_timeout: float, max_timeout: float) -> float:
+    """Share of the remaining pool capacity proportional to a contract's estimate"""
+    share = remaining * workers * estimate / pending_estimate if pending_estimate > 0 else remaining
+    return max(min_timeout, min(share, max_timeout, remaining))
+
+def analyze_contract(command: List[str], timeout: float, output_path: str) -> Tuple[str, float]:
+    """Run Mythril on one contract and write its JSON report (pool worker)"""
+    start = time.monotonic()
+    try:
+        proc = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        report = {'success': False, 'error': f"Timed out after {timeout:.0f}s", 'issues': []}
+        status = 'timeout'
+    except OSError as e:
+        report = {'success': False, 'error': str(e), 'issues': []}
+        status = 'error'
+    else:
+        # Mythril exits non-zero when it finds issues, so judge by the output
+        try:
+            report = json.loads(proc.stdout)
+            status = 'ok'
+        except ValueError:
+            report = {'success': False, 'error': proc.stderr.strip()[-2000:], 'issues': []}
+            status = 'error'
+    elapsed = time.monotonic() - start
+
+    with open(output_path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    return status, elapsed
+
+def execution_timeout(timeout: float) -> int:
+    """Mythril's --execution-timeout for a contract's time slice, rounded down to a coarse step"""
+    seconds = max(1.0, timeout * EXECUTION_TIMEOUT_RATIO)
+    step = math.floor(math.log2(seconds) * EXECUTION_TIMEOUT_STEPS + 1e-9)
+    return max(1, int(2 ** (step / EXECUTION_TIMEOUT_STEPS) + 1e-9))
+
+def build_command(args: argparse.Namespace, contract: str, timeout: float) -> List[str]:
+    """Assemble the `myth analyze` invocation for one contract"""
+    return [
+        args.myth, 'analyze', contract,
+        '--solv', args.solv,
+        '--max-depth', str(args.max_depth),
+        '--execution-timeout', str(execution_timeout(timeout)),
+        '--strategy', args.strategy,
+        '-o', 'json'
+    ]
+
+def mythril_config(args: argparse.Namespace) -> Dict[str, Any]:
+    """Flags that change Mythril's results for every contract, folded into cache keys"""
+    return {
+        'solv': args.solv,
+        'max_depth': args.max_depth,
+        'strategy': args.strategy
+    }
+
+def mythril_key(hasher: SourceHasher, contract: str, tool_version: str, config: Dict[str, Any]) -> str:
+    """Cache key for one contract; the time slice is kept in the entry, not the key"""
+    return hasher.key(contract, 'mythril', tool_version, config)
+
+def cached_report(cache: AnalysisCache, key: str, timeout: float) -> Optional[Dict[str, Any]]:
+    """A cached report analyzed for at least the execution timeout granted now
+
+    Mythril stops exploring at its execution timeout, so a report from a
+    longer analysis covers a shorter one, but not the other way round.
+    """
+    entry = cache.get(key)
+    if entry is None or entry.get('execution_timeout', 0) < execution_timeout(timeout):
+        return None
+    return entry['report']
+
+def cache_report(cache: AnalysisCache, key: str, timeout: float, output_path: str) -> None:
+    with open(output_path, 'r') as f:
+        cache.put(key, {'execution_timeout': execution_timeout(timeout), 'report': json.load(f)})
+
+def restore_cached(report: Any, output_path: str) -> None:
+    """Write a cached report where the analysis would have written it"""
+    with open(output_path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+def run_mythril(args: argparse.Namespace) -> Dict[str, Any]:
+    """Analyze all contracts longest-first and stream results into the processor
+
+    Cached reports are looked up as each contract is scheduled, once its time
+    slice (and so its execution timeout) is known. Each report is categorized
+    as it completes and the results are merged in report path order, as
+    process-mythril.py merges them, then gated, scored and rendered by run_pipeline.
+    """
+    contracts = args.contracts or discover_contracts(args.contracts_root)
+    names = report_names(contracts)
+    os.makedirs(args.output_dir, exist_ok=True)
+    categorized: Dict[str, Dict[str, List[Finding]]] = {}
+    load_errors = LoadErrors()
+    outcome: Dict[str, Any] = {'contracts': len(contracts), 'ok': [], 'timeout': [], 'error': [],
+                               'skipped': [], 'cached': []}
+
+    cache: Optional[AnalysisCache] = None
+    hasher = SourceHasher()
+    tool_version = ''
+    config = mythril_config(args)
+    keys: Dict[str, str] = {}
+    if args.cache_dir:
+        cache = AnalysisCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
+        tool_version = detect_tool_version([args.myth, 'version'])
+
+    history = load_runtime_history(args.history)
+    estimates = estimate_runtimes(contracts, history)
+
+    # Longest expected runtime first so the tail of the schedule is short jobs
+    pending = deque(sorted(contracts, key=lambda c: estimates[c], reverse=True))
+    pending_estimate = sum(estimates.values())
+
+    deadline = time.monotonic() + args.budget
+
+    print(f"🔍 Analyzing {len(contracts)} contracts with {args.jobs} workers (budget {args.budget:.0f}s)")
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        in_flight = {}
+        while pending or in_flight:
+            while pending and len(in_flight) < args.jobs:
+                remaining = deadline - time.monotonic()
+                if remaining < args.min_timeout:
+                    outcome['skipped'].extend(pending)
+                    pending.clear()
+                    break
+                contract = pending.popleft()
+                timeout = slice_timeout(estimates[contract], pending_estimate, remaining,
+                                        args.jobs, args.min_timeout, args.max_timeout)
+                pending_estimate -= estimates[contract]
+                output_path = os.path.join(args.output_dir, names[contract])
+                if cache is not None:
+                    keys[contract] = mythril_key(hasher, contract, tool_version, config)
+                    report = cached_report(cache, keys[contract], timeout)
+                    if report is not None:
+                        restore_cached(report, output_path)
+                        outcome['cached'].append(contract)
+                        print(f"♻️ {os.path.basename(contract)} (cached)")
+                        categorized[output_path] = mythril_processor.categorize_mythril_findings(
+                            report.get('issues', []))
+                        continue
+                future = pool.submit(analyze_contract, build_command(args, contract, timeout),
+                                     timeout, output_path)
+                in_flight[future] = (contract, output_path, timeout)
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                contract, output_path, timeout = in_flight.pop(future)
+                status, elapsed = future.result()
+                outcome[status].append(contract)
+
+                # A timed-out run only tells us the true runtime is at least this long
+                if status == 'timeout':
+                    history[contract] = max(history.get(contract, 0.0), elapsed)
+                elif status == 'ok':
+                    history[contract] = round(elapsed, 2)
+
+                # Only complete analyses are worth reusing
+                if status == 'ok' and cache is not None:
+                    cache_report(cache, keys[contract], timeout, output_path)
+
+                icon = {'ok': '✅', 'timeout': '⏱️', 'error': '❌'}[status]
+                print(f"{icon} {os.path.basename(contract)} ({elapsed:.1f}s, {status})")
+                categorized[output_path] = mythril_processor.categorize_mythril_findings(
+                    mythril_processor.load_mythril_report(output_path, load_errors))
+
+    categories = mythril_processor.categorize_mythril_findings([])
+    for output_path in sorted(categorized):
+        for severity, findings in categorized[output_path].items():
+            categories[severity].extend(findings)
+
+    save_runtime_history(history, args.history)
+    if cache is not None:
+        cache.save()
+
+    result = run_pipeline(mythril_dir=args.output_dir, mythril_baseline=args.baseline,
+                          profiler=profiler_from_args(args),
+                          changed_lines=read_diff(args.changed_lines) if args.changed_lines else None,
+                          triage=triage_from_args(args), snippets=snippets_from_args(args),
+                          extra_sinks=digest_sinks_from_args(args), mythril_categories=categories,
+                          mythril_load_errors=load_errors)
+    outcome['mythril'] = result['mythril']
+    outcome['verdict'] = result['verdict']
+    return outcome
+
+def exit_code(outcome: Dict[str, Any]) -> int:
+    """Non-zero when no contract produced a report, or new findings gate the build in diff mode"""
+    if outcome['contracts'] and not outcome['ok'] and not outcome['cached']:
+        return 1
+    if outcome['mythril']['diff'] is not None:
+        return outcome['verdict']['exit_code']
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Run Mythril over PayRox Go Beyond contracts in parallel')
+    parser.add_argument('contracts', nargs='*', help='Contracts to analyze (default: all under --contracts-root)')
+    parser.add_argument('--contracts-root', default='contracts', help='Directory searched for .sol files')
+    parser.add_argument('--output-dir', default='security-reports', help='Directory for mythril-*.json reports')
+    parser.add_argument('--budget', type=float, default=1800, help='Overall wall-clock budget in seconds')
+    parser.add_argument('--min-timeout', type=float, default=30, help='Smallest per-contract time slice')
+    parser.add_argument('--max-timeout', type=float, default=600, help='Largest per-contract time slice')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Parallel Mythril processes')
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help='Runtime history used for scheduling')
+    parser.add_argument('--cache-dir', help='Reuse cached reports for unchanged contracts')
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help='Analysis cache size bound')
+    parser.add_argument('--myth', default='myth', help='Mythril executable')
+    parser.add_argument('--solv', default='0.8.30', help='Solidity compiler version')
+    parser.add_argument('--max-depth', type=int, default=5, help='Mythril --max-depth')
+    parser.add_argument('--strategy', default='bfs', help='Mythril search strategy')
+    parser.add_argument('--compress', choices=sorted(COMPRESSED_SUFFIXES),
+                        help='Replace the per-contract reports with compressed copies when done')
+    parser.add_argument('--baseline', help='Baseline reports directory or mythril-summary.json; '
+                                           'report and gate only on changes')
+    parser.add_argument('--changed-lines', help="Unified diff ('-' for stdin); gate only on findings it touches")
+    add_policy_arguments(parser)
+    add_snippet_arguments(parser)
+    add_digest_arguments(parser)
+    add_triage_arguments(parser)
+    add_profile_arguments(parser)
+
+    args = parser.parse_args()
+    policy_from_args(args)
+
+    if not args.contracts and not os.path.isdir(args.contracts_root):
+        print(f"Error: Contracts directory {args.contracts_root} not found")
+        sys.exit(1)
+    for path in filter(None, [args.baseline, args.changed_lines if args.changed_lines != '-' else None]):
+        if not os.path.exists(path):
+            print(f"Error: {path} not found")
+            sys.exit(1)
+
+    outcome = run_mythril(args)
+    mythril = outcome['mythril']
+    categories = mythril['categories']
+
+    print(f"Mythril analysis complete:")
+    print(f"  Analyzed: {len(outcome['ok'])}")
+    print(f"  Reused from cache: {len(outcome['cached'])}")
+    print(f"  Timed out: {len(outcome['timeout'])}")
+    print(f"  Errors: {len(outcome['error'])}")
+    print(f"  Skipped (budget exhausted): {len(outcome['skipped'])}")
+    print(f"  High: {len(categories['High'])}")
+    print(f"  Medium: {len(categories['Medium'])}")
+    print(f"  Low: {len(categories['Low'])}")
+    if mythril['changed'] is not None:
+        print(f"  On changed lines: {len(mythril['changed'])}")
+    if mythril['triage'] is not None:
+        print(f"  Triaged: {mythril['triage']['suppressed']} suppressed, {mythril['triage']['accepted']} accepted")
+    
+    if args.compress:
+        compacted = compact_reports(raw_mythril_reports(args.output_dir), args.compress)
+        print(f"  Compacted reports: {len(compacted)}")
+    
+    diff = mythril['diff']
+    if diff is not None:
+        print(f"  New: {sum(len(findings) for findings in diff['added'].values())}")
+        print(f"  Resolved: {sum(diff['resolved'].values())}")
+        if mythril['gating']:
+            print(f"❌ {len(mythril['gating'])} new high-severity findings introduced - failing build")
+    if outcome['contracts'] and not outcome['ok'] and not outcome['cached']:
+        print("❌ No contract was analyzed successfully - failing build")
+    sys.exit(exit_code(outcome))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Parallel Slither Runner for PayRox Go Beyond
+Analyzes each contract as its own compilation target in parallel and merges the reports
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Any, Optional, Tuple
+
+from analysis_cache import discover_contracts
+from slither_processor import iter_slither_detectors
+
+DEFAULT_HISTORY = '.security-cache/slither-runtimes.json'
+
+def compilation_targets(contracts_root: str, only: Optional[List[str]] = None) -> List[str]:
+    """Contracts to hand to Slither one at a time
+
+    With `only`, the rest are left out (their findings come from the
+    analysis cache, whose keys cover each contract's imports).
+    """
+    contracts = discover_contracts(contracts_root)
+    if only:
+        wanted = {os.path.normpath(path) for path in only}
+        contracts = [contract for contract in contracts if os.path.normpath(contract) in wanted]
+    return contracts
+
+def report_name(contract: str, contracts_root: str) -> str:
+    """slither-<path under the root>.json, unique per contract"""
+    relative = os.path.splitext(os.path.relpath(contract, contracts_root))[0]
+    return f"slither-{relative.replace(os.sep, '_').replace('/', '_')}.json"
+
+def load_runtime_history(history_path: str) -> Dict[str, float]:
+    """Load recorded per-contract runtimes from earlier runs"""
+    try:
+        with open(history_path, 'r') as f:
+            return {k: float(v) for k, v in json.load(f).items()}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Warning: Could not load runtime history {history_path}: {e}")
+        return {}
+
+def save_runtime_history(history: Dict[str, float], history_path: str) -> None:
+    """Persist per-contract runtimes for the next run's scheduling"""
+    directory = os.path.dirname(history_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(history_path, 'w') as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+
+def estimate_runtimes(contracts: List[str], history: Dict[str, float]) -> Dict[str, float]:
+    """Expected seconds per contract: recorded runtime, else scaled by source size"""
+    sizes = {contract: max(os.path.getsize(contract), 1) for contract in contracts}
+    # Seconds per byte observed on contracts with history, used for new contracts
+    known = [history[c] / sizes[c] for c in contracts if c in history]
+    rate = sorted(known)[len(known) // 2] if known else 1.0
+    return {c: history[c] if c in history else sizes[c] * rate for c in contracts}
+
+def build_command(args: argparse.Namespace, contract: str, output_path: str) -> List[str]:
+    """Assemble the `slither` invocation for one contract
+
+    The contract itself is the target, so Slither compiles and analyzes only
+    it and its imports rather than the whole project.
+    """
+    return [args.slither, contract, '--json', output_path] + args.slither_args
+
+def run_target(command: List[str], timeout: float, output_path: str) -> Tuple[str, float]:
+    """Run Slither on one contract, writing an error report if it produced none (pool worker)"""
+    # Slither refuses to overwrite an existing --json file
+    if os.path.exists(output_path):
+        os.remove(output_path)
+    start = time.monotonic()
+    error = None
+    try:
+        proc = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        error, status = f"Timed out after {timeout:.0f}s", 'timeout'
+    except OSError as e:
+        error, status = str(e), 'error'
+    else:
+        # Slither exits non-zero when it reports findings, so judge by the output
+        status = 'ok' if os.path.exists(output_path) else 'error'
+        if status == 'error':
+            error = proc.stderr.strip()[-2000:] or f"slither exited with code {proc.returncode}"
+    elapsed = time.monotonic() - start
+
+    if error is not None:
+        with open(output_path, 'w') as f:
+            json.dump({'success': False, 'error': error, 'results': {'detectors': []}}, f)
+    return status, elapsed
+
+def detector_key(detector: Dict[str, Any]) -> str:
+    """Identity used to drop findings reported for more than one target"""
+    if detector.get('id'):
+        return f"{detector.get('check', '')}:{detector['id']}"
+    return hashlib.sha1(json.dumps(detector, sort_keys=True).encode()).hexdigest()
+
+def merge_slither_reports(report_paths: List[str], output_path: str,
+                          analyzed: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Stream per-target reports into one Slither report, skipping duplicate findings
+
+    Shared libraries and interfaces are compiled with every contract that
+    imports them, so the same finding can appear more than once; only
+    detector keys are held in memory, never the detectors themselves.
+    Reports of failed targets contribute their error and mark the merged
+    report unsuccessful, so the gate can tell the analysis is incomplete.
+    `analyzed` lists the contracts whose analysis completed; the analysis
+    cache stores findings for those contracts only.
+    """
+    seen = set()
+    errors = []
+    success = True
+    stats = {'detectors': 0, 'duplicates': 0}
+    temp_path = output_path + '.tmp'
+    with open(temp_path, 'w') as out:
+        out.write('{"results": {"detectors": [')
+        for path in report_paths:
+            header: Dict[str, Any] = {}
+            for detector in iter_slither_detectors(path, header):
+                key = detector_key(detector)
+                if key in seen:
+                    stats['duplicates'] += 1
+                    continue
+                seen.add(key)
+                if stats['detectors']:
+                    out.write(', ')
+                out.write(json.dumps(detector))
+                stats['detectors'] += 1
+            if header.get('success') is False:
+                success = False
+            if header.get('error'):
+                errors.append(f"{os.path.basename(path)}: {header['error']}")
+        out.write(']}, ')
+        out.write(f'"success": {json.dumps(success)}, "error": {json.dumps("; ".join(errors) or None)}')
+        if analyzed is not None:
+            out.write(f', "analyzed": {json.dumps(sorted(analyzed))}')
+        out.write('}')
+    os.replace(temp_path, output_path)
+    stats['success'] = success
+    stats['errors'] = errors
+    return stats
+
+def run_slither(args: argparse.Namespace) -> Dict[str, Any]:
+    """Analyze every contract longest-first in parallel and merge their reports"""
+    contracts = compilation_targets(args.contracts_root, args.contracts or None)
+    outcome: Dict[str, Any] = {'contracts': len(contracts), 'ok': [], 'timeout': [], 'error': []}
+    report_dir = args.shard_dir or os.path.join(os.path.dirname(args.output) or '.', 'slither-shards')
+    os.makedirs(report_dir, exist_ok=True)
+
+    history = load_runtime_history(args.history)
+    estimates = estimate_runtimes(contracts, history)
+
+    print(f"🔍 Analyzing {len(contracts)} contracts with {args.jobs} workers")
+
+    report_paths = []
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        # Longest expected runtime first so the tail of the schedule is short jobs
+        in_flight = {}
+        for contract in sorted(contracts, key=lambda c: (-estimates[c], c)):
+            output_path = os.path.join(report_dir, report_name(contract, args.contracts_root))
+            report_paths.append(output_path)
+            future = pool.submit(run_target, build_command(args, contract, output_path), args.timeout, output_path)
+            in_flight[future] = contract
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                contract = in_flight.pop(future)
+                status, elapsed = future.result()
+                outcome[status].append(contract)
+
+                # A timed-out run only tells us the true runtime is at least this long
+                if status == 'timeout':
+                    history[contract] = max(history.get(contract, 0.0), elapsed)
+                elif status == 'ok':
+                    history[contract] = round(elapsed, 2)
+
+                icon = {'ok': '✅', 'timeout': '⏱️', 'error': '❌'}[status]
+                print(f"{icon} {contract} ({elapsed:.1f}s, {status})")
+
+    save_runtime_history(history, args.history)
+    # Failed targets are merged too: their error marks the report incomplete
+    outcome['merge'] = merge_slither_reports(sorted(report_paths), args.output, outcome['ok'])
+    return outcome
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run Slither over PayRox Go Beyond contracts in parallel',
+        epilog='Arguments after `--` are passed to every slither invocation')
+    parser.add_argument('contracts', nargs='*',
+                        help='Only analyze these contracts (default: all)')
+    parser.add_argument('--contracts-root', default='contracts', help='Directory searched for .sol files')
+    parser.add_argument('--output', default='security-reports/slither-report.json', help='Merged Slither report')
+    parser.add_argument('--shard-dir', help='Directory for per-contract reports (default: next to --output)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Parallel Slither processes')
+    parser.add_argument('--timeout', type=float, default=1800, help='Per-contract timeout in seconds')
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help='Runtime history used for scheduling')
+    parser.add_argument('--slither', default='slither', help='Slither executable')
+
+    argv = sys.argv[1:]
+    passthrough: List[str] = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, passthrough = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+    args.slither_args = passthrough
+
+    if not os.path.isdir(args.contracts_root):
+        print(f"Error: Contracts directory {args.contracts_root} not found")
+        sys.exit(1)
+
+    outcome = run_slither(args)
+    merge = outcome['merge']
+
+    print(f"Slither analysis complete:")
+    print(f"  Analyzed: {len(outcome['ok'])} of {outcome['contracts']}")
+    print(f"  Timed out: {len(outcome['timeout'])}")
+    print(f"  Errors: {len(outcome['error'])}")
+    print(f"  Findings: {merge['detectors']} ({merge['duplicates']} duplicates from shared imports removed)")
+    print(f"  Report: {args.output}")
+
+    # Failed contracts are recorded in the merged report; process-slither
+    # processes the rest and fails the gate on the incomplete analysis
+    if not merge['success']:
+        print(f"⚠️ Analysis incomplete ({len(outcome['timeout']) + len(outcome['error'])} contracts failed) "
+              f"- reported by the security gate")
+
+if __name__ == "__main__":
+    main()
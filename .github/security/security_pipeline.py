@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Security Pipeline for PayRox Go Beyond
+Categorizes, scores and renders Slither and Mythril results in a single pass
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import mythril_processor
+import slither_processor
+from analysis_cache import AnalysisCache, DEFAULT_MAX_BYTES
+from baseline_diff import diff_findings, gated_findings, write_diff_json, write_diff_markdown
+from bulk_loader import BulkLoader, LoadErrors
+from changed_lines import Hunks, findings_on_changed_lines, read_diff, write_changed_markdown
+from compact_reports import REPORT_SUFFIXES, find_report, is_raw_mythril_report
+from correlation import Correlation, correlate_categories
+from findings import Finding
+from report_renderer import REPORT_FORMATS, ReportContext, ReportSink, parse_formats, render_report, report_sinks
+from pr_digest import add_digest_arguments, digest_sinks_from_args
+from security_summary import SecuritySummarySink, calculate_security_score
+from severity_policy import add_policy_arguments, policy_from_args
+from source_snippets import SnippetIndex, add_snippet_arguments, snippets_from_args
+from triage import TriageStore, add_triage_arguments, triage_from_args
+from stage_profiler import NULL_PROFILER, PROFILE_FILE, StageProfiler, add_profile_arguments, profiler_from_args
+
+GATE_FILE = 'security-gate.json'
+MYTHRIL_LOAD_ERRORS = 'mythril-load-errors.json'
+
+def slither_data_from_categories(categories: Optional[Dict[str, List[Finding]]]) -> Dict[str, Any]:
+    """Slither input for calculate_security_score, built from in-memory findings"""
+    if categories is None:
+        return {'has_summary': False, 'critical_issues': 0, 'total_issues': 0, 'summary_content': ''}
+    return {
+        'has_summary': True,
+        'critical_issues': len(categories['critical']),
+        'total_issues': sum(len(findings) for findings in categories.values()),
+        'summary_content': ''
+    }
+
+def mythril_data_from_categories(categories: Optional[Dict[str, List[Finding]]]) -> Dict[str, Any]:
+    """Mythril input for calculate_security_score, built from in-memory findings"""
+    if categories is None:
+        return {'has_results': False, 'high_severity': 0, 'medium_severity': 0,
+                'low_severity': 0, 'total_issues': 0, 'summary_content': ''}
+    return {
+        'has_results': True,
+        'high_severity': len(categories['High']),
+        'medium_severity': len(categories['Medium']),
+        'low_severity': len(categories['Low']),
+        'total_issues': sum(len(findings) for findings in categories.values()),
+        'summary_content': ''
+    }
+
+def score_inputs(slither_categories: Optional[Dict[str, List[Finding]]],
+                 mythril_categories: Optional[Dict[str, List[Finding]]],
+                 slither_processed: Optional[Dict[str, Any]] = None,
+                 mythril_processed: Optional[Dict[str, Any]] = None
+                 ) -> Tuple[Dict[str, Any], Dict[str, Any], Correlation]:
+    """calculate_security_score inputs with each correlated issue cluster counted once
+
+    A tool without categories falls back to its `*_processed` data, loaded
+    from the summaries it rendered (see load_slither_data).
+    """
+    correlation = correlate_categories(slither_categories, mythril_categories)
+    if slither_categories is None and slither_processed is not None:
+        slither_data = dict(slither_processed)
+    else:
+        slither_data = slither_data_from_categories(slither_categories)
+    if mythril_categories is None and mythril_processed is not None:
+        mythril_data = dict(mythril_processed)
+    else:
+        mythril_data = mythril_data_from_categories(mythril_categories)
+    correlation.apply(slither_data, mythril_data)
+    return slither_data, mythril_data, correlation
+
+def find_raw_reports(slither_dir: str, mythril_dir: str) -> Tuple[Optional[str], Optional[str]]:
+    """Raw tool reports in the artifact directories, if they were uploaded"""
+    slither_report = find_report(os.path.join(slither_dir, 'slither-report.json'))
+    mythril_reports = [path for suffix in REPORT_SUFFIXES
+                       for path in glob.glob(os.path.join(mythril_dir, f"mythril-*{suffix}"))
+                       if is_raw_mythril_report(os.path.basename(path))]
+    return slither_report, mythril_dir if mythril_reports else None
+
+def _flatten(categories: Dict[str, List[Finding]]) -> List[Finding]:
+    return [finding for findings in categories.values() for finding in findings]
+
+def _changed_findings(categories: Dict[str, List[Finding]], changed: Optional[Hunks],
+                      profiler: StageProfiler, stage: str) -> Optional[List[Finding]]:
+    if changed is None:
+        return None
+    with profiler.stage(stage):
+        return findings_on_changed_lines(_flatten(categories), changed)
+
+def _apply_triage(categories: Dict[str, List[Finding]], triage: Optional[TriageStore], lowest: str,
+                  profiler: StageProfiler, stage: str) -> Optional[Dict[str, int]]:
+    if triage is None:
+        return None
+    with profiler.stage(stage):
+        return triage.apply(categories, lowest)
+
+def _baseline(findings: Iterable[Finding], triage: Optional[TriageStore]) -> Iterable[Finding]:
+    """Suppressed findings are out of the baseline too, so they never show as resolved"""
+    return triage.filter(findings) if triage is not None else findings
+
+def _only_changed(gating: List[Finding], changed_findings: Optional[List[Finding]]) -> List[Finding]:
+    """Restrict the gate to findings touching changed lines, when a diff was given"""
+    if changed_findings is None:
+        return gating
+    touched = {id(finding) for finding in changed_findings}
+    return [finding for finding in gating if id(finding) in touched]
+
+def run_slither_stage(report_path: str, output_dir: str, baseline_path: Optional[str] = None,
+                      cache: Optional[Tuple[AnalysisCache, Dict[str, str]]] = None,
+                      profiler: StageProfiler = NULL_PROFILER,
+                      changed: Optional[Hunks] = None,
+                      triage: Optional[TriageStore] = None,
+                      merged_report: Optional[str] = None) -> Dict[str, Any]:
+    """Categorize a Slither report once and decide what gates the build
+
+    The summary and critical-issues.json are returned as sinks for the
+    pipeline's single render pass; baseline diff mode writes its diff summary
+    and gated issues here instead. With `changed` hunks, only findings
+    touching those lines gate the build. A `triage` store suppresses or
+    downgrades findings before anything else sees them. With a cache,
+    `merged_report` receives the cached and fresh findings as one report.
+    A report marked unsuccessful (e.g. contracts run-slither.py could not
+    analyze) is processed as far as it goes and flagged `incomplete`.
+    """
+    cache_store, keys = cache if cache else (None, None)
+    header: Dict[str, Any] = {}
+    # Parsing and categorizing are interleaved by the streaming reader
+    with profiler.stage('slither.load_categorize'):
+        categories = slither_processor.stream_slither_report(report_path, cache_store, keys,
+                                                             merged_path=merged_report, header=header)
+    incomplete = (header.get('error') or 'unknown error') if header.get('success') is False else None
+    triaged = _apply_triage(categories, triage, slither_processor.SEVERITIES[-1], profiler, 'slither.triage')
+    changed_findings = _changed_findings(categories, changed, profiler, 'slither.changed_lines')
+
+    diff = None
+    sinks: List[ReportSink] = []
+    if baseline_path:
+        with profiler.stage('slither.diff'):
+            diff = diff_findings(_flatten(categories),
+                                 _baseline(slither_processor.load_baseline_findings(baseline_path), triage))
+            gating = _only_changed(gated_findings(diff, slither_processor.DIFF_GATE_SEVERITIES),
+                                   changed_findings)
+        with profiler.stage('slither.render'):
+            write_diff_markdown(diff, slither_processor.SEVERITIES, slither_processor.DIFF_GATE_SEVERITIES,
+                                "🐍 Slither Security Analysis Summary",
+                                os.path.join(output_dir, 'slither-summary.md'))
+        with profiler.stage('slither.write'):
+            write_diff_json(diff, slither_processor.DIFF_GATE_SEVERITIES,
+                            os.path.join(output_dir, 'slither-diff.json'))
+            slither_processor.save_gated_issues(gating, output_dir)
+    else:
+        gating = _only_changed(categories['critical'], changed_findings)
+        sinks = slither_processor.report_sinks(output_dir)
+
+    return {'categories': categories, 'diff': diff, 'gating': gating, 'cache': cache_store,
+            'changed': changed_findings, 'triage': triaged, 'sinks': sinks, 'output_dir': output_dir,
+            'incomplete': incomplete}
+
+def run_mythril_stage(reports_dir: str, output_dir: str,
+                      baseline_path: Optional[str] = None,
+                      profiler: StageProfiler = NULL_PROFILER,
+                      changed: Optional[Hunks] = None,
+                      triage: Optional[TriageStore] = None,
+                      categories: Optional[Dict[str, List[Finding]]] = None,
+                      load_errors: Optional[LoadErrors] = None) -> Dict[str, Any]:
+    """Categorize Mythril reports once; the JSON and markdown summaries are returned as sinks
+
+    Reports are read concurrently and categorized as they arrive; unreadable
+    ones are listed in mythril-load-errors.json instead of failing the stage.
+    The file is written on every run, so a clean run replaces an earlier list.
+    `categories` already built from the reports (run-mythril.py categorizes
+    each report as its analysis finishes) skip the load; `load_errors` are
+    the reports that could not be read while building them.
+    """
+    if categories is None:
+        loader = BulkLoader()
+        with profiler.stage('mythril.load_categorize'):
+            categories = mythril_processor.categorize_mythril_reports(reports_dir, loader)
+        load_errors = loader.errors
+    elif load_errors is None:
+        load_errors = LoadErrors()
+    load_errors.write(os.path.join(output_dir, MYTHRIL_LOAD_ERRORS))
+    triaged = _apply_triage(categories, triage, mythril_processor.SEVERITIES[-1], profiler, 'mythril.triage')
+    changed_findings = _changed_findings(categories, changed, profiler, 'mythril.changed_lines')
+
+    # Mythril often has false positives, so only baseline diff mode gates on it
+    diff = None
+    gating: List[Finding] = []
+    if baseline_path:
+        with profiler.stage('mythril.diff'):
+            diff = diff_findings(_flatten(categories),
+                                 _baseline(mythril_processor.load_baseline_findings(baseline_path), triage))
+            gating = _only_changed(gated_findings(diff, mythril_processor.DIFF_GATE_SEVERITIES),
+                                   changed_findings)
+        with profiler.stage('mythril.render'):
+            write_diff_markdown(diff, mythril_processor.SEVERITIES, mythril_processor.DIFF_GATE_SEVERITIES,
+                                "🔮 Mythril Symbolic Analysis Summary",
+                                os.path.join(output_dir, 'mythril-summary.md'))
+        with profiler.stage('mythril.write'):
+            write_diff_json(diff, mythril_processor.DIFF_GATE_SEVERITIES,
+                            os.path.join(output_dir, 'mythril-diff.json'))
+
+    return {'categories': categories, 'diff': diff, 'gating': gating, 'changed': changed_findings,
+            'triage': triaged, 'sinks': mythril_processor.report_sinks(output_dir, markdown=diff is None),
+            'load_errors': load_errors, 'output_dir': output_dir}
+
+def build_verdict(slither: Optional[Dict[str, Any]], mythril: Optional[Dict[str, Any]],
+                  security_score: Dict[str, Any], correlation: Optional[Correlation] = None,
+                  slither_processed: Optional[Dict[str, Any]] = None,
+                  mythril_processed: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Machine-readable gate decision replacing the workflow's jq checks
+
+    Tools without a stage are judged on their `*_processed` summary data.
+    """
+    verdict: Dict[str, Any] = {
+        'score': security_score['score'],
+        'status': security_score['status'],
+        'issues': security_score['issues'],
+        'failures': []
+    }
+    if slither is not None:
+        counts = {severity: len(findings) for severity, findings in slither['categories'].items()}
+        counts['total'] = sum(counts.values())
+        verdict['slither'] = counts
+        if slither['changed'] is not None:
+            verdict['slither']['on_changed_lines'] = len(slither['changed'])
+        if slither['triage'] is not None:
+            verdict['slither']['triaged'] = slither['triage']
+        if slither['gating']:
+            label = 'new critical/high' if slither['diff'] is not None else 'critical'
+            scope = ' on changed lines' if slither['changed'] is not None else ''
+            verdict['failures'].append(f"{len(slither['gating'])} {label} Slither issues{scope}")
+        if slither.get('incomplete'):
+            verdict['slither']['incomplete'] = slither['incomplete']
+            verdict['failures'].append("Slither analysis incomplete (see the report's error)")
+    elif slither_processed is not None and slither_processed['has_summary']:
+        verdict['slither'] = {'critical': slither_processed['critical_issues'], 'processed': True}
+        if slither_processed['critical_issues']:
+            verdict['failures'].append(f"{slither_processed['critical_issues']} critical Slither issues")
+    if mythril is not None:
+        counts = {severity: len(findings) for severity, findings in mythril['categories'].items()}
+        counts['total'] = sum(counts.values())
+        verdict['mythril'] = counts
+        if mythril['changed'] is not None:
+            verdict['mythril']['on_changed_lines'] = len(mythril['changed'])
+        if mythril['triage'] is not None:
+            verdict['mythril']['triaged'] = mythril['triage']
+        if mythril.get('load_errors'):
+            verdict['mythril']['load_errors'] = mythril['load_errors'].to_dict()
+        if mythril['gating']:
+            scope = ' on changed lines' if mythril['changed'] is not None else ''
+            verdict['failures'].append(f"{len(mythril['gating'])} new high-severity Mythril issues{scope}")
+    elif mythril_processed is not None and mythril_processed['has_results']:
+        verdict['mythril'] = {'High': mythril_processed['high_severity'],
+                              'Medium': mythril_processed['medium_severity'],
+                              'Low': mythril_processed['low_severity'],
+                              'total': mythril_processed['total_issues'], 'processed': True}
+    if correlation is not None and correlation.merged:
+        verdict['correlation'] = correlation.summary()
+    verdict['passed'] = not verdict['failures']
+    verdict['exit_code'] = 0 if verdict['passed'] else 1
+    return verdict
+
+def run_pipeline(slither_report: Optional[str] = None, mythril_dir: Optional[str] = None,
+                 output_dir: Optional[str] = None, summary_path: Optional[str] = None,
+                 gate_path: Optional[str] = None, slither_baseline: Optional[str] = None,
+                 mythril_baseline: Optional[str] = None,
+                 slither_cache: Optional[Tuple[AnalysisCache, Dict[str, str]]] = None,
+                 profiler: StageProfiler = NULL_PROFILER,
+                 changed_lines: Optional[Hunks] = None,
+                 report_formats: Iterable[str] = REPORT_FORMATS,
+                 triage: Optional[TriageStore] = None,
+                 snippets: Optional[SnippetIndex] = None,
+                 extra_sinks: Iterable[ReportSink] = (),
+                 mythril_categories: Optional[Dict[str, List[Finding]]] = None,
+                 slither_merged_report: Optional[str] = None,
+                 slither_processed: Optional[Dict[str, Any]] = None,
+                 mythril_processed: Optional[Dict[str, Any]] = None,
+                 mythril_load_errors: Optional[LoadErrors] = None) -> Dict[str, Any]:
+    """Run every stage in-process and return the findings, score and gate verdict
+
+    Per-tool outputs are written next to their inputs unless `output_dir` is
+    given; the combined summary and gate file are only written when a path is
+    given for them, and `report_formats` (JSON, SARIF, HTML) go next to the
+    summary. An enabled `profiler` writes its timings next to the
+    summary, or next to the per-tool outputs when there is no summary.
+    `changed_lines` (from a unified diff) limits gating to findings on those lines.
+    Findings in the `triage` store are suppressed or downgraded before scoring.
+    With `snippets`, the flagged source lines are embedded in the rendered reports.
+    `extra_sinks` (e.g. the PR comment digest) join the same rendering pass.
+    `mythril_categories` are findings already categorized from `mythril_dir`,
+    with `mythril_load_errors` the reports that could not be read for them.
+    `slither_merged_report` receives the full Slither report rebuilt from the cache.
+    A tool without raw input is scored and gated on its `*_processed` summary
+    data (see load_slither_data / load_mythril_data) when that is given.
+    """
+    slither = mythril = None
+    slither_output = mythril_output = None
+    if slither_report:
+        slither_output = output_dir or os.path.dirname(slither_report)
+        slither = run_slither_stage(slither_report, slither_output, slither_baseline, slither_cache, profiler,
+                                    changed_lines, triage, slither_merged_report)
+    if mythril_dir:
+        mythril_output = output_dir or mythril_dir
+        mythril = run_mythril_stage(mythril_dir, mythril_output, mythril_baseline, profiler, changed_lines,
+                                    triage, mythril_categories, mythril_load_errors)
+
+    with profiler.stage('correlate'):
+        slither_data, mythril_data, correlation = score_inputs(slither['categories'] if slither else None,
+                                                               mythril['categories'] if mythril else None,
+                                                               slither_processed, mythril_processed)
+    with profiler.stage('score'):
+        security_score = calculate_security_score(slither_data, mythril_data)
+
+    # Every output is rendered in one traversal of the findings
+    tools = []
+    sinks: List[ReportSink] = []
+    if slither:
+        tools.append(slither_processor.tool_results(slither['categories']))
+        sinks.extend(slither['sinks'])
+    if mythril:
+        tools.append(mythril_processor.tool_results(mythril['categories']))
+        sinks.extend(mythril['sinks'])
+    if summary_path:
+        sinks.append(SecuritySummarySink(summary_path))
+        sinks.extend(report_sinks(os.path.dirname(summary_path), report_formats))
+    sinks.extend(extra_sinks)
+    with profiler.stage('render'):
+        render_report(ReportContext(tools, security_score, slither_data, mythril_data, snippets=snippets,
+                                    correlation=correlation), sinks)
+
+    for stage, module, name in ((slither, slither_processor, 'slither-summary.md'),
+                                (mythril, mythril_processor, 'mythril-summary.md')):
+        if stage is not None and stage['changed'] is not None:
+            with profiler.stage('changed_lines.render'):
+                write_changed_markdown(stage['changed'], module.SEVERITIES,
+                                       os.path.join(stage['output_dir'], name))
+
+    verdict = build_verdict(slither, mythril, security_score, correlation, slither_processed, mythril_processed)
+    if triage is not None:
+        verdict['triage'] = {'active': len(triage), 'expired': len(triage.expired)}
+    if gate_path:
+        with profiler.stage('gate.write'):
+            with open(gate_path, 'w') as f:
+                json.dump(verdict, f, indent=2)
+
+    if profiler.enabled:
+        profile_dir = os.path.dirname(summary_path) if summary_path else (mythril_output or slither_output)
+        profiler.write(os.path.join(profile_dir or '.', PROFILE_FILE))
+
+    return {
+        'slither': slither,
+        'mythril': mythril,
+        'slither_data': slither_data,
+        'mythril_data': mythril_data,
+        'security_score': security_score,
+        'correlation': correlation,
+        'verdict': verdict
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the PayRox Go Beyond security pipeline in one pass')
+    parser.add_argument('--slither-report', help='Slither JSON report')
+    parser.add_argument('--mythril-dir', help='Directory containing mythril-*.json reports')
+    parser.add_argument('--output-dir', help='Directory for per-tool outputs (default: next to inputs)')
+    parser.add_argument('--summary', help='Output path for the combined security summary')
+    parser.add_argument('--gate', help=f"Output path for the gate verdict (default: {GATE_FILE} next to the summary)")
+    parser.add_argument('--slither-baseline', help='Baseline Slither report for diff mode')
+    parser.add_argument('--mythril-baseline', help='Baseline Mythril directory or mythril-summary.json for diff mode')
+    parser.add_argument('--cache-dir', help='Reuse cached Slither findings for unchanged contracts')
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help='Analysis cache size bound')
+    parser.add_argument('--contracts-root', default='contracts', help='Contracts covered by the cache')
+    parser.add_argument('--slither-version', help='Slither version for cache keys (default: ask slither)')
+    parser.add_argument('--changed-lines', help="Unified diff ('-' for stdin); gate only on findings it touches")
+    parser.add_argument('--formats', type=parse_formats, default=list(REPORT_FORMATS),
+                        help=f"Reports written next to --summary (default: {','.join(REPORT_FORMATS)})")
+    add_policy_arguments(parser)
+    add_snippet_arguments(parser)
+    add_digest_arguments(parser)
+    add_triage_arguments(parser)
+    add_profile_arguments(parser)
+
+    args = parser.parse_args()
+    policy_from_args(args)
+
+    if not args.slither_report and not args.mythril_dir:
+        parser.error('at least one of --slither-report or --mythril-dir is required')
+    for path in filter(None, [args.slither_report, args.mythril_dir, args.slither_baseline, args.mythril_baseline,
+                              args.changed_lines if args.changed_lines != '-' else None]):
+        if not os.path.exists(path):
+            print(f"Error: {path} not found")
+            sys.exit(1)
+
+    gate_path = args.gate
+    if gate_path is None and args.summary:
+        gate_path = os.path.join(os.path.dirname(args.summary), GATE_FILE)
+
+    slither_cache = None
+    if args.cache_dir and args.slither_report:
+        slither_cache = slither_processor.open_slither_cache(
+            args.cache_dir, args.cache_max_mb * 1024 * 1024, args.contracts_root,
+            slither_version=args.slither_version)
+
+    changed_lines = read_diff(args.changed_lines) if args.changed_lines else None
+    result = run_pipeline(args.slither_report, args.mythril_dir, args.output_dir, args.summary,
+                          gate_path, args.slither_baseline, args.mythril_baseline, slither_cache,
+                          profiler_from_args(args), changed_lines, args.formats, triage_from_args(args),
+                          snippets_from_args(args), digest_sinks_from_args(args))
+
+    verdict = result['verdict']
+    print(f"Security Analysis Complete!")
+    print(f"Overall Security Score: {verdict['score']}/100 ({verdict['status']})")
+    for failure in verdict['failures']:
+        print(f"❌ {failure}")
+    load_errors = verdict.get('mythril', {}).get('load_errors')
+    if load_errors:
+        print(f"⚠️ {load_errors['failed']} Mythril reports could not be loaded (see {MYTHRIL_LOAD_ERRORS})")
+    if verdict['passed']:
+        print("✅ Security gate passed")
+    sys.exit(verdict['exit_code'])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Security Summary Generator for PayRox Go Beyond
+Combines Slither and Mythril results into comprehensive security report
+"""
+
+import os
+from typing import Dict, Any, Optional
+
+from baseline_diff import normalize_path
+from compact_reports import find_report, load_report
+from correlation import Correlation, function_name
+from findings import Finding, count_by_severity
+from report_renderer import ReportContext, ReportSink, render_report
+from triage import TriageStore
+
+def load_json_file(file_path: str) -> Optional[Dict[str, Any]]:
+    """Safely load JSON file (plain or gzip/xz compressed)"""
+    try:
+        return load_report(file_path)
+    except Exception as e:
+        print(f"Warning: Could not load {file_path}: {e}")
+        return None
+
+def load_slither_data(slither_dir: str, triage: Optional[TriageStore] = None) -> Dict[str, Any]:
+    """Load Slither analysis data, leaving out critical issues triaged since they were written"""
+    summary_path = os.path.join(slither_dir, 'slither-summary.md')
+    critical_path = find_report(os.path.join(slither_dir, 'critical-issues.json'))
+    
+    data = {
+        'has_summary': os.path.exists(summary_path),
+        'critical_issues': 0,
+        'total_issues': 0,
+        'summary_content': ''
+    }
+    
+    if data['has_summary']:
+        try:
+            with open(summary_path, 'r') as f:
+                data['summary_content'] = f.read()
+        except Exception:
+            pass
+    
+    if critical_path:
+        critical_data = load_json_file(critical_path)
+        if critical_data:
+            data['critical_issues'] = len(critical_data)
+            if triage is not None:
+                data['critical_issues'] = sum(
+                    1 for detector in critical_data
+                    if triage.resolve(Finding.from_slither(detector, 'critical'), 'informational') == 'critical')
+    
+    return data
+
+def load_mythril_data(mythril_dir: str, triage: Optional[TriageStore] = None) -> Dict[str, Any]:
+    """Load Mythril analysis data, suppressing or downgrading triaged issues"""
+    summary_path = find_report(os.path.join(mythril_dir, 'mythril-summary.json'))
+    markdown_path = os.path.join(mythril_dir, 'mythril-summary.md')
+    
+    data = {
+        'has_results': summary_path is not None,
+        'high_severity': 0,
+        'medium_severity': 0,
+        'low_severity': 0,
+        'total_issues': 0,
+        'summary_content': ''
+    }
+    
+    if data['has_results']:
+        mythril_data = load_json_file(summary_path)
+        if mythril_data:
+            findings = [Finding.from_mythril_summary(entry) for entry in mythril_data]
+            if triage is not None:
+                findings = list(triage.filter(findings))
+                for finding in findings:
+                    finding.severity = triage.resolve(finding, 'Low')
+            counts = count_by_severity(findings)
+            data['high_severity'] = counts.pop('High', 0)
+            data['medium_severity'] = counts.pop('Medium', 0)
+            data['low_severity'] = sum(counts.values())
+            data['total_issues'] = len(findings)
+    
+    if os.path.exists(markdown_path):
+        try:
+            with open(markdown_path, 'r') as f:
+                data['summary_content'] = f.read()
+        except Exception:
+            pass
+    
+    return data
+
+def calculate_security_score(slither_data: Dict[str, Any], mythril_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Calculate overall security score and status"""
+    score = 100
+    status = "EXCELLENT"
+    issues = []
+    
+    # Deduct points for Slither issues
+    if slither_data['critical_issues'] > 0:
+        score -= slither_data['critical_issues'] * 25
+        issues.append(f"{slither_data['critical_issues']} critical Slither issues")
+    
+    # Deduct points for Mythril high-severity issues
+    if mythril_data['high_severity'] > 0:
+        score -= mythril_data['high_severity'] * 15
+        issues.append(f"{mythril_data['high_severity']} high-severity Mythril issues")
+    
+    # Deduct points for medium-severity issues
+    medium_total = mythril_data['medium_severity']
+    if medium_total > 0:
+        score -= medium_total * 5
+        issues.append(f"{medium_total} medium-severity issues")
+    
+    # Determine status
+    if score >= 95:
+        status = "EXCELLENT"
+        color = "green"
+    elif score >= 85:
+        status = "GOOD"
+        color = "yellowgreen"
+    elif score >= 70:
+        status = "FAIR"
+        color = "orange"
+    else:
+        status = "NEEDS_ATTENTION"
+        color = "red"
+    
+    return {
+        'score': max(0, score),
+        'status': status,
+        'color': color,
+        'issues': issues
+    }
+
+# Correlated issues listed in security-summary.md before the rest are counted
+CORRELATED_LISTED = 10
+
+class SecuritySummarySink(ReportSink):
+    """security-summary.md, rendered from the scores alone"""
+
+    tools = ()
+
+    def begin(self, report: ReportContext) -> None:
+        slither_data = report.slither_data
+        mythril_data = report.mythril_data
+        security_score = report.security_score
+        timestamp = report.timestamp
+        
+        self.write("# 🛡️ PayRox Go Beyond Security Analysis Report\n\n")
+        self.write(f"**Generated**: {timestamp}\n")
+        self.write(f"**Security Score**: {security_score['score']}/100\n")
+        self.write(f"**Status**: {security_score['status']}\n\n")
+        
+        # Executive Summary
+        self.write("## 📋 Executive Summary\n\n")
+        if security_score['score'] >= 95:
+            self.write("✅ **EXCELLENT SECURITY POSTURE** - The PayRox Go Beyond contracts demonstrate exceptional security standards with minimal to no security issues detected.\n\n")
+        elif security_score['score'] >= 85:
+            self.write("🟢 **GOOD SECURITY POSTURE** - The contracts show good security practices with only minor issues that should be addressed.\n\n")
+        elif security_score['score'] >= 70:
+            self.write("🟡 **FAIR SECURITY POSTURE** - Some security issues detected that require attention before production deployment.\n\n")
+        else:
+            self.write("🔴 **SECURITY ATTENTION REQUIRED** - Critical security issues detected that must be addressed immediately.\n\n")
+        
+        # Detailed Analysis
+        self.write("## 🔍 Detailed Analysis\n\n")
+        
+        # Slither Results
+        self.write("### 🐍 Slither Static Analysis\n\n")
+        if slither_data['has_summary']:
+            if slither_data['critical_issues'] == 0:
+                self.write("✅ **No critical issues found**\n\n")
+            else:
+                self.write(f"🚨 **{slither_data['critical_issues']} critical issues require immediate attention**"
+                           f"{_correlated_note(slither_data, 'critical_issues')}\n\n")
+        else:
+            self.write("⚠️ Slither analysis not available\n\n")
+        
+        # Mythril Results
+        self.write("### 🔮 Mythril Symbolic Execution\n\n")
+        if mythril_data['has_results']:
+            if mythril_data['total_issues'] == 0:
+                self.write("✅ **No vulnerabilities detected**\n\n")
+            else:
+                self.write(f"📊 **Analysis Results**:\n")
+                self.write(f"- High Severity: {mythril_data['high_severity']}"
+                           f"{_correlated_note(mythril_data, 'high_severity')}\n")
+                self.write(f"- Medium Severity: {mythril_data['medium_severity']}"
+                           f"{_correlated_note(mythril_data, 'medium_severity')}\n")
+                self.write(f"- Low Severity: {mythril_data['low_severity']}\n\n")
+        else:
+            self.write("⚠️ Mythril analysis not available\n\n")
+        
+        correlation = report.correlation
+        if correlation is not None and correlation.merged:
+            self._write_correlation(correlation)
+        
+        # Recommendations
+        self.write("## 🔧 Recommendations\n\n")
+        if security_score['issues']:
+            self.write("**Immediate Actions Required**:\n")
+            for i, issue in enumerate(security_score['issues'], 1):
+                self.write(f"{i}. Address {issue}\n")
+            self.write("\n")
+        else:
+            self.write("✅ No immediate security actions required\n\n")
+        
+        self.write("**General Security Best Practices**:\n")
+        self.write("1. Regular security audits before major releases\n")
+        self.write("2. Multi-signature wallet for administrative functions\n")
+        self.write("3. Time-locked upgrades for critical changes\n")
+        self.write("4. Comprehensive testing on testnets\n")
+        self.write("5. Bug bounty program for ongoing security validation\n\n")
+        
+        # Architecture Security Features
+        self.write("## 🏗️ PayRox Architecture Security Features\n\n")
+        self.write("**Manifest-Router Architecture Benefits**:\n")
+        self.write("- ✅ **Storage Isolation**: Each facet uses unique namespaced storage\n")
+        self.write("- ✅ **EXTCODEHASH Verification**: Cryptographic validation before delegatecalls\n")
+        self.write("- ✅ **Emergency Controls**: Forbidden selectors for immediate threat response\n")
+        self.write("- ✅ **Deterministic Deployment**: CREATE2 for predictable and verifiable addresses\n")
+        self.write("- ✅ **Role-Based Access Control**: Granular permissions for security operations\n")
+        self.write("- ✅ **Pausable Operations**: Circuit breakers for emergency situations\n\n")
+        
+        # Appendix
+        self.write("## 📎 Appendix\n\n")
+        self.write("**Analysis Tools Used**:\n")
+        self.write("- **Slither**: Static analysis for common vulnerability patterns\n")
+        self.write("- **Mythril**: Symbolic execution for complex vulnerability detection\n")
+        self.write("- **Manual Review**: Architecture and business logic validation\n\n")
+        
+        self.write("*For detailed technical findings, refer to the complete analysis reports in the security artifacts.*\n")
+
+    def _write_correlation(self, correlation: Correlation) -> None:
+        summary = correlation.summary()
+        self.write("### 🔗 Correlated Findings\n\n")
+        self.write(f"{summary['findings']} findings describe {summary['clusters']} distinct issues "
+                   f"({summary['cross_tool']} reported by both tools); the score counts each issue once.\n\n")
+        clusters = correlation.multi()
+        for cluster in clusters[:CORRELATED_LISTED]:
+            where = f"`{os.path.basename(normalize_path(cluster.lead.filename))}`"
+            function = function_name(cluster.lead)
+            if function:
+                where = f"`{function}` in {where}"
+            members = ', '.join(f"{finding.tool} {finding.check} ({finding.severity})" for finding in cluster.findings)
+            self.write(f"- **{cluster.issue}** {where}: {members}\n")
+        if len(clusters) > CORRELATED_LISTED:
+            self.write(f"- *(and {len(clusters) - CORRELATED_LISTED} more)*\n")
+        self.write("\n")
+
+def _correlated_note(data: Dict[str, Any], field: str) -> str:
+    folded = data.get('correlated', {}).get(field, 0)
+    return f" (+{folded} correlated with other findings)" if folded else ''
+
+def generate_security_summary(slither_data: Dict[str, Any], mythril_data: Dict[str, Any], output_path: str) -> None:
+    """Generate comprehensive security summary"""
+    security_score = calculate_security_score(slither_data, mythril_data)
+    report = ReportContext(security_score=security_score, slither_data=slither_data, mythril_data=mythril_data)
+    render_report(report, [SecuritySummarySink(output_path)])
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Severity Policy for PayRox Go Beyond
+Declarative per-tool, per-check, per-SWC and per-path severity rules compiled to a dispatch table
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import re
+import sys
+from collections import Counter
+from typing import Dict, Any, Optional, Pattern, Tuple
+
+from baseline_diff import normalize_path
+
+DEFAULT_POLICY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'severity-policy.json')
+
+# The buckets each tool's findings are sorted into. calculate_security_score
+# deducts for Slither `critical` and Mythril `High`/`Medium`, so a policy may
+# only target these names: anything else would silently escape the score.
+TOOL_SEVERITIES = {
+    'slither': ['critical', 'high', 'medium', 'low', 'informational'],
+    'mythril': ['High', 'Medium', 'Low']
+}
+
+# Matrix cells matching any impact or confidence
+WILDCARD = '*'
+
+class PolicyError(ValueError):
+    pass
+
+def swc_number(swc: Any) -> str:
+    """'SWC-116', 'swc-116' and 116 all name Mythril's swc-id '116'"""
+    swc = str(swc).strip()
+    return swc[4:] if swc.upper().startswith('SWC-') else swc
+
+# Fields a path rule may set; `path` and `severity` are required
+PATH_RULE_FIELDS = ('path', 'tool', 'check', 'severity')
+
+def _section(container: Dict[str, Any], key: str, kind: type, where: str) -> Any:
+    """A policy section of the expected JSON type, empty when absent"""
+    value = container.get(key, kind())
+    if not isinstance(value, kind):
+        raise PolicyError(f"'{where}{key}' must be a JSON {'object' if kind is dict else 'array'}")
+    return value
+
+class PathRule:
+    """Glob over repo-relative paths, optionally limited to one tool and check"""
+
+    __slots__ = ('pattern', 'tool', 'check', 'severity')
+
+    def __init__(self, rule: Dict[str, Any], index: int = 0):
+        name = f"Path rule {index} {json.dumps(rule)}"
+        if not isinstance(rule, dict):
+            raise PolicyError(f"{name}: must be a JSON object")
+        unknown = sorted(set(rule) - set(PATH_RULE_FIELDS))
+        if unknown:
+            raise PolicyError(f"{name}: unknown field {', '.join(map(repr, unknown))} "
+                              f"(expected {', '.join(PATH_RULE_FIELDS)})")
+        for field in ('path', 'severity'):
+            if not isinstance(rule.get(field), str) or not rule[field]:
+                raise PolicyError(f"{name}: {field!r} is required")
+        if rule.get('check') is not None and not isinstance(rule['check'], str):
+            raise PolicyError(f"{name}: 'check' must be a string")
+        if rule.get('tool') not in (None, 'slither', 'mythril'):
+            raise PolicyError(f"{name}: unknown tool {rule['tool']!r}")
+        try:
+            for tool in [rule['tool']] if rule.get('tool') else list(TOOL_SEVERITIES):
+                SeverityPolicy._bucket(tool, rule['severity'])
+        except PolicyError as e:
+            raise PolicyError(f"{name}: {e}") from None
+
+        self.pattern: Pattern = re.compile(fnmatch.translate(rule['path']))
+        self.tool = rule.get('tool')
+        self.check = rule.get('check')
+        self.severity = sys.intern(rule['severity'])
+
+    def matches(self, tool: str, check: str, path: str) -> bool:
+        return ((self.tool is None or self.tool == tool) and (self.check is None or self.check == check)
+                and self.pattern.match(path) is not None)
+
+class SeverityPolicy:
+    """Compiled severity rules
+
+    Precedence, first match wins: path rules in file order, then per-check
+    overrides, then (Mythril) per-SWC overrides, then the tool's base mapping.
+    Every distinct input combination is resolved once and stored in a dispatch
+    dict, so classifying a finding is a single lookup; the table is seeded
+    with every check the policy names and grows only with new combinations,
+    which are bounded by checks x levels (x files when path rules exist).
+    """
+
+    def __init__(self, policy: Dict[str, Any]):
+        if not isinstance(policy, dict):
+            raise PolicyError("the policy must be a JSON object")
+        slither = _section(policy, 'slither', dict, '')
+        mythril = _section(policy, 'mythril', dict, '')
+        for section, where in ((slither, 'slither.'), (mythril, 'mythril.')):
+            for key in ('matrix', 'checks', 'severities', 'swc'):
+                _section(section, key, dict, where)
+
+        self._matrix: Dict[Tuple[str, str], str] = {}
+        for impact, row in slither.get('matrix', {}).items():
+            if not isinstance(row, dict):
+                raise PolicyError(f"'slither.matrix.{impact}' must be a JSON object of confidence: severity")
+            for confidence, severity in row.items():
+                self._matrix[(impact.lower(), confidence.lower())] = self._bucket('slither', severity)
+        self._slither_default = self._bucket('slither', slither.get('default', 'informational'))
+        self._slither_checks = {check: self._bucket('slither', severity)
+                                for check, severity in slither.get('checks', {}).items()}
+
+        self._mythril_levels = {level: self._bucket('mythril', severity)
+                                for level, severity in mythril.get('severities', {}).items()}
+        self._mythril_default = self._bucket('mythril', mythril.get('default', 'Low'))
+        self._mythril_checks = {check: self._bucket('mythril', severity)
+                                for check, severity in mythril.get('checks', {}).items()}
+        self._mythril_swc = {swc_number(swc): self._bucket('mythril', severity)
+                             for swc, severity in mythril.get('swc', {}).items()}
+
+        self._paths = [PathRule(rule, index)
+                       for index, rule in enumerate(_section(policy, 'paths', list, ''), 1)]
+
+        # Dispatch tables; keys carry the path only when path rules exist
+        self._slither_table: Dict[Tuple[str, ...], str] = {}
+        self._mythril_table: Dict[Tuple[str, ...], str] = {}
+        levels = ['High', 'Medium', 'Low', 'Informational', 'Optimization']
+        if not self._paths:
+            for check in self._slither_checks:
+                for impact in levels:
+                    for confidence in levels[:3]:
+                        self.slither_severity(check, impact, confidence)
+            for check in self._mythril_checks:
+                for level in self._mythril_levels:
+                    self.mythril_severity(level, '', check)
+
+    @staticmethod
+    def _bucket(tool: str, severity: str) -> str:
+        if severity not in TOOL_SEVERITIES[tool]:
+            raise PolicyError(f"{tool} severity {severity!r} is not one of {', '.join(TOOL_SEVERITIES[tool])}")
+        return sys.intern(severity)
+
+    def _path_rule(self, tool: str, check: str, filename: str) -> Optional[str]:
+        if not filename:
+            return None
+        path = normalize_path(filename)
+        for rule in self._paths:
+            if rule.matches(tool, check, path):
+                return rule.severity
+        return None
+
+    def _resolve_slither(self, check: str, impact: str, confidence: str, filename: str) -> str:
+        severity = self._path_rule('slither', check, filename) if self._paths else None
+        if severity is not None:
+            return severity
+        if check in self._slither_checks:
+            return self._slither_checks[check]
+        impact, confidence = impact.lower(), confidence.lower()
+        for key in ((impact, confidence), (impact, WILDCARD), (WILDCARD, confidence)):
+            if key in self._matrix:
+                return self._matrix[key]
+        return self._slither_default
+
+    def _resolve_mythril(self, level: str, swc_id: str, check: str, filename: str) -> str:
+        severity = self._path_rule('mythril', check, filename) if self._paths else None
+        if severity is not None:
+            return severity
+        if check in self._mythril_checks:
+            return self._mythril_checks[check]
+        if swc_id in self._mythril_swc:
+            return self._mythril_swc[swc_id]
+        return self._mythril_levels.get(level, self._mythril_default)
+
+    def slither_severity(self, check: str, impact: str, confidence: str, filename: str = '') -> str:
+        key = (check, impact, confidence, filename) if self._paths else (check, impact, confidence)
+        severity = self._slither_table.get(key)
+        if severity is None:
+            severity = self._slither_table[key] = self._resolve_slither(check, impact, confidence, filename)
+        return severity
+
+    def mythril_severity(self, level: str, swc_id: str, check: str, filename: str = '') -> str:
+        key = (level, swc_id, check, filename) if self._paths else (level, swc_id, check)
+        severity = self._mythril_table.get(key)
+        if severity is None:
+            severity = self._mythril_table[key] = self._resolve_mythril(level, swc_id, check, filename)
+        return severity
+
+def load_policy(path: str) -> SeverityPolicy:
+    """Load and compile a policy file; a broken policy is an error, not a fallback"""
+    with open(path, 'r') as f:
+        return SeverityPolicy(json.load(f))
+
+_active: Optional[SeverityPolicy] = None
+
+def active_policy() -> SeverityPolicy:
+    """Policy used by the processors: the one installed by use_policy(), else the default file"""
+    global _active
+    if _active is None:
+        _active = load_policy(DEFAULT_POLICY)
+    return _active
+
+def use_policy(policy: SeverityPolicy) -> None:
+    global _active
+    _active = policy
+
+def use_policy_file(path: Optional[str]) -> None:
+    """Install a policy by path (also usable as a process pool initializer)"""
+    if path:
+        use_policy(load_policy(path))
+
+def add_policy_arguments(parser) -> None:
+    parser.add_argument('--policy', default=DEFAULT_POLICY, help='Severity policy mapping findings to buckets')
+
+def policy_from_args(args) -> SeverityPolicy:
+    try:
+        policy = load_policy(args.policy)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not load severity policy {args.policy}: {e}")
+        sys.exit(1)
+    use_policy(policy)
+    return policy
+
+def main():
+    parser = argparse.ArgumentParser(description='Check a severity policy and show how it classifies a run')
+    parser.add_argument('--slither-report', help='Slither JSON report')
+    parser.add_argument('--mythril-dir', help='Directory containing mythril-*.json reports')
+    add_policy_arguments(parser)
+
+    args = parser.parse_args()
+    policy = policy_from_args(args)
+    print(f"✅ {args.policy} compiled")
+    if not args.slither_report and not args.mythril_dir:
+        return
+
+    # Imported here so the policy itself doesn't depend on the history module
+    from findings_history import load_run_findings
+
+    counts: Counter = Counter()
+    for finding in load_run_findings(args.slither_report, args.mythril_dir, policy):
+        counts[(finding.tool, finding.severity)] += 1
+    for tool, severities in TOOL_SEVERITIES.items():
+        if any(counts[(tool, severity)] for severity in severities):
+            print(f"{tool}: " + ', '.join(f"{severity} {counts[(tool, severity)]}" for severity in severities))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Slither Results Processor for PayRox Go Beyond
+Filters and categorizes security findings for CI/CD pipeline
+"""
+
+import json
+import re
+import os
+from typing import Dict, List, Any, Iterable, Iterator, Optional, TextIO, Tuple
+
+from analysis_cache import (AnalysisCache, PendingEntries, contract_keys, detect_tool_version, discover_contracts,
+                            load_config, project_key)
+from compact_reports import expand_detector, load_report, open_report
+from findings import Finding
+from report_renderer import JsonArraySink, ReportContext, ReportSink, ToolResults, markdown_snippet, render_report
+from severity_policy import TOOL_SEVERITIES, SeverityPolicy, active_policy
+from source_snippets import SnippetIndex
+
+SEVERITIES = TOOL_SEVERITIES['slither']
+
+# New findings at these severities fail the build in baseline diff mode
+DIFF_GATE_SEVERITIES = ['critical', 'high']
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'slither.config.json')
+
+# Read size for streaming ingestion; large detectors grow the buffer as needed
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+def load_slither_report(report_path: str) -> Dict[str, Any]:
+    """Load Slither JSON report (plain, compressed or compact)"""
+    try:
+        return load_report(report_path)
+    except Exception as e:
+        print(f"Error loading Slither report: {e}")
+        return {}
+
+class JsonStreamReader:
+    """Incremental JSON reader that decodes one value at a time from a file"""
+
+    def __init__(self, f: TextIO, chunk_size: int = STREAM_CHUNK_SIZE):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """Append the next chunk to the buffer, discarding consumed input"""
+        if self._eof:
+            return False
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        chunk = self._file.read(max(self._chunk_size, min_size))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be `char`"""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found or 'EOF'}'")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode and consume the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Value spans past the buffer: double the read size and retry
+                if not self._fill(len(self._buf)):
+                    raise
+                continue
+            # A number ending exactly at the buffer edge may be truncated
+            if end == len(self._buf) and isinstance(value, (int, float)) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def object_keys(self) -> Iterator[str]:
+        """Yield the keys of the next object; the caller must consume each value"""
+        if self.peek() != '{':
+            self.value()
+            return
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.peek() == ',':
+                self._pos += 1
+            else:
+                self.expect('}')
+                return
+
+    def array_items(self) -> Iterator[Any]:
+        """Yield the elements of the next array one at a time"""
+        if self.peek() != '[':
+            self.value()
+            return
+        self.expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ',':
+                self._pos += 1
+            else:
+                self.expect(']')
+                return
+
+def iter_slither_detectors(report_path: str,
+                           header: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """Stream `results.detectors` from a Slither report one finding at a time
+
+    Compressed and compact reports are decompressed and expanded on the fly.
+    Other top-level keys (`success`, `error`) are collected into `header`.
+    """
+    compact = None
+    with open_report(report_path) as f:
+        reader = JsonStreamReader(f)
+        for key in reader.object_keys():
+            if key == 'compact':
+                compact = reader.value()
+                continue
+            if key != 'results':
+                value = reader.value()
+                if header is not None:
+                    header[key] = value
+                continue
+            for results_key in reader.object_keys():
+                if results_key != 'detectors':
+                    reader.value()
+                    continue
+                if compact is None:
+                    yield from reader.array_items()
+                else:
+                    root = compact.get('filename_root', '')
+                    for detector in reader.array_items():
+                        yield expand_detector(detector, root)
+
+def classify_detector(detector: Dict[str, Any], policy: Optional[SeverityPolicy] = None) -> str:
+    """Map a detector to a severity category under the severity policy"""
+    elements = detector.get('elements') or []
+    mapping = (elements[0].get('source_mapping') or {}) if elements else {}
+    return (policy or active_policy()).slither_severity(
+        detector.get('check', ''), detector.get('impact', ''), detector.get('confidence', ''),
+        mapping.get('filename_relative', ''))
+
+def classify_finding(finding: Finding, policy: SeverityPolicy) -> str:
+    return policy.slither_severity(finding.check, finding.impact, finding.confidence, finding.filename)
+
+def policy_finding(detector: Dict[str, Any], policy: SeverityPolicy) -> Finding:
+    """Build and classify a finding in one pass over the detector"""
+    finding = Finding.from_slither(detector, '', keep_raw=True)
+    finding.severity = classify_finding(finding, policy)
+    # critical-issues.json carries the complete detector; others keep only
+    # the compact record and let the element payload be freed
+    if finding.severity != 'critical':
+        finding.raw = None
+    return finding
+
+def categorize_findings(results: Dict[str, Any]) -> Dict[str, List[Finding]]:
+    """Categorize findings by severity"""
+    if 'results' not in results:
+        return categorize_detector_stream([])
+    
+    return categorize_detector_stream(results['results']['detectors'])
+
+def categorize_detector_stream(detectors: Iterable[Dict[str, Any]],
+                               policy: Optional[SeverityPolicy] = None) -> Dict[str, List[Finding]]:
+    """Categorize findings into compact records as they are read"""
+    policy = policy or active_policy()
+    categories = {severity: [] for severity in SEVERITIES}
+    
+    for detector in detectors:
+        finding = policy_finding(detector, policy)
+        categories[finding.severity].append(finding)
+    
+    return categories
+
+class SlitherReportWriter:
+    """Streams detectors into a Slither JSON report that replaces `path` on close
+
+    The report is written beside `path` first, so `path` may be the report
+    the detectors are being read from.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._tmp_path = f"{path}.tmp"
+        self._file = open(self._tmp_path, 'w')
+        self._file.write('{"results": {"detectors": [')
+        self._count = 0
+
+    def write(self, detector: Dict[str, Any]) -> None:
+        self._file.write(',\n' if self._count else '\n')
+        json.dump(detector, self._file)
+        self._count += 1
+
+    def close(self, header: Optional[Dict[str, Any]] = None) -> None:
+        """Finish the report with the source report's top-level fields"""
+        self._file.write('\n]}')
+        fields = {'success': True, 'error': None}
+        fields.update({key: value for key, value in (header or {}).items() if key != 'compact'})
+        for key, value in fields.items():
+            self._file.write(f", {json.dumps(key)}: {json.dumps(value)}")
+        self._file.write('}\n')
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def discard(self) -> None:
+        self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
+
+def categorize_with_cache(detectors: Iterable[Dict[str, Any]], cache: AnalysisCache, keys: Dict[str, str],
+                          policy: Optional[SeverityPolicy] = None,
+                          merged: Optional[SlitherReportWriter] = None,
+                          header: Optional[Dict[str, Any]] = None) -> Dict[str, List[Finding]]:
+    """Combine cached findings for unchanged contracts with fresh ones for the rest
+
+    The cache holds complete detectors, re-classified from their impact,
+    confidence, check and file on every run, so editing the severity policy
+    never requires invalidating the cache. Findings in files outside `keys`
+    are always kept; they are cached for the project as a whole and only
+    restored while no contract has changed. Every finding used is also
+    written to `merged`, giving downstream jobs the full report.
+
+    `header` is filled by the detector stream (see iter_slither_detectors)
+    and read once the stream is exhausted. Nothing is cached from a report
+    marked unsuccessful, and when it lists the contracts it `analyzed`
+    (run-slither.py), only those are cached; a report without the list
+    covers the whole project.
+    """
+    policy = policy or active_policy()
+    categories = categorize_detector_stream([])
+
+    def add(detector: Dict[str, Any], finding: Finding) -> None:
+        categories[finding.severity].append(finding)
+        if merged is not None:
+            merged.write(detector)
+
+    # Unchanged contracts: reuse cached findings and ignore any fresh duplicates
+    cached_files = set()
+    for filename, key in keys.items():
+        entries = cache.get(key)
+        if entries is None:
+            continue
+        cached_files.add(filename)
+        for detector in entries:
+            add(detector, policy_finding(detector, policy))
+
+    # Files that cannot be keyed (outside the contracts root, or no location)
+    project = project_key(keys) if keys else None
+    unknown_cached = cache.get(project, count=False) if project is not None else None
+    for detector in unknown_cached or []:
+        add(detector, policy_finding(detector, policy))
+
+    # Changed contracts: take fresh findings and stage them on disk for the next run
+    fresh = {filename for filename in keys if filename not in cached_files}
+    pending = PendingEntries(cache)
+    try:
+        for detector in detectors:
+            finding = policy_finding(detector, policy)
+            if finding.filename in cached_files:
+                continue
+            if finding.filename not in keys:
+                if unknown_cached is not None:
+                    continue
+                if project is not None:
+                    pending.add(project, detector)
+            elif finding.filename in fresh:
+                pending.add(keys[finding.filename], detector)
+            add(detector, finding)
+    except BaseException:
+        pending.discard()
+        raise
+
+    # The report's `success`, `error` and `analyzed` fields follow its detectors
+    header = header or {}
+    stored = []
+    if header.get('success') is not False:
+        analyzed = header.get('analyzed')
+        analyzed = set(keys) if analyzed is None else set(analyzed)
+        stored = [keys[filename] for filename in sorted(fresh & analyzed)]
+        if project is not None and unknown_cached is None and analyzed >= set(keys):
+            stored.append(project)
+    pending.commit(stored)
+    cache.save()
+
+    return categories
+
+def open_slither_cache(cache_dir: str, max_bytes: int, contracts_root: str = 'contracts',
+                       config_path: str = DEFAULT_CONFIG,
+                       slither_version: Optional[str] = None) -> Tuple[AnalysisCache, Dict[str, str]]:
+    """Open the analysis cache and key every contract for the current Slither setup"""
+    if slither_version is None:
+        slither_version = detect_tool_version(['slither', '--version'])
+    keys = contract_keys(discover_contracts(contracts_root), 'slither', slither_version, load_config(config_path))
+    return AnalysisCache(cache_dir, max_bytes), keys
+
+def stream_slither_report(report_path: str, cache: Optional[AnalysisCache] = None,
+                          keys: Optional[Dict[str, str]] = None,
+                          policy: Optional[SeverityPolicy] = None,
+                          merged_path: Optional[str] = None,
+                          header: Optional[Dict[str, Any]] = None) -> Dict[str, List[Finding]]:
+    """Load and categorize a Slither report with bounded memory
+
+    With a cache, `merged_path` receives a report of every finding used,
+    cached and fresh; it may be `report_path` itself. `header` receives the
+    report's top-level fields (`success`, `error`).
+    """
+    merged = None
+    header = {} if header is None else header
+    try:
+        detectors = iter_slither_detectors(report_path, header)
+        if cache is not None:
+            merged = SlitherReportWriter(merged_path) if merged_path else None
+            categories = categorize_with_cache(detectors, cache, keys or {}, policy, merged, header)
+            if merged is not None:
+                merged.close(header)
+            return categories
+        return categorize_detector_stream(detectors, policy)
+    except Exception as e:
+        if merged is not None:
+            merged.discard()
+        print(f"Error loading Slither report: {e}")
+        return categorize_detector_stream([])
+
+# Markdown heading per severity listed in full in slither-summary.md
+_MARKDOWN_HEADINGS = {
+    'critical': "🚨 **Critical Issues**",
+    'high': "⚠️ **High Severity**",
+    'medium': "🔶 **Medium Severity**"
+}
+
+class SlitherMarkdownSink(ReportSink):
+    """slither-summary.md"""
+
+    tools = ('slither',)
+
+    def begin_tool(self, tool: ToolResults) -> None:
+        self._present = set()
+        self._listing = False
+        self._empty = tool.total() == 0
+        self.write("# 🐍 Slither Security Analysis Summary\n\n")
+        
+        if self._empty:
+            self.write("✅ **No security issues found!**\n\n")
+            self.write("The PayRox Go Beyond contracts passed all Slither security checks.\n")
+            return
+        
+        self.write(f"📊 **Total Findings**: {tool.total()}\n\n")
+
+    def begin_group(self, tool: ToolResults, severity: str, findings: List[Finding]) -> None:
+        if not findings:
+            return
+        self._present.add(severity)
+        self._listing = severity in _MARKDOWN_HEADINGS
+        if self._listing:
+            self.write(f"{_MARKDOWN_HEADINGS[severity]}: {len(findings)}\n")
+        elif severity == 'low':
+            self.write(f"🔷 **Low Severity**: {len(findings)}\n")
+            self.write(f"*(Note: {len(findings)} low-severity findings - see full report for details)*\n\n")
+
+    def finding(self, tool: ToolResults, severity: str, finding: Finding) -> None:
+        if self._listing:
+            self.write(f"- **{finding.check}**: {finding.description}\n")
+            snippet = self.snippet(finding)
+            if snippet is not None:
+                self.write(('' if finding.description.endswith('\n') else '\n') + markdown_snippet(snippet))
+
+    def end_group(self, tool: ToolResults, severity: str, findings: List[Finding]) -> None:
+        if findings and self._listing:
+            self.write("\n")
+        self._listing = False
+
+    def end_tool(self, tool: ToolResults) -> None:
+        if self._empty:
+            return
+        
+        # Recommendations
+        self.write("## 🔧 Recommendations\n\n")
+        if 'critical' in self._present:
+            self.write("1. **Immediate Action Required**: Address all critical issues before deployment\n")
+        if 'high' in self._present:
+            self.write("2. **High Priority**: Review and fix high-severity findings\n")
+        if 'medium' in self._present:
+            self.write("3. **Medium Priority**: Consider fixing medium-severity findings\n")
+        
+        self.write("\n📝 *Full detailed report available in security artifacts*\n")
+
+def critical_issues_sink(output_dir: str) -> ReportSink:
+    """critical-issues.json: complete detectors of critical findings for CI/CD failure checks"""
+    return JsonArraySink(os.path.join(output_dir, 'critical-issues.json'), 'slither',
+                         lambda finding: finding.raw if finding.raw is not None else finding.to_dict(),
+                         severities=('critical',))
+
+def report_sinks(output_dir: str) -> List[ReportSink]:
+    """Per-tool outputs rendered from the categorized findings"""
+    return [SlitherMarkdownSink(os.path.join(output_dir, 'slither-summary.md')), critical_issues_sink(output_dir)]
+
+def tool_results(categories: Dict[str, List[Finding]]) -> ToolResults:
+    return ToolResults('slither', SEVERITIES, categories)
+
+def write_slither_outputs(categories: Dict[str, List[Finding]], output_dir: str,
+                          snippets: Optional[SnippetIndex] = None) -> None:
+    """Write the summary and critical-issues.json in one pass over the findings"""
+    render_report(ReportContext([tool_results(categories)], snippets=snippets), report_sinks(output_dir))
+
+def generate_summary_markdown(categories: Dict[str, List[Finding]], output_dir: str) -> None:
+    """Generate markdown summary of findings"""
+    render_report(ReportContext([tool_results(categories)]),
+                  [SlitherMarkdownSink(os.path.join(output_dir, 'slither-summary.md'))])
+
+def save_critical_issues(categories: Dict[str, List[Finding]], output_dir: str) -> None:
+    """Save critical issues to separate JSON for CI/CD failure checks"""
+    render_report(ReportContext([tool_results(categories)]), [critical_issues_sink(output_dir)])
+
+def load_baseline_findings(baseline_path: str, policy: Optional[SeverityPolicy] = None) -> Iterator[Finding]:
+    """Stream findings from a baseline Slither report for diffing"""
+    policy = policy or active_policy()
+    for detector in iter_slither_detectors(baseline_path):
+        yield policy_finding(detector, policy)
+
+# Where save_gated_issues puts new findings of each gating severity;
+# critical-issues.json stays critical-only because readers count every entry
+GATED_ISSUE_FILES = {'critical': 'critical-issues.json', 'high': 'high-issues.json'}
+
+def save_gated_issues(findings: List[Finding], output_dir: str) -> None:
+    """Save new gating findings in baseline diff mode, one file per severity"""
+    for severity, filename in GATED_ISSUE_FILES.items():
+        with open(os.path.join(output_dir, filename), 'w') as f:
+            json.dump([finding.raw if finding.raw is not None else finding.to_dict()
+                       for finding in findings if finding.severity == severity], f, indent=2)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Source Snippet Extraction for PayRox Go Beyond
+Memory-mapped contract sources with a per-file line-offset index for embedding flagged code
+"""
+
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from baseline_diff import normalize_path
+from findings import Finding
+
+# Lines of flagged code embedded per finding before the snippet is cut short
+MAX_SNIPPET_LINES = 12
+
+_NEWLINE = re.compile(b'\n')
+
+class Snippet:
+    """Whole source lines covering one finding's primary location"""
+
+    __slots__ = ('filename', 'start_line', 'end_line', 'text', 'truncated')
+
+    def __init__(self, filename: str, start_line: int, end_line: int, text: str, truncated: bool):
+        self.filename = filename
+        self.start_line = start_line
+        self.end_line = end_line
+        self.text = text
+        self.truncated = truncated
+
+class SourceFile:
+    """A read-only mapping of one source file
+
+    The line-offset index (byte offset of every line start) is built on first
+    use with a single regex scan of the mapping, after which turning a byte
+    offset into a line is a bisect and a line range into text is one slice.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        stat = os.stat(path)
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        self._map: Optional[mmap.mmap] = None
+        if stat.st_size:
+            with open(path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets: Optional[array] = None
+
+    @property
+    def size(self) -> int:
+        return len(self._map) if self._map is not None else 0
+
+    def line_offsets(self) -> array:
+        if self._offsets is None:
+            offsets = array('Q', [0])
+            if self._map is not None:
+                offsets.extend(match.end() for match in _NEWLINE.finditer(self._map))
+            self._offsets = offsets
+        return self._offsets
+
+    def line_count(self) -> int:
+        offsets = self.line_offsets()
+        # A trailing newline doesn't start another line
+        return len(offsets) - 1 if offsets[-1] == self.size else len(offsets)
+
+    def line_at(self, offset: int) -> int:
+        """1-based line containing a byte offset"""
+        return bisect_right(self.line_offsets(), offset)
+
+    def text(self, start_line: int, end_line: int) -> str:
+        """Lines start_line..end_line (1-based, inclusive) without the final newline"""
+        offsets = self.line_offsets()
+        begin = offsets[start_line - 1]
+        end = offsets[end_line] if end_line < len(offsets) else self.size
+        return self._map[begin:end].decode('utf-8', errors='replace').rstrip('\r\n')
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+class SnippetIndex:
+    """Snippets for findings, with each source file mapped and indexed once
+
+    Paths reported by the tools are tried as given and then, repo-relative,
+    under each source root; unreadable files are remembered as missing so a
+    finding pointing at them costs a dict lookup. Slither byte ranges that no
+    longer start on the reported line mean the source has changed since the
+    analysis, and such findings get no snippet. Snippets are memoized per
+    line range, as many findings share the same flagged lines.
+    """
+
+    def __init__(self, roots: Sequence[str] = ('.',), max_lines: int = MAX_SNIPPET_LINES):
+        self.roots = list(roots)
+        self.max_lines = max_lines
+        self._files: Dict[str, Optional[SourceFile]] = {}
+        self._snippets: Dict[Tuple[str, int, int], Optional[Snippet]] = {}
+
+    def _resolve(self, filename: str) -> Optional[str]:
+        candidates = [filename] if os.path.isabs(filename) else []
+        relative = normalize_path(filename)
+        candidates.extend(os.path.join(root, relative) for root in self.roots)
+        for candidate in candidates:
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+
+    def source(self, filename: str) -> Optional[SourceFile]:
+        if filename in self._files:
+            return self._files[filename]
+        source = None
+        path = self._resolve(filename) if filename and filename != 'Unknown' else None
+        if path is not None:
+            try:
+                source = SourceFile(path)
+            except (OSError, ValueError):
+                source = None
+        self._files[filename] = source
+        return source
+
+    def _lines(self, finding: Finding) -> Optional[Tuple[str, int, int]]:
+        """(file, first line, last line) of the finding's primary location"""
+        if finding.offset is not None and finding.filename:
+            source = self.source(finding.filename)
+            if source is None:
+                return None
+            start, length = finding.offset
+            if not 0 <= start < source.size:
+                return None
+            first = source.line_at(start)
+            # A source edited since the analysis would show the wrong code
+            if finding.spans and finding.spans[0][1] != first:
+                return None
+            return finding.filename, first, source.line_at(start + max(length, 1) - 1)
+        if finding.spans:
+            filename, start, end = finding.spans[0]
+            if start and start >= 1:
+                return filename, start, max(start, end)
+        return None
+
+    def snippet(self, finding: Finding) -> Optional[Snippet]:
+        location = self._lines(finding)
+        if location is None:
+            return None
+        if location in self._snippets:
+            return self._snippets[location]
+        filename, start, end = location
+        source = self.source(filename)
+        snippet = None
+        if source is not None and start <= source.line_count():
+            end = min(end, source.line_count())
+            shown = min(end, start + self.max_lines - 1)
+            snippet = Snippet(normalize_path(filename), start, end, source.text(start, shown), shown < end)
+        self._snippets[location] = snippet
+        return snippet
+
+    def refresh(self) -> List[str]:
+        """Forget sources edited since they were mapped; returns their names"""
+        stale = []
+        for filename, source in list(self._files.items()):
+            if source is None:
+                stale.append(filename)
+                continue
+            try:
+                stat = os.stat(source.path)
+                current = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                current = None
+            if current != source.signature:
+                source.close()
+                stale.append(filename)
+        for filename in stale:
+            del self._files[filename]
+        if stale:
+            forget = set(stale)
+            self._snippets = {location: snippet for location, snippet in self._snippets.items()
+                              if location[0] not in forget}
+        return stale
+
+    def close(self) -> None:
+        for source in self._files.values():
+            if source is not None:
+                source.close()
+        self._files.clear()
+        self._snippets.clear()
+
+def add_snippet_arguments(parser) -> None:
+    """--source-root / --no-snippets options shared by the security scripts"""
+    parser.add_argument('--source-root', action='append', default=None,
+                        help='Directory the reported contract paths are relative to (default: .)')
+    parser.add_argument('--no-snippets', action='store_true', help='Do not embed flagged source code in the reports')
+
+def snippets_from_args(args) -> Optional[SnippetIndex]:
+    if args.no_snippets:
+        return None
+    return SnippetIndex(args.source_root or ['.'])
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Stage Profiler for PayRox Go Beyond
+Opt-in wall/CPU/memory timings per pipeline stage with sampled cProfile output
+"""
+
+import contextlib
+import cProfile
+import io
+import json
+import os
+import platform
+import pstats
+import random
+import resource
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional
+
+PROFILE_FILE = 'security-profile.json'
+
+# PAYROX_SECURITY_PROFILE=1 turns timings on without touching the command line;
+# PAYROX_SECURITY_CPROFILE=<rate> additionally cProfiles that fraction of stages
+PROFILE_ENV = 'PAYROX_SECURITY_PROFILE'
+CPROFILE_ENV = 'PAYROX_SECURITY_CPROFILE'
+
+CPROFILE_TOP = 25
+
+# Shared no-op context returned by a disabled profiler, so instrumented
+# stages pay one method call and nothing else
+_NULL_STAGE = contextlib.nullcontext()
+
+try:
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+def _rss_mb() -> Optional[float]:
+    """Current resident set size, where the platform exposes it"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _top_functions(profile: cProfile.Profile, limit: int = CPROFILE_TOP) -> List[Dict[str, Any]]:
+    """Hottest functions by cumulative time from a finished cProfile run"""
+    stats = pstats.Stats(profile, stream=io.StringIO())
+    rows = []
+    for (filename, lineno, function), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({
+            'function': f"{os.path.basename(filename)}:{lineno}({function})",
+            'calls': calls,
+            'own_s': round(own, 6),
+            'cumulative_s': round(cumulative, 6)
+        })
+    rows.sort(key=lambda row: row['cumulative_s'], reverse=True)
+    return rows[:limit]
+
+class _Stage:
+    """Context manager recording one stage into its profiler"""
+
+    __slots__ = ('profiler', 'name', 'record', 'wall', 'cpu', 'blocks', 'profile')
+
+    def __init__(self, profiler: 'StageProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> '_Stage':
+        profiler = self.profiler
+        self.record = {
+            'stage': self.name,
+            'parent': profiler._active[-1]['stage'] if profiler._active else None,
+            'rss_before_mb': _rss_mb()
+        }
+        profiler._active.append(self.record)
+        profiler.stages.append(self.record)
+
+        # Only one cProfile can hook the interpreter at a time, so nested
+        # stages inside a profiled stage are covered by the outer profile
+        self.profile = None
+        if profiler.cprofile_rate and profiler._profiling is None \
+                and profiler._rng.random() < profiler.cprofile_rate:
+            self.profile = cProfile.Profile()
+            profiler._profiling = self
+        self.blocks = sys.getallocatedblocks()
+        self.wall, self.cpu = time.perf_counter(), time.process_time()
+        if self.profile is not None:
+            self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.profile is not None:
+            self.profile.disable()
+        wall, cpu = time.perf_counter() - self.wall, time.process_time() - self.cpu
+        record = self.record
+        rss_after = _rss_mb()
+        record.update({
+            'wall_s': round(wall, 6),
+            'cpu_s': round(cpu, 6),
+            'rss_after_mb': round(rss_after, 2) if rss_after is not None else None,
+            'rss_delta_mb': round(rss_after - record['rss_before_mb'], 2)
+                            if rss_after is not None and record['rss_before_mb'] is not None else None,
+            'peak_rss_mb': round(_peak_rss_mb(), 2),
+            'allocated_blocks_delta': sys.getallocatedblocks() - self.blocks
+        })
+        if record['rss_before_mb'] is not None:
+            record['rss_before_mb'] = round(record['rss_before_mb'], 2)
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+        if self.profile is not None:
+            record['cprofile'] = _top_functions(self.profile)
+            self.profiler._profiling = None
+        self.profiler._active.pop()
+
+class StageProfiler:
+    """Collects per-stage timings; a disabled profiler is a no-op"""
+
+    def __init__(self, enabled: bool = False, cprofile_rate: float = 0.0, seed: Optional[int] = None):
+        self.enabled = enabled
+        self.cprofile_rate = max(0.0, min(1.0, cprofile_rate)) if enabled else 0.0
+        self.stages: List[Dict[str, Any]] = []
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        self._started = time.perf_counter()
+        self._active: List[Dict[str, Any]] = []
+        self._profiling: Optional[_Stage] = None
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def from_env(cls, flag: bool = False, cprofile_rate: Optional[float] = None) -> 'StageProfiler':
+        """Profiler enabled by a --profile flag or the PAYROX_SECURITY_PROFILE env var"""
+        env_flag = os.environ.get(PROFILE_ENV, '').strip().lower() not in ('', '0', 'false', 'no', 'off')
+        if cprofile_rate is None:
+            try:
+                cprofile_rate = float(os.environ.get(CPROFILE_ENV) or 0.0)
+            except ValueError:
+                cprofile_rate = 0.0
+        return cls(flag or env_flag or cprofile_rate > 0, cprofile_rate)
+
+    def stage(self, name: str):
+        """Context manager timing one stage"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def report(self) -> Dict[str, Any]:
+        """Structured timings for every recorded stage"""
+        totals: Dict[str, Dict[str, float]] = {}
+        for record in self.stages:
+            if record['parent'] is None and 'wall_s' in record:
+                total = totals.setdefault(record['stage'], {'wall_s': 0.0, 'cpu_s': 0.0, 'calls': 0})
+                total['wall_s'] = round(total['wall_s'] + record['wall_s'], 6)
+                total['cpu_s'] = round(total['cpu_s'] + record['cpu_s'], 6)
+                total['calls'] += 1
+        return {
+            'started_at': self.started_at,
+            'wall_s': round(time.perf_counter() - self._started, 6),
+            'cpu_s': round(time.process_time(), 6),
+            'peak_rss_mb': round(_peak_rss_mb(), 2),
+            'python': platform.python_version(),
+            'argv': sys.argv,
+            'cprofile_rate': self.cprofile_rate,
+            'totals': totals,
+            'stages': self.stages
+        }
+
+    def write(self, path: str) -> None:
+        """Write the timing JSON; does nothing when disabled"""
+        if not self.enabled:
+            return
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        print(f"Stage profile written to {path}")
+
+NULL_PROFILER = StageProfiler()
+
+def add_profile_arguments(parser) -> None:
+    """--profile / --profile-cprofile options shared by the security scripts"""
+    parser.add_argument('--profile', action='store_true',
+                        help=f"Record per-stage timings to {PROFILE_FILE} (or set {PROFILE_ENV}=1)")
+    parser.add_argument('--profile-cprofile', type=float, nargs='?', const=1.0, metavar='RATE',
+                        help=f"Also cProfile this fraction of stages (or set {CPROFILE_ENV})")
+
+def profiler_from_args(args) -> StageProfiler:
+    return StageProfiler.from_env(args.profile, args.profile_cprofile)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Synthetic Report Generator for PayRox Go Beyond
+Seeded Slither and Mythril reports in the real schema, scaled for benchmarking
+"""
+
+import argparse
+import json
+import os
+import random
+from typing import Dict, List, Any
+
+DEFAULT_TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'security-reports', 'slither-report.json')
+
+# Mythril issues per report file at 1x, mirroring the four contracts the
+# workflow originally analyzed
+MYTHRIL_FILES_1X = 4
+MYTHRIL_ISSUES_1X = 9
+MYTHRIL_MAX_ISSUES_PER_FILE = 50
+
+MYTHRIL_ISSUE_TYPES = [
+    ('Dependence on predictable environment variable', '116', 'Low'),
+    ('State access after external call', '107', 'Medium'),
+    ('External Call To User-Supplied Address', '107', 'High'),
+    ('Unchecked return value from external call.', '104', 'Low'),
+    ('Integer Arithmetic Bugs', '101', 'High'),
+    ('Delegatecall to user-supplied address', '112', 'High'),
+    ('Multiple Calls in a Single Transaction', '113', 'Low'),
+    ('Exception State', '110', 'Medium'),
+]
+
+def load_templates(template_path: str) -> List[Dict[str, Any]]:
+    """Detector results from a real Slither report, used as shape templates"""
+    with open(template_path, 'r') as f:
+        return json.load(f)['results']['detectors']
+
+# Stands in for the synthetic shard directory in serialized templates
+SHARD_PLACEHOLDER = '{SHARD}'
+
+def _shard_template(detector: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a detector whose source mappings point into the shard placeholder
+
+    Paths are rewritten once per field on the parsed detector, so no path
+    is ever matched inside one that was already rewritten.
+    """
+    def rewrite(node: Any) -> Any:
+        if isinstance(node, list):
+            return [rewrite(item) for item in node]
+        if not isinstance(node, dict):
+            return node
+        node = {key: rewrite(value) for key, value in node.items()}
+        relative = node.get('filename_relative')
+        if relative:
+            sharded = SHARD_PLACEHOLDER + relative.split('contracts/', 1)[-1]
+            for key in ('filename_absolute', 'filename_short'):
+                value = node.get(key)
+                if isinstance(value, str) and value.endswith(relative):
+                    node[key] = value[:len(value) - len(relative)] + sharded
+            node['filename_relative'] = sharded
+        return node
+    return rewrite(detector)
+
+def write_slither_report(path: str, templates: List[Dict[str, Any]], scale: int, rng: random.Random) -> int:
+    """Stream len(templates) * scale detectors to disk; returns the count written"""
+    # Serialize each template once and specialize it by filling in placeholders,
+    # so generation stays I/O bound even at 10,000x
+    prepared = []
+    for template in templates:
+        text = json.dumps(_shard_template(template), separators=(',', ':'))
+        prepared.append(text.replace(template['id'], '{ID}'))
+
+    count = len(templates) * scale
+    with open(path, 'w') as f:
+        f.write('{"success":true,"error":null,"results":{"detectors":[')
+        for index in range(count):
+            text = prepared[rng.randrange(len(prepared))]
+            # Each synthetic detector points into its own copy of the contract tree
+            shard = f"contracts/synthetic/s{index // len(templates)}/"
+            if index:
+                f.write(',')
+            f.write(text.replace(SHARD_PLACEHOLDER, shard).replace('{ID}', '%064x' % rng.getrandbits(256)))
+        f.write(']}}')
+    return count
+
+def write_mythril_reports(output_dir: str, scale: int, rng: random.Random) -> int:
+    """Write mythril-*.json files holding MYTHRIL_ISSUES_1X * scale issues in total"""
+    total = MYTHRIL_ISSUES_1X * scale
+    files = max(MYTHRIL_FILES_1X, -(-total // MYTHRIL_MAX_ISSUES_PER_FILE))
+    for file_index in range(files):
+        contract = f"SyntheticContract{file_index}"
+        filename = f"contracts/synthetic/{contract}.sol"
+        issues = []
+        for _ in range(total // files + (1 if file_index < total % files else 0)):
+            title, swc_id, severity = MYTHRIL_ISSUE_TYPES[rng.randrange(len(MYTHRIL_ISSUE_TYPES))]
+            lineno = rng.randint(10, 900)
+            issues.append({
+                'address': rng.randint(100, 20000),
+                'code': 'block.timestamp' if swc_id == '116' else 'msg.sender.call{value: amount}("")',
+                'contract': contract,
+                'description': f"{title}\nThe contract {contract} may be affected at line {lineno}.",
+                'filename': filename,
+                'function': f"function{rng.randint(0, 40)}(uint256)",
+                'lineno': lineno,
+                'max_gas_used': rng.randint(5000, 90000),
+                'min_gas_used': rng.randint(1000, 5000),
+                'severity': severity,
+                'sourceMap': f"{rng.randint(0, 20000)}:{rng.randint(1, 200)}:0",
+                'swc-id': swc_id,
+                'title': title,
+                'tx_sequence': None
+            })
+        with open(os.path.join(output_dir, f"mythril-{contract}.json"), 'w') as f:
+            json.dump({'error': None, 'issues': issues, 'success': True}, f)
+    return total
+
+def generate(output_dir: str, scale: int, seed: int = 0,
+             template_path: str = DEFAULT_TEMPLATE) -> Dict[str, Any]:
+    """Generate one scaled report set; returns paths and finding counts"""
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(seed)
+    slither_path = os.path.join(output_dir, 'slither-report.json')
+    slither_count = write_slither_report(slither_path, load_templates(template_path), scale, rng)
+    mythril_count = write_mythril_reports(output_dir, scale, rng)
+    return {
+        'slither_report': slither_path,
+        'mythril_dir': output_dir,
+        'slither_findings': slither_count,
+        'mythril_findings': mythril_count,
+        'slither_bytes': os.path.getsize(slither_path)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic PayRox Go Beyond security reports')
+    parser.add_argument('--output-dir', required=True, help='Directory for the generated reports')
+    parser.add_argument('--scale', type=int, default=1, help='Finding count multiplier over the template')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE, help='Real Slither report to model')
+
+    args = parser.parse_args()
+    info = generate(args.output_dir, args.scale, args.seed, args.template)
+    print(f"Generated {info['slither_findings']} Slither findings "
+          f"({info['slither_bytes'] / (1024 * 1024):.1f} MB) and "
+          f"{info['mythril_findings']} Mythril issues in {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
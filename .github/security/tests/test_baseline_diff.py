@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the Baseline Diff of PayRox Go Beyond
+Checks that fingerprints survive line shifts and the new/resolved/unchanged split
+"""
+
+import os
+import sys
+import unittest
+
+SECURITY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SECURITY_DIR)
+
+from baseline_diff import diff_findings, fingerprint  # noqa: E402
+from findings import Finding  # noqa: E402
+
+def slither_finding(line: int, check: str = 'reentrancy-eth', function: str = 'withdraw',
+                    filename: str = 'contracts/Vault.sol', id: str = 'a1', severity: str = 'critical') -> Finding:
+    detector = {'check': check, 'impact': 'High', 'confidence': 'High', 'id': id,
+                'description': f"{check} in Vault.{function}()",
+                'elements': [{'type': 'function', 'name': function,
+                              'type_specific_fields': {'parent': {'type': 'contract', 'name': 'Vault'}},
+                              'source_mapping': {'filename_relative': filename, 'lines': list(range(line, line + 6))}},
+                             {'type': 'node', 'name': 'msg.sender.call',
+                              'source_mapping': {'filename_relative': filename, 'lines': [line + 3]}}]}
+    return Finding.from_slither(detector, severity)
+
+def mythril_finding(line: int, swc: str = '107', function: str = 'withdraw()', severity: str = 'High') -> Finding:
+    return Finding.from_mythril({'title': 'External Call', 'swc-id': swc, 'severity': severity,
+                                 'filename': 'contracts/Vault.sol', 'function': function, 'lineno': line}, severity)
+
+class FingerprintTest(unittest.TestCase):
+
+    def test_stable_across_line_shifts(self):
+        self.assertEqual(fingerprint(slither_finding(10)), fingerprint(slither_finding(42)))
+        self.assertEqual(fingerprint(mythril_finding(10)), fingerprint(mythril_finding(42)))
+
+    def test_ignores_volatile_id_and_path_prefix(self):
+        self.assertEqual(fingerprint(slither_finding(10, id='a1')), fingerprint(slither_finding(10, id='ff')))
+        self.assertEqual(fingerprint(slither_finding(10)),
+                         fingerprint(slither_finding(10, filename='/home/runner/work/repo/contracts/Vault.sol')))
+
+    def test_changes_with_the_issue(self):
+        base = fingerprint(slither_finding(10))
+        self.assertNotEqual(base, fingerprint(slither_finding(10, check='reentrancy-no-eth')))
+        self.assertNotEqual(base, fingerprint(slither_finding(10, function='deposit')))
+        self.assertNotEqual(base, fingerprint(slither_finding(10, filename='contracts/Other.sol')))
+        self.assertNotEqual(fingerprint(mythril_finding(10)), fingerprint(mythril_finding(10, swc='104')))
+
+    def test_span_shape_matters(self):
+        # The flagged statement moving within the function is a different finding
+        moved = slither_finding(10)
+        moved.spans = (moved.spans[0], (moved.spans[1][0], 11, 11))
+        self.assertNotEqual(fingerprint(slither_finding(10)), fingerprint(moved))
+
+class DiffFindingsTest(unittest.TestCase):
+
+    def test_added_resolved_unchanged(self):
+        baseline = [slither_finding(10), slither_finding(10, check='tx-origin', severity='high'),
+                    mythril_finding(5)]
+        current = [slither_finding(30), mythril_finding(8), mythril_finding(9, swc='104', severity='Medium')]
+        diff = diff_findings(current, baseline)
+        self.assertEqual({severity: [f.check for f in findings] for severity, findings in diff['added'].items()},
+                         {'Medium': ['External Call']})
+        self.assertEqual(diff['resolved'], {'high': 1})
+        self.assertEqual(diff['unchanged'], {'critical': 1, 'High': 1})
+
+    def test_duplicates_are_counted(self):
+        diff = diff_findings([slither_finding(10)] * 3, [slither_finding(10)])
+        self.assertEqual(len(diff['added']['critical']), 2)
+        self.assertEqual(diff['unchanged'], {'critical': 1})
+        self.assertEqual(diff['resolved'], {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for the Bulk Report Loader of PayRox Go Beyond
+Covers the thread/process split at the size threshold and the structured load errors
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+SECURITY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SECURITY_DIR)
+
+from bulk_loader import LARGE_REPORT_BYTES, BulkLoader, LoadErrors  # noqa: E402
+from mythril_processor import load_mythril_report, load_mythril_reports  # noqa: E402
+
+def decoding_pid(data: bytes) -> int:
+    """Decoder reporting the process it ran in"""
+    return os.getpid()
+
+def decode_json(data: bytes):
+    return json.loads(data)
+
+class BulkLoaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workdir)
+
+    def write(self, name: str, data: bytes) -> str:
+        path = os.path.join(self.workdir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_files_from_the_threshold_up_decode_in_a_worker_process(self):
+        below = self.write('below.json', b' ' * (LARGE_REPORT_BYTES - 1))
+        at = self.write('at.json', b' ' * LARGE_REPORT_BYTES)
+        loader = BulkLoader(processes=1)
+        pids = {path: pid for _, path, pid in loader.load([below, at], decoding_pid)}
+        self.assertEqual(pids[below], os.getpid())
+        self.assertNotEqual(pids[at], os.getpid())
+        self.assertEqual(len(loader.errors), 0)
+
+    def test_no_processes_decodes_everything_in_threads(self):
+        path = self.write('large.json', b' ' * 16)
+        loader = BulkLoader(processes=0, large_bytes=8)
+        self.assertEqual([pid for _, _, pid in loader.load([path], decoding_pid)], [os.getpid()])
+
+    def test_results_keep_their_input_index(self):
+        paths = [self.write(f"report-{index}.json", json.dumps({'index': index}).encode()) for index in range(20)]
+        loaded = list(BulkLoader(io_workers=4, processes=0).load(paths, decode_json))
+        self.assertEqual(sorted((index, value['index']) for index, _, value in loaded),
+                         [(index, index) for index in range(20)])
+
+    def test_corrupt_and_missing_files_are_recorded(self):
+        good = self.write('good.json', b'{"issues": []}')
+        corrupt = self.write('corrupt.json', b'{"issues": [')
+        missing = os.path.join(self.workdir, 'missing.json')
+        loader = BulkLoader(processes=0)
+        loaded = list(loader.load([good, corrupt, missing], decode_json))
+        self.assertEqual([path for _, path, _ in loaded], [good])
+
+        report = loader.errors.to_dict()
+        self.assertEqual((report['files'], report['failed']), (3, 2))
+        self.assertEqual([(error['path'], error['stage']) for error in report['errors']],
+                         [(corrupt, 'decode'), (missing, 'read')])
+        self.assertTrue(report['errors'][0]['error'].startswith('JSONDecodeError: '))
+        self.assertTrue(report['errors'][1]['error'].startswith('FileNotFoundError: '))
+
+    def test_corrupt_large_file_is_recorded(self):
+        corrupt = self.write('corrupt.json', b'{' + b' ' * 64)
+        loader = BulkLoader(processes=1, large_bytes=32)
+        self.assertEqual(list(loader.load([corrupt], decode_json)), [])
+        [error] = loader.errors
+        self.assertEqual((error.path, error.stage), (corrupt, 'decode'))
+
+    def test_errors_accumulate_across_loads_and_write(self):
+        loader = BulkLoader(processes=0)
+        list(loader.load([os.path.join(self.workdir, 'a.json')], decode_json))
+        list(loader.load([self.write('b.json', b'[]')], decode_json))
+        output = os.path.join(self.workdir, 'errors.json')
+        loader.errors.write(output)
+        with open(output) as f:
+            report = json.load(f)
+        self.assertEqual((report['files'], report['failed']), (2, 1))
+
+class MythrilReportLoadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workdir)
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.workdir, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_single_report_failures_are_recorded(self):
+        good = self.write('mythril-Good.json', json.dumps({'issues': [{'title': 'x'}]}))
+        corrupt = self.write('mythril-Bad.json', '{"issues": [')
+        errors = LoadErrors()
+        self.assertEqual(load_mythril_report(good, errors), [{'title': 'x'}])
+        self.assertEqual(load_mythril_report(corrupt, errors), [])
+        self.assertEqual(load_mythril_report(os.path.join(self.workdir, 'mythril-Gone.json'), errors), [])
+        self.assertEqual([(error.stage, os.path.basename(error.path)) for error in errors],
+                         [('decode', 'mythril-Bad.json'), ('read', 'mythril-Gone.json')])
+        self.assertEqual(errors.to_dict()['files'], 3)
+
+    def test_directory_load_skips_unreadable_reports(self):
+        self.write('mythril-A.json', json.dumps({'issues': [{'title': 'a'}]}))
+        self.write('mythril-B.json', 'not json')
+        self.write('mythril-C.json', json.dumps({'issues': [{'title': 'c'}]}))
+        loader = BulkLoader(processes=0)
+        self.assertEqual(load_mythril_reports(self.workdir, loader), [{'title': 'a'}, {'title': 'c'}])
+        self.assertEqual([os.path.basename(error.path) for error in loader.errors], ['mythril-B.json'])
+
+if __name__ == '__main__':
+    unittest.main()
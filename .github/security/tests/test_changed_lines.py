@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the Changed-Line Index of PayRox Go Beyond
+Checks the interval tree against a brute-force overlap scan and the unified-diff hunk reader
+"""
+
+import os
+import random
+import sys
+import unittest
+
+SECURITY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SECURITY_DIR)
+
+from changed_lines import IntervalTree, parse_unified_diff  # noqa: E402
+
+def brute_force(intervals, start, end):
+    return sorted(value for lo, hi, value in intervals if lo <= end and hi >= start)
+
+class IntervalTreeTest(unittest.TestCase):
+
+    def test_matches_brute_force_scan(self):
+        rng = random.Random(1337)
+        for size in (0, 1, 2, 3, 7, 64, 257):
+            intervals = []
+            for value in range(size):
+                start = rng.randint(1, 200)
+                intervals.append((start, start + rng.choice([0, 0, 1, 5, 40]), value))
+            tree = IntervalTree(intervals)
+            self.assertEqual(len(tree), size)
+            for _ in range(300):
+                start = rng.randint(0, 250)
+                end = start + rng.choice([0, 1, 3, 30])
+                self.assertEqual(sorted(tree.overlapping(start, end)), brute_force(intervals, start, end),
+                                 f"{size} intervals, query [{start}, {end}]")
+
+    def test_closed_interval_boundaries(self):
+        tree = IntervalTree([(10, 20, 0), (21, 21, 1), (5, 9, 2)])
+        self.assertEqual(sorted(tree.overlapping(20, 20)), [0])
+        self.assertEqual(sorted(tree.overlapping(9, 10)), [0, 2])
+        self.assertEqual(sorted(tree.overlapping(21, 30)), [1])
+        self.assertEqual(sorted(tree.overlapping(1, 4)), [])
+        self.assertEqual(sorted(tree.overlapping(22, 22)), [])
+
+    def test_duplicate_intervals(self):
+        tree = IntervalTree([(3, 3, 0), (3, 3, 1), (3, 8, 2)])
+        self.assertEqual(sorted(tree.overlapping(3, 3)), [0, 1, 2])
+        self.assertEqual(sorted(tree.overlapping(4, 4)), [2])
+
+class ParseUnifiedDiffTest(unittest.TestCase):
+
+    def parse(self, text: str):
+        return parse_unified_diff(text.splitlines(keepends=True))
+
+    def test_hunk_ranges(self):
+        hunks = self.parse(
+            "diff --git a/contracts/A.sol b/contracts/A.sol\n"
+            "--- a/contracts/A.sol\n"
+            "+++ b/contracts/A.sol\n"
+            "@@ -10,2 +10,3 @@ contract A {\n"
+            "@@ -40 +41 @@\n"
+            "@@ -50,0 +52,2 @@\n")
+        self.assertEqual(hunks, {'contracts/A.sol': [(10, 12), (41, 41), (52, 53)]})
+
+    def test_hunks_with_zero_new_lines(self):
+        hunks = self.parse(
+            "--- a/contracts/A.sol\n"
+            "+++ b/contracts/A.sol\n"
+            "@@ -5,2 +4,0 @@\n"
+            "@@ -1,3 +0,0 @@\n")
+        # A deletion touches the line it was removed after (line 1 at the top of the file)
+        self.assertEqual(hunks, {'contracts/A.sol': [(4, 4), (1, 1)]})
+
+    def test_renames_are_keyed_by_the_new_path(self):
+        hunks = self.parse(
+            "diff --git a/contracts/Old.sol b/contracts/New.sol\n"
+            "similarity index 90%\n"
+            "rename from contracts/Old.sol\n"
+            "rename to contracts/New.sol\n"
+            "--- a/contracts/Old.sol\n"
+            "+++ b/contracts/New.sol\n"
+            "@@ -3 +3 @@\n"
+            "diff --git a/contracts/Same.sol b/contracts/Moved.sol\n"
+            "similarity index 100%\n"
+            "rename from contracts/Same.sol\n"
+            "rename to contracts/Moved.sol\n")
+        self.assertEqual(hunks, {'contracts/New.sol': [(3, 3)]})
+
+    def test_deleted_files_and_timestamps(self):
+        hunks = self.parse(
+            "--- a/contracts/Gone.sol\n"
+            "+++ /dev/null\n"
+            "@@ -1,4 +0,0 @@\n"
+            "--- contracts/B.sol\t2024-01-01 00:00:00\n"
+            "+++ contracts/B.sol\t2024-01-02 00:00:00\n"
+            "@@ -7,0 +8 @@\n")
+        self.assertEqual(hunks, {'contracts/B.sol': [(8, 8)]})
+
+    def test_content_lines_are_not_hunks(self):
+        hunks = self.parse(
+            "--- a/contracts/A.sol\n"
+            "+++ b/contracts/A.sol\n"
+            "@@ -1 +1,2 @@\n"
+            "+@@ -9 +9 @@ inside a string\n"
+            "-+++ b/contracts/Other.sol\n")
+        self.assertEqual(hunks, {'contracts/A.sol': [(1, 2)]})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the Compact Report Format of PayRox Go Beyond
+Round-trips Slither and Mythril reports through the compressed compact form
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+SECURITY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SECURITY_DIR)
+
+from compact_reports import compact_reports, find_report, load_report, write_compact_slither_report  # noqa: E402
+from slither_processor import iter_slither_detectors  # noqa: E402
+
+ROOT = '/home/runner/work/payrox/payrox/'
+
+def source_mapping(filename: str, lines, absolute: str = None) -> dict:
+    # Key order as Slither emits it
+    return {'start': 120, 'length': 48, 'filename_relative': filename,
+            'filename_absolute': absolute or ROOT + filename, 'filename_short': filename,
+            'is_dependency': False, 'lines': list(lines), 'starting_column': 5, 'ending_column': 6}
+
+def slither_report() -> dict:
+    return {'success': True, 'error': None, 'results': {'detectors': [
+        {'elements': [{'type': 'function', 'name': 'withdraw',
+                       'source_mapping': source_mapping('contracts/Vault.sol', range(10, 30)),
+                       'type_specific_fields': {'parent': {'type': 'contract', 'name': 'Vault',
+                                                           'source_mapping': source_mapping('contracts/Vault.sol',
+                                                                                            range(1, 80))}}},
+                      {'type': 'node', 'name': 'msg.sender.call',
+                       'source_mapping': source_mapping('contracts/Vault.sol', [14, 16, 17, 21])}],
+         'description': 'Reentrancy in Vault.withdraw()', 'check': 'reentrancy-eth',
+         'impact': 'High', 'confidence': 'Medium', 'id': 'f00d'},
+        # A dependency outside the common root keeps its absolute path
+        {'elements': [{'type': 'function', 'name': 'sendValue',
+                       'source_mapping': source_mapping('node_modules/@openzeppelin/Address.sol', [40],
+                                                        '/opt/deps/node_modules/@openzeppelin/Address.sol')}],
+         'description': 'Low level call', 'check': 'low-level-calls', 'impact': 'Informational',
+         'confidence': 'High', 'id': 'beef'},
+        {'elements': [], 'description': 'Pragma', 'check': 'pragma', 'impact': 'Informational',
+         'confidence': 'High', 'id': 'cafe'}
+    ]}}
+
+class CompactReportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workdir)
+
+    def write_json(self, name: str, data) -> str:
+        path = os.path.join(self.workdir, name)
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        return path
+
+    def test_slither_round_trip(self):
+        original = slither_report()
+        source = self.write_json('slither-report.json', original)
+        for suffix in ('.json', '.json.gz', '.json.xz'):
+            with self.subTest(suffix=suffix):
+                output = os.path.join(self.workdir, f"compact{suffix}")
+                write_compact_slither_report(source, output)
+                self.assertEqual(load_report(output), original)
+                # Streamed detectors match the original byte for byte, key order included
+                header = {}
+                streamed = list(iter_slither_detectors(output, header))
+                self.assertEqual([json.dumps(detector) for detector in streamed],
+                                 [json.dumps(detector) for detector in original['results']['detectors']])
+                self.assertEqual(header, {'success': True, 'error': None})
+
+    def test_compact_form_drops_derivable_data(self):
+        source = self.write_json('slither-report.json', slither_report())
+        output = os.path.join(self.workdir, 'compact.json')
+        write_compact_slither_report(source, output)
+        with open(output) as f:
+            compact = json.load(f)
+        self.assertEqual(compact['compact']['filename_root'], ROOT)
+        [function, node] = compact['results']['detectors'][0]['elements']
+        self.assertEqual(function['source_mapping']['line_ranges'], [[10, 29]])
+        self.assertNotIn('filename_absolute', function['source_mapping'])
+        self.assertNotIn('filename_short', function['source_mapping'])
+        self.assertEqual(node['source_mapping']['line_ranges'], [[14, 14], [16, 17], [21, 21]])
+        dependency = compact['results']['detectors'][1]['elements'][0]['source_mapping']
+        self.assertEqual(dependency['filename_absolute'], '/opt/deps/node_modules/@openzeppelin/Address.sol')
+        self.assertLess(os.path.getsize(output), os.path.getsize(source))
+
+    def test_unsuccessful_header_survives(self):
+        report = slither_report()
+        report.update(success=False, error='slither-Token.json: solc failed', analyzed=['contracts/Vault.sol'])
+        source = self.write_json('slither-report.json', report)
+        output = os.path.join(self.workdir, 'compact.json.gz')
+        write_compact_slither_report(source, output)
+        self.assertEqual(load_report(output), report)
+
+    def test_compact_reports_replaces_the_raw_files(self):
+        slither = self.write_json('slither-report.json', slither_report())
+        mythril_report = {'error': None, 'success': True, 'issues': [{'title': 'x', 'swc-id': '107'}]}
+        mythril = self.write_json('mythril-Vault.json', mythril_report)
+        written = compact_reports([slither, mythril], 'xz')
+        self.assertEqual(sorted(os.path.basename(path) for path in written),
+                         ['mythril-Vault.json.xz', 'slither-report.json.xz'])
+        self.assertFalse(os.path.exists(slither) or os.path.exists(mythril))
+        self.assertEqual(find_report(slither), slither + '.xz')
+        self.assertEqual(load_report(slither + '.xz'), slither_report())
+        self.assertEqual(load_report(mythril + '.xz'), mythril_report)
+        self.assertEqual(sorted(os.listdir(self.workdir)), ['mythril-Vault.json.xz', 'slither-report.json.xz'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the Cross-Tool Finding Correlation of PayRox Go Beyond
+Checks which findings are merged and the per-cluster counts fed into the security score
+"""
+
+import os
+import sys
+import unittest
+
+SECURITY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SECURITY_DIR)
+
+from correlation import correlate, correlate_categories  # noqa: E402
+from mythril_processor import categorize_mythril_findings  # noqa: E402
+from security_pipeline import score_inputs  # noqa: E402
+from security_summary import calculate_security_score  # noqa: E402
+from slither_processor import categorize_detector_stream  # noqa: E402
+
+def slither_detector(check: str, function: str, line: int, filename: str = 'contracts/Vault.sol') -> dict:
+    return {'check': check, 'impact': 'High', 'confidence': 'High', 'description': f"{check} in {function}",
+            'elements': [{'type': 'function', 'name': function,
+                          'source_mapping': {'filename_relative': filename, 'lines': [line, line + 1]}}]}
+
+def mythril_issue(swc: str, function: str, line: int, severity: str = 'High',
+                  filename: str = 'contracts/Vault.sol') -> dict:
+    return {'title': f"SWC-{swc} issue", 'swc-id': swc, 'severity': severity, 'filename': filename,
+            'function': f"{function}()", 'lineno': line, 'description': f"SWC-{swc} in {function}"}
+
+class CorrelationTest(unittest.TestCase):
+
+    def categories(self, detectors=(), issues=()):
+        return categorize_detector_stream(list(detectors)), categorize_mythril_findings(list(issues))
+
+    def test_same_tool_findings_are_never_merged(self):
+        slither, mythril = self.categories(
+            [slither_detector('reentrancy-eth', 'withdraw', 10), slither_detector('reentrancy-eth', 'withdraw', 10),
+             slither_detector('reentrancy-no-eth', 'withdraw', 20)],
+            [mythril_issue('107', 'stage', 5), mythril_issue('107', 'stage', 5)])
+        correlation = correlate_categories(slither, mythril)
+        self.assertEqual(len(correlation.clusters), 5)
+        self.assertEqual(correlation.merged, 0)
+
+    def test_cross_tool_pair_is_merged(self):
+        # reentrancy-eth is SWC-107: same class, file, function and line
+        slither, mythril = self.categories([slither_detector('reentrancy-eth', 'withdraw', 10)],
+                                           [mythril_issue('107', 'withdraw', 10)])
+        correlation = correlate_categories(slither, mythril)
+        [cluster] = correlation.clusters
+        self.assertEqual(cluster.tools, ['mythril', 'slither'])
+        self.assertEqual(cluster.issue, 'SWC-107')
+        self.assertIs(cluster.lead, slither['critical'][0])
+        self.assertEqual(correlation.summary(), {'findings': 2, 'clusters': 1, 'merged': 1, 'cross_tool': 1})
+
+    def test_pairs_on_a_shared_line_in_another_function(self):
+        slither, mythril = self.categories([slither_detector('reentrancy-eth', 'withdraw', 10)],
+                                           [mythril_issue('107', 'fallback', 11)])
+        self.assertEqual(correlate_categories(slither, mythril).merged, 1)
+
+    def test_different_classes_or_files_are_kept_apart(self):
+        slither, mythril = self.categories(
+            [slither_detector('reentrancy-eth', 'withdraw', 10)],
+            [mythril_issue('105', 'withdraw', 10),
+             mythril_issue('107', 'withdraw', 10, filename='contracts/Other.sol')])
+        self.assertEqual(correlate_categories(slither, mythril).merged, 0)
+
+    def test_each_finding_pairs_at_most_once(self):
+        # Two Slither findings match one Mythril finding: only one pair forms
+        slither, mythril = self.categories(
+            [slither_detector('reentrancy-eth', 'withdraw', 10), slither_detector('reentrancy-eth', 'withdraw', 30)],
+            [mythril_issue('107', 'withdraw', 10)])
+        correlation = correlate_categories(slither, mythril)
+        self.assertEqual(sorted(len(cluster.findings) for cluster in correlation.clusters), [1, 2])
+        self.assertEqual(correlation.score_counts()['critical_issues'], 2)
+
+    def test_score_counts_each_cluster_once(self):
+        slither, mythril = self.categories(
+            [slither_detector('reentrancy-eth', 'withdraw', 10), slither_detector('reentrancy-eth', 'withdraw', 30)],
+            [mythril_issue('107', 'withdraw', 10), mythril_issue('107', 'withdraw', 30, 'Medium'),
+             mythril_issue('104', 'sweep', 50), mythril_issue('116', 'sweep', 60, 'Medium')])
+        slither_data, mythril_data, correlation = score_inputs(slither, mythril)
+
+        # Both Mythril reentrancy findings fold into the Slither criticals they pair with
+        self.assertEqual(slither_data['critical_issues'], 2)
+        self.assertEqual(mythril_data['high_severity'], 1)
+        self.assertEqual(mythril_data['medium_severity'], 1)
+        self.assertEqual(mythril_data['correlated'], {'high_severity': 1, 'medium_severity': 1})
+        self.assertNotIn('correlated', slither_data)
+        self.assertEqual(calculate_security_score(slither_data, mythril_data)['score'], 100 - 2 * 25 - 15 - 5)
+
+    def test_single_tool_inputs_are_untouched(self):
+        slither, _ = self.categories([slither_detector('reentrancy-eth', 'withdraw', 10),
+                                      slither_detector('reentrancy-eth', 'withdraw', 10)])
+        slither_data, mythril_data, correlation = score_inputs(slither, None)
+        self.assertEqual(slither_data['critical_issues'], 2)
+        self.assertEqual(mythril_data['high_severity'], 0)
+        self.assertEqual(correlation.merged, 0)
+
+    def test_empty(self):
+        correlation = correlate([])
+        self.assertEqual(correlation.clusters, [])
+        self.assertEqual(correlation.summary(), {'findings': 0, 'clusters': 0, 'merged': 0, 'cross_tool': 0})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tests for the Parallel Mythril Runner of PayRox Go Beyond
+Drives run-mythril.py end to end against a stub `myth` executable
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SECURITY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUN_MYTHRIL = os.path.join(SECURITY_DIR, 'run-mythril.py')
+PROCESS_MYTHRIL = os.path.join(SECURITY_DIR, 'process-mythril.py')
+
+# Replays Mythril's CLI: the contract's `// stub:` marker picks the behaviour
+# and every analysis is logged as "<contract> <execution timeout>"
+STUB_MYTH = '''#!{python}
+import json, os, sys, time
+
+if sys.argv[1] == 'version':
+    print('Mythril stub v0.0.1')
+    sys.exit(0)
+
+contract = sys.argv[2]
+timeout = sys.argv[sys.argv.index('--execution-timeout') + 1]
+with open(os.environ['STUB_MYTH_LOG'], 'a') as log:
+    log.write(f"{{contract}} {{timeout}}\\n")
+source = open(contract).read()
+if '// stub: timeout' in source:
+    time.sleep(30)
+if '// stub: error' in source:
+    print('solc: compilation failed', file=sys.stderr)
+    sys.exit(1)
+name = os.path.splitext(os.path.basename(contract))[0]
+print(json.dumps({{'error': None, 'success': True, 'issues': [{{
+    'title': 'External Call To User-Supplied Address', 'swc-id': '107', 'severity': 'High',
+    'contract': name, 'filename': contract, 'function': 'withdraw()', 'lineno': 3,
+    'description': f'External call in {{name}}.withdraw()'
+}}]}}))
+# Mythril exits non-zero when it reports issues
+sys.exit(1)
+'''
+
+class RunMythrilTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workdir)
+        self.myth = os.path.join(self.workdir, 'myth')
+        with open(self.myth, 'w') as f:
+            f.write(STUB_MYTH.format(python=sys.executable))
+        os.chmod(self.myth, 0o755)
+        self.log = os.path.join(self.workdir, 'myth.log')
+        os.makedirs(os.path.join(self.workdir, 'contracts'))
+
+    def contract(self, name: str, marker: str = '') -> str:
+        path = f"contracts/{name}.sol"
+        with open(os.path.join(self.workdir, path), 'w') as f:
+            f.write(f"// SPDX-License-Identifier: MIT\n// stub: {marker}\ncontract {name} {{}}\n")
+        return path
+
+    def run_mythril(self, *extra: str, output_dir: str = 'reports') -> subprocess.CompletedProcess:
+        command = [sys.executable, RUN_MYTHRIL, '--myth', self.myth, '--output-dir', output_dir,
+                   '--history', 'history.json', '--no-triage', '--no-snippets', '--jobs', '2',
+                   '--budget', '60', '--min-timeout', '1', '--max-timeout', '20'] + list(extra)
+        return subprocess.run(command, cwd=self.workdir, capture_output=True, text=True,
+                              env=dict(os.environ, STUB_MYTH_LOG=self.log), timeout=120)
+
+    def invocations(self):
+        if not os.path.exists(self.log):
+            return []
+        with open(self.log) as f:
+            return [line.split() for line in f.read().splitlines()]
+
+    def summary(self, output_dir: str = 'reports'):
+        with open(os.path.join(self.workdir, output_dir, 'mythril-summary.json')) as f:
+            return json.load(f)
+
+    def test_analyzes_every_contract(self):
+        for name in ('Alpha', 'Beta', 'Gamma'):
+            self.contract(name)
+        proc = self.run_mythril()
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertEqual(sorted(contract for contract, _ in self.invocations()),
+                         ['contracts/Alpha.sol', 'contracts/Beta.sol', 'contracts/Gamma.sol'])
+        self.assertEqual(len(self.summary()), 3)
+        self.assertIn('Analyzed: 3', proc.stdout)
+
+    def test_summary_matches_process_mythril(self):
+        for name in ('Alpha', 'Beta'):
+            self.contract(name)
+        self.assertEqual(self.run_mythril().returncode, 0)
+        streamed = self.summary()
+
+        shutil.copytree(os.path.join(self.workdir, 'reports'), os.path.join(self.workdir, 'copy'))
+        proc = subprocess.run([sys.executable, PROCESS_MYTHRIL, 'copy', '--no-triage', '--no-snippets'],
+                              cwd=self.workdir, capture_output=True, text=True)
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertEqual(self.summary('copy'), streamed)
+
+    def test_fails_when_every_contract_fails(self):
+        self.contract('Alpha', 'error')
+        self.contract('Beta', 'error')
+        proc = self.run_mythril()
+        self.assertEqual(proc.returncode, 1, proc.stdout + proc.stderr)
+        self.assertIn('No contract was analyzed successfully', proc.stdout)
+        self.assertEqual(self.summary(), [])
+
+    def test_fails_when_every_contract_times_out(self):
+        self.contract('Alpha', 'timeout')
+        proc = self.run_mythril('--budget', '2', '--max-timeout', '1')
+        self.assertEqual(proc.returncode, 1, proc.stdout + proc.stderr)
+        self.assertIn('Timed out: 1', proc.stdout)
+        with open(os.path.join(self.workdir, 'reports', 'mythril-Alpha.json')) as f:
+            self.assertFalse(json.load(f)['success'])
+
+    def test_partial_failure_still_passes(self):
+        self.contract('Alpha')
+        self.contract('Beta', 'error')
+        proc = self.run_mythril()
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertIn('Errors: 1', proc.stdout)
+        self.assertEqual(len(self.summary()), 1)
+
+    def test_longest_expected_contract_runs_first(self):
+        for name in ('Alpha', 'Beta', 'Gamma'):
+            self.contract(name)
+        with open(os.path.join(self.workdir, 'history.json'), 'w') as f:
+            json.dump({'contracts/Alpha.sol': 1.0, 'contracts/Beta.sol': 9.0, 'contracts/Gamma.sol': 4.0}, f)
+        proc = self.run_mythril('--jobs', '1')
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertEqual([contract for contract, _ in self.invocations()],
+                         ['contracts/Beta.sol', 'contracts/Gamma.sol', 'contracts/Alpha.sol'])
+
+    def test_cache_reuses_analyses_at_least_as_long(self):
+        self.contract('Alpha')
+        self.contract('Beta')
+        self.assertEqual(self.run_mythril('--cache-dir', 'cache', '--max-timeout', '10').returncode, 0)
+        self.assertEqual([timeout for _, timeout in self.invocations()], ['8', '8'])
+
+        # A larger slice may find more, so the shorter analyses are redone
+        os.remove(self.log)
+        proc = self.run_mythril('--cache-dir', 'cache')
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertEqual([timeout for _, timeout in self.invocations()], ['16', '16'])
+
+        # Same or smaller slices: every report comes from the cache
+        os.remove(self.log)
+        for max_timeout in ('20', '10'):
+            proc = self.run_mythril('--cache-dir', 'cache', '--max-timeout', max_timeout)
+            self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+            self.assertEqual(self.invocations(), [])
+            self.assertIn('Reused from cache: 2', proc.stdout)
+            self.assertEqual(len(self.summary()), 2)
+
+    def test_cache_hits_with_unclamped_slices(self):
+        # Slices come from the budget left and the runtime history, not the
+        # max-timeout clamp, so they differ by a few seconds between runs
+        self.contract('Alpha')
+        self.contract('Beta')
+        proc = self.run_mythril('--cache-dir', 'cache', '--max-timeout', '1000')
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertEqual([timeout for _, timeout in self.invocations()], ['45', '45'])
+        with open(os.path.join(self.workdir, 'history.json')) as f:
+            self.assertEqual(len(json.load(f)), 2)
+
+        os.remove(self.log)
+        proc = self.run_mythril('--cache-dir', 'cache', '--max-timeout', '1000')
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertEqual(self.invocations(), [])
+        self.assertIn('Reused from cache: 2', proc.stdout)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Tests for the Parallel Slither Runner of PayRox Go Beyond
+Drives run-slither.py end to end against a stub `slither` executable
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from importlib.util import module_from_spec, spec_from_file_location
+
+SECURITY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUN_SLITHER = os.path.join(SECURITY_DIR, 'run-slither.py')
+sys.path.insert(0, SECURITY_DIR)
+
+# The runner's file name is not importable as a module name
+_spec = spec_from_file_location('run_slither', RUN_SLITHER)
+run_slither = module_from_spec(_spec)
+_spec.loader.exec_module(run_slither)
+
+# Replays Slither's CLI: the contract's `// stub:` marker picks the behaviour
+# and every invocation is logged with its arguments. Each contract reports
+# one finding of its own and one in the library they all import.
+STUB_SLITHER = '''#!{python}
+import json, os, sys, time
+
+contract = sys.argv[1]
+output = sys.argv[sys.argv.index('--json') + 1]
+with open(os.environ['STUB_SLITHER_LOG'], 'a') as log:
+    log.write(json.dumps(sys.argv[1:]) + "\\n")
+source = open(contract).read()
+if '// stub: timeout' in source:
+    time.sleep(30)
+if '// stub: error' in source:
+    print('solc: compilation failed', file=sys.stderr)
+    sys.exit(1)
+if os.path.exists(output):
+    print(f"{{output}} exists", file=sys.stderr)
+    sys.exit(1)
+
+def detector(check, impact, filename, id):
+    return {{'check': check, 'impact': impact, 'confidence': 'High', 'id': id,
+             'description': f'{{check}} in {{filename}}',
+             'elements': [{{'type': 'function', 'name': 'withdraw',
+                            'source_mapping': {{'filename_relative': filename, 'lines': [3]}}}}]}}
+
+name = os.path.splitext(os.path.basename(contract))[0]
+with open(output, 'w') as f:
+    json.dump({{'success': True, 'error': None, 'results': {{'detectors': [
+        detector('reentrancy-eth', 'High', contract, f'reentrancy-{{name}}'),
+        detector('tx-origin', 'Medium', 'contracts/lib/Shared.sol', 'tx-origin-shared')
+    ]}}}}, f)
+# Slither exits non-zero when it reports findings
+sys.exit(255)
+'''
+
+class RunSlitherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workdir)
+        self.slither = os.path.join(self.workdir, 'slither')
+        with open(self.slither, 'w') as f:
+            f.write(STUB_SLITHER.format(python=sys.executable))
+        os.chmod(self.slither, 0o755)
+        self.log = os.path.join(self.workdir, 'slither.log')
+        os.makedirs(os.path.join(self.workdir, 'contracts'))
+
+    def contract(self, name: str, marker: str = '') -> str:
+        path = f"contracts/{name}.sol"
+        with open(os.path.join(self.workdir, path), 'w') as f:
+            f.write(f"// SPDX-License-Identifier: MIT\n// stub: {marker}\ncontract {name} {{}}\n")
+        return path
+
+    def run_slither(self, *extra: str, passthrough=()) -> subprocess.CompletedProcess:
+        command = [sys.executable, RUN_SLITHER, '--slither', self.slither, '--contracts-root', 'contracts',
+                   '--output', 'reports/slither-report.json', '--history', 'history.json',
+                   '--jobs', '2', '--timeout', '5'] + list(extra)
+        if passthrough:
+            command += ['--'] + list(passthrough)
+        return subprocess.run(command, cwd=self.workdir, capture_output=True, text=True,
+                              env=dict(os.environ, STUB_SLITHER_LOG=self.log), timeout=120)
+
+    def invocations(self):
+        if not os.path.exists(self.log):
+            return []
+        with open(self.log) as f:
+            return [json.loads(line) for line in f.read().splitlines()]
+
+    def report(self):
+        with open(os.path.join(self.workdir, 'reports', 'slither-report.json')) as f:
+            return json.load(f)
+
+    def test_merges_every_contract_and_drops_duplicates(self):
+        for name in ('Alpha', 'Beta', 'Gamma'):
+            self.contract(name)
+        proc = self.run_slither()
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertEqual(sorted(args[0] for args in self.invocations()),
+                         ['contracts/Alpha.sol', 'contracts/Beta.sol', 'contracts/Gamma.sol'])
+
+        report = self.report()
+        self.assertTrue(report['success'])
+        self.assertIsNone(report['error'])
+        self.assertEqual(report['analyzed'], ['contracts/Alpha.sol', 'contracts/Beta.sol', 'contracts/Gamma.sol'])
+        # The shared library's finding is reported once, not once per target
+        ids = [detector['id'] for detector in report['results']['detectors']]
+        self.assertEqual(sorted(ids), ['reentrancy-Alpha', 'reentrancy-Beta', 'reentrancy-Gamma',
+                                       'tx-origin-shared'])
+        self.assertIn('Findings: 4 (2 duplicates from shared imports removed)', proc.stdout)
+
+    def test_same_id_of_another_check_is_kept(self):
+        paths = []
+        for index, detectors in enumerate([[{'check': 'a', 'id': '1'}, {'check': 'b', 'id': '1'}],
+                                           [{'check': 'a', 'id': '1'}, {'check': 'a', 'id': '2'}]]):
+            paths.append(os.path.join(self.workdir, f"slither-{index}.json"))
+            with open(paths[-1], 'w') as f:
+                json.dump({'success': True, 'error': None, 'results': {'detectors': detectors}}, f)
+        output = os.path.join(self.workdir, 'merged.json')
+        stats = run_slither.merge_slither_reports(paths, output)
+        self.assertEqual((stats['detectors'], stats['duplicates']), (3, 1))
+        with open(output) as f:
+            merged = json.load(f)
+        self.assertEqual([(d['check'], d['id']) for d in merged['results']['detectors']],
+                         [('a', '1'), ('b', '1'), ('a', '2')])
+        self.assertNotIn('analyzed', merged)
+
+    def test_failed_target_marks_report_incomplete(self):
+        self.contract('Alpha')
+        self.contract('Beta', 'error')
+        proc = self.run_slither()
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertIn('Errors: 1', proc.stdout)
+        self.assertIn('Analysis incomplete (1 contracts failed)', proc.stdout)
+
+        report = self.report()
+        self.assertFalse(report['success'])
+        self.assertIn('slither-Beta.json: solc: compilation failed', report['error'])
+        self.assertEqual(report['analyzed'], ['contracts/Alpha.sol'])
+        self.assertEqual(sorted(detector['id'] for detector in report['results']['detectors']),
+                         ['reentrancy-Alpha', 'tx-origin-shared'])
+
+    def test_timed_out_target_marks_report_incomplete(self):
+        self.contract('Alpha')
+        self.contract('Beta', 'timeout')
+        proc = self.run_slither('--timeout', '1')
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertIn('Timed out: 1', proc.stdout)
+
+        report = self.report()
+        self.assertFalse(report['success'])
+        self.assertIn('slither-Beta.json: Timed out after 1s', report['error'])
+        self.assertEqual(report['analyzed'], ['contracts/Alpha.sol'])
+        with open(os.path.join(self.workdir, 'history.json')) as f:
+            self.assertGreaterEqual(json.load(f)['contracts/Beta.sol'], 1.0)
+
+    def test_longest_expected_contract_runs_first(self):
+        for name in ('Alpha', 'Beta', 'Gamma'):
+            self.contract(name)
+        with open(os.path.join(self.workdir, 'history.json'), 'w') as f:
+            json.dump({'contracts/Alpha.sol': 1.0, 'contracts/Beta.sol': 9.0, 'contracts/Gamma.sol': 4.0}, f)
+        proc = self.run_slither('--jobs', '1')
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertEqual([args[0] for args in self.invocations()],
+                         ['contracts/Beta.sol', 'contracts/Gamma.sol', 'contracts/Alpha.sol'])
+
+    def test_only_named_contracts_with_passthrough_arguments(self):
+        for name in ('Alpha', 'Beta'):
+            self.contract(name)
+        proc = self.run_slither('contracts/Beta.sol', passthrough=['--exclude-informational'])
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        [args] = self.invocations()
+        self.assertEqual(args[0], 'contracts/Beta.sol')
+        self.assertEqual(args[-1], '--exclude-informational')
+        self.assertEqual(self.report()['analyzed'], ['contracts/Beta.sol'])
+
+    def test_rerun_replaces_existing_reports(self):
+        self.contract('Alpha')
+        self.assertEqual(self.run_slither().returncode, 0)
+        proc = self.run_slither()
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertTrue(self.report()['success'])
+
+if __name__ == '__main__':
+    unittest.main()
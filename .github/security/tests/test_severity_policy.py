@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the Severity Policy of PayRox Go Beyond
+Checks the shipped policy against the original severity mapping and the errors for bad rules
+"""
+
+import json
+import os
+import sys
+import unittest
+
+SECURITY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SECURITY_DIR)
+
+from severity_policy import DEFAULT_POLICY, PolicyError, SeverityPolicy, load_policy  # noqa: E402
+
+LEVELS = ['High', 'Medium', 'Low', 'Informational', 'Optimization', '']
+
+def baseline_slither_severity(impact: str, confidence: str) -> str:
+    """The impact/confidence mapping process-slither.py used before severity policies"""
+    impact, confidence = impact.lower(), confidence.lower()
+    if impact == 'high' and confidence == 'high':
+        return 'critical'
+    if (impact == 'high' and confidence == 'medium') or (impact == 'medium' and confidence == 'high'):
+        return 'high'
+    if (impact == 'medium' and confidence == 'medium') or (impact == 'high' and confidence == 'low'):
+        return 'medium'
+    if impact == 'low' or confidence == 'low':
+        return 'low'
+    return 'informational'
+
+def baseline_mythril_severity(level: str) -> str:
+    return level if level in ('High', 'Medium', 'Low') else 'Low'
+
+class ShippedPolicyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = load_policy(DEFAULT_POLICY)
+
+    def test_slither_matches_baseline_mapping(self):
+        for check in ('reentrancy-eth', 'tx-origin', 'unknown-detector'):
+            for impact in LEVELS:
+                for confidence in LEVELS:
+                    with self.subTest(check=check, impact=impact, confidence=confidence):
+                        self.assertEqual(self.policy.slither_severity(check, impact, confidence, 'contracts/A.sol'),
+                                         baseline_slither_severity(impact, confidence))
+
+    def test_timestamp_override_keeps_its_baseline_bucket(self):
+        # Slither reports `timestamp` at Low impact, which the baseline put in `low`
+        for confidence in ('High', 'Medium', 'Low'):
+            self.assertEqual(self.policy.slither_severity('timestamp', 'Low', confidence),
+                             baseline_slither_severity('Low', confidence))
+
+    def test_mythril_matches_baseline_mapping(self):
+        for level in LEVELS + ['high', 'Critical']:
+            for swc in ('107', '116', ''):
+                with self.subTest(level=level, swc=swc):
+                    self.assertEqual(self.policy.mythril_severity(level, swc, 'Some check', 'contracts/A.sol'),
+                                     baseline_mythril_severity(level))
+
+class PolicyValidationTest(unittest.TestCase):
+
+    def assertPolicyError(self, policy, *fragments):
+        with self.assertRaises(PolicyError) as raised:
+            SeverityPolicy(policy)
+        for fragment in fragments:
+            self.assertIn(fragment, str(raised.exception))
+
+    def test_bad_path_rule_is_named(self):
+        good = {'path': 'contracts/mocks/*', 'severity': 'low', 'tool': 'slither'}
+        bad = {'path': 'contracts/test/*', 'severity': 'low', 'tool': 'semgrep'}
+        self.assertPolicyError({'paths': [good, bad]}, f"Path rule 2 {json.dumps(bad)}", "unknown tool 'semgrep'")
+
+    def test_path_rule_fields(self):
+        self.assertPolicyError({'paths': [{'path': 'a/*', 'severity': 'low', 'level': 'x'}]},
+                               'Path rule 1', "unknown field 'level'")
+        self.assertPolicyError({'paths': [{'severity': 'low'}]}, 'Path rule 1', "'path' is required")
+        self.assertPolicyError({'paths': [{'path': 'a/*', 'severity': 'low', 'check': 7}]},
+                               "'check' must be a string")
+        self.assertPolicyError({'paths': ['contracts/*']}, 'Path rule 1 "contracts/*"', 'must be a JSON object')
+
+    def test_path_rule_severity_must_fit_its_tools(self):
+        # Without a tool the severity must be a bucket of both tools
+        self.assertPolicyError({'paths': [{'path': 'a/*', 'severity': 'critical'}]},
+                               'Path rule 1', "mythril severity 'critical'")
+        SeverityPolicy({'paths': [{'path': 'a/*', 'severity': 'critical', 'tool': 'slither'}]})
+
+    def test_bad_sections(self):
+        self.assertPolicyError([], 'the policy must be a JSON object')
+        self.assertPolicyError({'paths': {}}, "'paths' must be a JSON array")
+        self.assertPolicyError({'slither': {'checks': []}}, "'slither.checks' must be a JSON object")
+        self.assertPolicyError({'slither': {'matrix': {'high': 'critical'}}}, "'slither.matrix.high'")
+        self.assertPolicyError({'mythril': {'swc': {'107': 'critical'}}}, "mythril severity 'critical'")
+
+    def test_path_rules_take_precedence(self):
+        policy = SeverityPolicy({'slither': {'matrix': {'high': {'high': 'critical'}}},
+                                 'paths': [{'path': 'contracts/mocks/*', 'severity': 'low', 'tool': 'slither'}]})
+        self.assertEqual(policy.slither_severity('reentrancy-eth', 'High', 'High', 'contracts/mocks/M.sol'), 'low')
+        self.assertEqual(policy.slither_severity('reentrancy-eth', 'High', 'High', './contracts/mocks/M.sol'), 'low')
+        self.assertEqual(policy.slither_severity('reentrancy-eth', 'High', 'High', 'contracts/Vault.sol'), 'critical')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the Slither Analysis Cache of PayRox Go Beyond
+Feeds run-slither.py style merged reports through stream_slither_report with a cache
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+SECURITY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SECURITY_DIR)
+
+from analysis_cache import AnalysisCache, contract_keys, discover_contracts, project_key  # noqa: E402
+from slither_processor import stream_slither_report  # noqa: E402
+
+def detector(check: str, filename: str, impact: str = 'High') -> dict:
+    return {'check': check, 'impact': impact, 'confidence': 'High', 'id': f"{check}-{filename}",
+            'description': f"{check} in {filename}",
+            'elements': [{'type': 'function', 'name': 'withdraw',
+                          'source_mapping': {'filename_relative': filename, 'lines': [3, 4]}}]}
+
+class SlitherCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workdir)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.workdir)
+        os.makedirs('contracts')
+        for name in ('Alpha', 'Beta'):
+            with open(f"contracts/{name}.sol", 'w') as f:
+                f.write(f"// SPDX-License-Identifier: MIT\ncontract {name} {{}}\n")
+        self.keys = contract_keys(discover_contracts('contracts'), 'slither', 'stub', None)
+
+    def report(self, detectors, **header) -> str:
+        path = os.path.join(self.workdir, 'slither-report.json')
+        with open(path, 'w') as f:
+            json.dump(dict({'results': {'detectors': detectors}}, **header), f)
+        return path
+
+    def process(self, report: str):
+        cache = AnalysisCache(os.path.join(self.workdir, 'cache'))
+        categories = stream_slither_report(report, cache, self.keys)
+        return categories, AnalysisCache(os.path.join(self.workdir, 'cache'))
+
+    def test_failed_target_is_not_cached(self):
+        # Beta's target failed: run-slither.py marks the merged report unsuccessful
+        report = self.report([detector('reentrancy-eth', 'contracts/Alpha.sol')], success=False,
+                             error='slither-Beta.json: solc: compilation failed',
+                             analyzed=['contracts/Alpha.sol'])
+        categories, cache = self.process(report)
+        self.assertEqual(len(categories['critical']), 1)
+        self.assertNotIn(self.keys['contracts/Beta.sol'], cache)
+        self.assertNotIn(self.keys['contracts/Alpha.sol'], cache)
+        self.assertNotIn(project_key(self.keys), cache)
+        # Findings staged on disk for the cache are dropped with the report
+        self.assertEqual([name for name in os.listdir(cache.cache_dir) if name.endswith('.pending')], [])
+
+    def test_only_analyzed_contracts_are_cached(self):
+        report = self.report([detector('reentrancy-eth', 'contracts/Alpha.sol')], success=True, error=None,
+                             analyzed=['contracts/Alpha.sol'])
+        _, cache = self.process(report)
+        self.assertIn(self.keys['contracts/Alpha.sol'], cache)
+        self.assertNotIn(self.keys['contracts/Beta.sol'], cache)
+        # Findings outside the contracts were not looked for across the whole project
+        self.assertNotIn(project_key(self.keys), cache)
+
+    def test_cached_findings_are_restored(self):
+        report = self.report([detector('reentrancy-eth', 'contracts/Alpha.sol'),
+                              detector('tx-origin', 'lib/Helper.sol', 'Medium')], success=True, error=None)
+        _, cache = self.process(report)
+        for key in list(self.keys.values()) + [project_key(self.keys)]:
+            self.assertIn(key, cache)
+
+        # Nothing stale: run-slither.py is skipped and a placeholder report processed
+        categories, _ = self.process(self.report([], success=True, error=None, analyzed=[]))
+        self.assertEqual([finding.filename for finding in categories['critical']], ['contracts/Alpha.sol'])
+        self.assertEqual(sum(len(findings) for findings in categories.values()), 2)
+
+if __name__ == '__main__':
+    unittest.main()
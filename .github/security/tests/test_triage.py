@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the Finding Triage Store of PayRox Go Beyond
+Checks suppression, acceptance and expiry at the date boundary
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+SECURITY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SECURITY_DIR)
+
+from baseline_diff import fingerprint  # noqa: E402
+from findings import Finding  # noqa: E402
+from triage import TriageStore, load_triage, save_triage  # noqa: E402
+
+def finding(check: str, severity: str, line: int = 10) -> Finding:
+    return Finding.from_slither({'check': check, 'impact': 'High', 'confidence': 'High', 'description': check,
+                                 'elements': [{'type': 'function', 'name': 'withdraw',
+                                               'source_mapping': {'filename_relative': 'contracts/Vault.sol',
+                                                                  'lines': [line]}}]}, severity)
+
+def entry(target: Finding, status: str, expires: str = None) -> dict:
+    record = {'fingerprint': fingerprint(target), 'status': status, 'reason': 'reviewed', 'owner': 'security'}
+    if expires:
+        record['expires'] = expires
+    return record
+
+class TriageStoreTest(unittest.TestCase):
+
+    def test_expiry_at_the_date_boundary(self):
+        target = finding('reentrancy-eth', 'critical')
+        for expires, active in (('2026-02-28', False), ('2026-03-01', True), ('2026-03-02', True), (None, True)):
+            with self.subTest(expires=expires):
+                store = TriageStore([entry(target, 'suppressed', expires)], today='2026-03-01')
+                # An entry still applies on its expiry date and lapses the day after
+                self.assertEqual(store.status(target), 'suppressed' if active else None)
+                self.assertEqual(len(store.expired), 0 if active else 1)
+                self.assertEqual(len(store.entries), 1)
+
+    def test_expiry_crosses_month_and_year(self):
+        target = finding('reentrancy-eth', 'critical')
+        store = TriageStore([entry(target, 'accepted', '2025-12-31')], today='2026-01-01')
+        self.assertIsNone(store.status(target))
+        store = TriageStore([entry(target, 'accepted', '2026-01-01')], today='2026-01-01')
+        self.assertEqual(store.status(target), 'accepted')
+
+    def test_apply_suppresses_and_downgrades(self):
+        suppressed = finding('reentrancy-eth', 'critical')
+        accepted = finding('tx-origin', 'high')
+        kept = finding('suicidal', 'critical')
+        already_low = finding('timestamp', 'informational')
+        store = TriageStore([entry(suppressed, 'suppressed'), entry(accepted, 'accepted'),
+                             entry(already_low, 'accepted')], today='2026-03-01')
+        categories = {'critical': [suppressed, kept], 'high': [accepted], 'medium': [], 'low': [],
+                      'informational': [already_low]}
+        counts = store.apply(categories, 'informational')
+        self.assertEqual(counts, {'suppressed': 1, 'accepted': 1})
+        self.assertEqual(categories['critical'], [kept])
+        self.assertEqual(categories['high'], [])
+        self.assertEqual(categories['informational'], [already_low, accepted])
+        self.assertEqual(accepted.severity, 'informational')
+        self.assertEqual(list(store.filter([suppressed, accepted, kept])), [accepted, kept])
+
+    def test_expired_entries_do_not_apply(self):
+        target = finding('reentrancy-eth', 'critical')
+        store = TriageStore([entry(target, 'suppressed', '2026-02-28')], today='2026-03-01')
+        categories = {'critical': [target], 'informational': []}
+        self.assertEqual(store.apply(categories, 'informational'), {'suppressed': 0, 'accepted': 0})
+        self.assertEqual(categories['critical'], [target])
+
+    def test_save_and_load(self):
+        workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, workdir)
+        path = os.path.join(workdir, 'triage.json')
+        target = finding('reentrancy-eth', 'critical')
+        save_triage([dict(entry(target, 'accepted', '2999-01-01'), note='dropped')], path)
+        with open(path) as f:
+            saved = json.load(f)['entries']
+        self.assertNotIn('note', saved[0])
+        self.assertEqual(load_triage(path).status(target), 'accepted')
+        self.assertIsNone(load_triage(os.path.join(workdir, 'missing.json')))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Finding Triage Store for PayRox Go Beyond
+Accepted and suppressed finding fingerprints with reason, owner and expiry
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import date
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Set
+
+from baseline_diff import fingerprint, normalize_path
+from findings import Finding
+
+DEFAULT_TRIAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'triage.json')
+
+# suppressed: dropped from every output and the score
+# accepted: still listed, but downgraded to the tool's lowest severity
+STATUSES = ('suppressed', 'accepted')
+
+ENTRY_KEYS = ['fingerprint', 'status', 'reason', 'owner', 'expires', 'tool', 'check', 'location']
+
+class TriageStore:
+    """Active triage decisions, loaded into one hash set per status
+
+    Entries whose `expires` date (YYYY-MM-DD) has passed are left out at load
+    time, so those findings resurface without anyone editing the store.
+    ISO dates order lexically, which keeps loading to a string comparison per
+    entry even for tens of thousands of entries.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]] = (), today: Optional[str] = None):
+        today = today or date.today().isoformat()
+        self.suppressed: Set[str] = set()
+        self.accepted: Set[str] = set()
+        self.expired: List[Dict[str, Any]] = []
+        self.entries: List[Dict[str, Any]] = []
+        for entry in entries:
+            self.entries.append(entry)
+            expires = entry.get('expires')
+            if expires and expires < today:
+                self.expired.append(entry)
+                continue
+            status = entry.get('status')
+            if status == 'suppressed':
+                self.suppressed.add(entry['fingerprint'])
+            elif status == 'accepted':
+                self.accepted.add(entry['fingerprint'])
+
+    def __len__(self) -> int:
+        return len(self.suppressed) + len(self.accepted)
+
+    def status(self, finding: Finding) -> Optional[str]:
+        fp = fingerprint(finding)
+        if fp in self.suppressed:
+            return 'suppressed'
+        if fp in self.accepted:
+            return 'accepted'
+        return None
+
+    def resolve(self, finding: Finding, lowest: str) -> Optional[str]:
+        """Severity to report the finding at, or None when it is suppressed"""
+        status = self.status(finding) if self else None
+        if status == 'suppressed':
+            return None
+        if status == 'accepted':
+            return lowest
+        return finding.severity
+
+    def apply(self, categories: Dict[str, List[Finding]], lowest: str) -> Dict[str, int]:
+        """Drop suppressed findings and move accepted ones to `lowest`, in place"""
+        counts = {'suppressed': 0, 'accepted': 0}
+        if not self:
+            return counts
+        downgraded: List[Finding] = []
+        for severity, findings in categories.items():
+            kept = []
+            for finding in findings:
+                status = self.status(finding)
+                if status == 'suppressed':
+                    counts['suppressed'] += 1
+                elif status == 'accepted' and severity != lowest:
+                    counts['accepted'] += 1
+                    finding.severity = lowest
+                    downgraded.append(finding)
+                else:
+                    kept.append(finding)
+            findings[:] = kept
+        categories[lowest].extend(downgraded)
+        return counts
+
+    def filter(self, findings: Iterable[Finding]) -> Iterator[Finding]:
+        """Findings that are not suppressed, e.g. from a baseline run"""
+        for finding in findings:
+            if not self or fingerprint(finding) not in self.suppressed:
+                yield finding
+
+def load_triage(path: str) -> Optional[TriageStore]:
+    """Load a triage store, or None when the file does not exist"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            return TriageStore(json.load(f).get('entries', []))
+    except Exception as e:
+        print(f"Warning: Could not load triage store {path}: {e}")
+        return None
+
+def save_triage(entries: List[Dict[str, Any]], path: str) -> None:
+    """Write the store with one entry per line, so reviews diff cleanly"""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        f.write('{\n  "entries": [')
+        for index, entry in enumerate(entries):
+            f.write(',\n    ' if index else '\n    ')
+            f.write(json.dumps({key: entry[key] for key in ENTRY_KEYS if key in entry}))
+        f.write('\n  ]\n}\n' if entries else ']\n}\n')
+    os.replace(temp_path, path)
+
+def add_triage_arguments(parser) -> None:
+    """--triage / --no-triage options shared by the security scripts"""
+    parser.add_argument('--triage', default=DEFAULT_TRIAGE, help='Triage store of accepted/suppressed findings')
+    parser.add_argument('--no-triage', action='store_true', help='Report every finding, ignoring the triage store')
+
+def triage_from_args(args) -> Optional[TriageStore]:
+    if args.no_triage:
+        return None
+    triage = load_triage(args.triage)
+    if triage is not None and triage.expired:
+        print(f"⚠️ {len(triage.expired)} triage entries in {args.triage} have expired; those findings are reported again")
+    return triage
+
+def finding_location(finding: Finding) -> str:
+    if finding.spans:
+        filename, start, end = finding.spans[0]
+        return f"{normalize_path(filename)}#L{start}-L{end}"
+    return normalize_path(finding.filename)
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the PayRox Go Beyond finding triage store')
+    parser.add_argument('--store', default=DEFAULT_TRIAGE, help='Triage store')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help='Triage the findings of a run that match a check and/or path')
+    add.add_argument('--slither-report', help='Slither JSON report')
+    add.add_argument('--mythril-dir', help='Directory containing mythril-*.json reports')
+    add.add_argument('--check', help='Only findings of this Slither detector or Mythril title')
+    add.add_argument('--path', help='Only findings in files containing this path')
+    add.add_argument('--fingerprint', action='append', default=[], help='Only these fingerprints')
+    add.add_argument('--status', choices=STATUSES, default='accepted', help='Triage decision')
+    add.add_argument('--reason', required=True, help='Why the finding is accepted or suppressed')
+    add.add_argument('--owner', required=True, help='Who made the decision')
+    add.add_argument('--expires', help='YYYY-MM-DD after which the findings are reported again')
+
+    listing = commands.add_parser('list', help='Show triage entries')
+    listing.add_argument('--expired', action='store_true', help='Only expired entries')
+
+    commands.add_parser('prune', help='Remove expired entries')
+
+    args = parser.parse_args()
+    triage = load_triage(args.store) or TriageStore()
+
+    if args.command == 'list':
+        shown = triage.expired if args.expired else triage.entries
+        for entry in shown:
+            print(f"{entry['fingerprint'][:12]}  {entry.get('status', ''):<10} {entry.get('expires') or 'never':<10} "
+                  f"{entry.get('owner', ''):<16} {entry.get('check', '')} {entry.get('location', '')}")
+            print(f"{'':14}{entry.get('reason', '')}")
+        print(f"{len(shown)} entries ({len(triage)} active, {len(triage.expired)} expired)")
+        return
+
+    if args.command == 'prune':
+        expired = {id(entry) for entry in triage.expired}
+        save_triage([entry for entry in triage.entries if id(entry) not in expired], args.store)
+        print(f"Removed {len(expired)} expired entries from {args.store}")
+        return
+
+    if not args.slither_report and not args.mythril_dir:
+        parser.error('add needs --slither-report and/or --mythril-dir')
+    if not args.check and not args.path and not args.fingerprint:
+        parser.error('add needs at least one of --check, --path or --fingerprint')
+    if args.expires:
+        try:
+            date.fromisoformat(args.expires)
+        except ValueError:
+            parser.error(f"--expires must be YYYY-MM-DD, got {args.expires}")
+    for path in filter(None, [args.slither_report, args.mythril_dir]):
+        if not os.path.exists(path):
+            print(f"Error: {path} not found")
+            sys.exit(1)
+
+    # Imported here so processors loading the store don't pull in the history module
+    from findings_history import load_run_findings
+
+    wanted = set(args.fingerprint)
+    # A re-triaged finding replaces its earlier entry
+    existing = {entry['fingerprint']: index for index, entry in enumerate(triage.entries)}
+    entries = list(triage.entries)
+    added = 0
+    for finding in load_run_findings(args.slither_report, args.mythril_dir):
+        if args.check and finding.check != args.check:
+            continue
+        if args.path and args.path not in normalize_path(finding.filename):
+            continue
+        fp = fingerprint(finding)
+        if wanted and fp not in wanted:
+            continue
+        entry = {'fingerprint': fp, 'status': args.status, 'reason': args.reason, 'owner': args.owner,
+                 'expires': args.expires, 'tool': finding.tool, 'check': finding.check,
+                 'location': finding_location(finding)}
+        if fp in existing:
+            entries[existing[fp]] = entry
+        else:
+            existing[fp] = len(entries)
+            entries.append(entry)
+            added += 1
+    save_triage(entries, args.store)
+    print(f"Triaged {added} new findings as {args.status} in {args.store} ({len(entries)} entries)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Security Report Watcher for PayRox Go Beyond
+Re-processes Slither and Mythril reports as they land and re-renders only the affected summaries
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+import mythril_processor
+import slither_processor
+from bulk_loader import LoadErrors
+from compact_reports import find_report, is_raw_mythril_report
+from findings import Finding
+from report_renderer import REPORT_FORMATS, ReportContext, ReportSink, parse_formats, render_report, report_sinks
+from security_pipeline import GATE_FILE, MYTHRIL_LOAD_ERRORS, build_verdict, score_inputs
+from security_summary import SecuritySummarySink, calculate_security_score
+from severity_policy import DEFAULT_POLICY, load_policy, use_policy
+from source_snippets import SnippetIndex, add_snippet_arguments, snippets_from_args
+from triage import DEFAULT_TRIAGE, TriageStore, load_triage
+
+# A stat of the reports directory per interval; tools write whole files, so
+# a changed (mtime, size) pair is the only signal needed
+DEFAULT_INTERVAL = 0.2
+
+Signature = Tuple[int, int]
+
+def file_signature(path: str) -> Optional[Signature]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class ReportWatcher:
+    """In-memory categorized state for one reports directory
+
+    Mythril findings are kept per report file, so a new or rewritten report
+    costs one file parse; Slither writes a single report, which is re-streamed
+    when it changes. Only the outputs of tools whose inputs changed are
+    rendered again, plus the combined summary that depends on both.
+    """
+
+    def __init__(self, reports_dir: str, output_dir: str, summary_path: Optional[str],
+                 formats: List[str], triage_path: Optional[str], policy_path: Optional[str] = None,
+                 snippets: Optional[SnippetIndex] = None):
+        self.reports_dir = reports_dir
+        self.output_dir = output_dir
+        self.summary_path = summary_path
+        self.formats = formats
+        self.triage_path = triage_path
+        self.triage: Optional[TriageStore] = None
+        self.policy_path = policy_path
+        self.snippets = snippets
+
+        self.signatures: Dict[str, Signature] = {}
+        self.slither_report: Optional[str] = None
+        self.slither: Optional[Dict[str, List[Finding]]] = None
+        self.slither_triage: Optional[Dict[str, int]] = None
+        self.mythril: Dict[str, Dict[str, List[Finding]]] = {}
+        self.mythril_triage: Dict[str, Dict[str, int]] = {}
+        self.mythril_errors: Dict[str, LoadErrors] = {}
+        self.security_score: Optional[Dict[str, Any]] = None
+
+    def _changed(self, path: str) -> bool:
+        signature = file_signature(path)
+        if signature is None:
+            return self.signatures.pop(path, None) is not None
+        if self.signatures.get(path) == signature:
+            return False
+        self.signatures[path] = signature
+        return True
+
+    def _triaged(self, categories: Dict[str, List[Finding]], lowest: str) -> Optional[Dict[str, int]]:
+        return self.triage.apply(categories, lowest) if self.triage is not None else None
+
+    def _parse_slither(self) -> None:
+        if self.slither_report is None:
+            self.slither = self.slither_triage = None
+            return
+        self.slither = slither_processor.stream_slither_report(self.slither_report)
+        self.slither_triage = self._triaged(self.slither, slither_processor.SEVERITIES[-1])
+
+    def _parse_mythril(self, path: str) -> None:
+        errors = self.mythril_errors[path] = LoadErrors()
+        issues = mythril_processor.load_mythril_report(path, errors)
+        categories = mythril_processor.categorize_mythril_findings(issues)
+        self.mythril_triage[path] = self._triaged(categories, mythril_processor.SEVERITIES[-1])
+        self.mythril[path] = categories
+
+    def scan(self) -> Tuple[Set[str], List[str]]:
+        """Re-parse whatever changed since the last scan
+
+        Returns the tools whose findings changed and the files responsible.
+        """
+        tools: Set[str] = set()
+        changed: List[str] = []
+
+        # A new or edited severity policy or triage store changes every finding's verdict
+        reparse = False
+        if self.policy_path and self._changed(self.policy_path):
+            try:
+                use_policy(load_policy(self.policy_path))
+                reparse = True
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not load severity policy {self.policy_path}: {e}; keeping the previous one")
+            changed.append(self.policy_path)
+        if self.triage_path and self._changed(self.triage_path):
+            self.triage = load_triage(self.triage_path)
+            changed.append(self.triage_path)
+            reparse = True
+        if reparse:
+            self._parse_slither()
+            for path in self.mythril:
+                self._parse_mythril(path)
+            tools.update(['slither'] if self.slither_report else [])
+            tools.update(['mythril'] if self.mythril else [])
+
+        slither_report = find_report(os.path.join(self.reports_dir, 'slither-report.json'))
+        if slither_report != self.slither_report:
+            if self.slither_report:
+                self.signatures.pop(self.slither_report, None)
+            self.slither_report = slither_report
+        if (slither_report and self._changed(slither_report)) or (not slither_report and self.slither is not None):
+            self._parse_slither()
+            changed.append(slither_report or 'slither-report.json')
+            tools.add('slither')
+
+        present = set()
+        with os.scandir(self.reports_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and is_raw_mythril_report(entry.name):
+                    present.add(entry.path)
+        for path in sorted(present):
+            if self._changed(path):
+                self._parse_mythril(path)
+                changed.append(path)
+                tools.add('mythril')
+        for path in [path for path in self.mythril if path not in present]:
+            del self.mythril[path]
+            self.mythril_triage.pop(path, None)
+            self.mythril_errors.pop(path, None)
+            self.signatures.pop(path, None)
+            changed.append(path)
+            tools.add('mythril')
+
+        return tools, changed
+
+    def mythril_categories(self) -> Optional[Dict[str, List[Finding]]]:
+        """Per-file findings merged in file name order, without re-parsing"""
+        if not self.mythril:
+            return None
+        merged: Dict[str, List[Finding]] = {severity: [] for severity in mythril_processor.SEVERITIES}
+        for path in sorted(self.mythril):
+            for severity, findings in self.mythril[path].items():
+                merged[severity].extend(findings)
+        return merged
+
+    def mythril_load_errors(self) -> LoadErrors:
+        """Reports that could not be read on their last parse"""
+        merged = LoadErrors()
+        for errors in self.mythril_errors.values():
+            merged.files += errors.files
+            merged.errors.extend(errors)
+        return merged
+
+    def _mythril_triage(self) -> Optional[Dict[str, int]]:
+        if self.triage is None or not self.mythril:
+            return None
+        return {status: sum(counts[status] for counts in self.mythril_triage.values() if counts)
+                for status in ('suppressed', 'accepted')}
+
+    def render(self, tools: Set[str]) -> List[str]:
+        """One rendering pass over the affected outputs; returns the files written"""
+        mythril_categories = self.mythril_categories()
+        load_errors = self.mythril_load_errors()
+        slither_data, mythril_data, correlation = score_inputs(self.slither, mythril_categories)
+        security_score = calculate_security_score(slither_data, mythril_data)
+
+        results = []
+        sinks: List[ReportSink] = []
+        if self.slither is not None:
+            results.append(slither_processor.tool_results(self.slither))
+            if 'slither' in tools:
+                sinks.extend(slither_processor.report_sinks(self.output_dir))
+        if mythril_categories is not None:
+            results.append(mythril_processor.tool_results(mythril_categories))
+            if 'mythril' in tools:
+                sinks.extend(mythril_processor.report_sinks(self.output_dir))
+        if self.summary_path:
+            sinks.append(SecuritySummarySink(self.summary_path))
+            sinks.extend(report_sinks(os.path.dirname(self.summary_path), self.formats))
+        # Contracts edited since the last pass are re-mapped on next use
+        if self.snippets is not None:
+            self.snippets.refresh()
+        render_report(ReportContext(results, security_score, slither_data, mythril_data, snippets=self.snippets,
+                                    correlation=correlation), sinks)
+
+        written = [sink.path for sink in sinks]
+        if mythril_categories is not None and 'mythril' in tools:
+            errors_path = os.path.join(self.output_dir, MYTHRIL_LOAD_ERRORS)
+            load_errors.write(errors_path)
+            written.append(errors_path)
+        if self.summary_path:
+            slither = mythril = None
+            if self.slither is not None:
+                slither = {'categories': self.slither, 'diff': None, 'gating': self.slither['critical'],
+                           'changed': None, 'triage': self.slither_triage}
+            if mythril_categories is not None:
+                mythril = {'categories': mythril_categories, 'diff': None, 'gating': [],
+                           'changed': None, 'triage': self._mythril_triage(), 'load_errors': load_errors}
+            gate_path = os.path.join(os.path.dirname(self.summary_path), GATE_FILE)
+            with open(gate_path, 'w') as f:
+                json.dump(build_verdict(slither, mythril, security_score, correlation), f, indent=2)
+            written.append(gate_path)
+        self.security_score = security_score
+        return written
+
+def _label(paths: List[str]) -> str:
+    names = [os.path.basename(path) for path in paths]
+    return ', '.join(names[:3]) + (f" (+{len(names) - 3} more)" if len(names) > 3 else '')
+
+def watch(watcher: ReportWatcher, interval: float, once: bool = False) -> None:
+    """Scan, re-render what changed, sleep; forever unless `once`"""
+    first = True
+    while True:
+        start = time.perf_counter()
+        tools, changed = watcher.scan()
+        if tools or (first and watcher.summary_path):
+            written = watcher.render(tools)
+            elapsed = (time.perf_counter() - start) * 1000
+            score = watcher.security_score
+            print(f"🔄 {_label(changed) or 'initial state'} -> {_label(written)} "
+                  f"({elapsed:.0f} ms, score {score['score']}/100 {score['status']})", flush=True)
+        elif changed:
+            print(f"🔄 {_label(changed)} changed", flush=True)
+        first = False
+        if once:
+            return
+        time.sleep(interval)
+
+def main():
+    parser = argparse.ArgumentParser(description='Watch a reports directory and keep the security summaries current')
+    parser.add_argument('reports_dir', help='Directory the tools write slither-report.json and mythril-*.json to')
+    parser.add_argument('--output-dir', help='Directory for per-tool summaries (default: the reports directory)')
+    parser.add_argument('--summary', help='Combined security summary (default: security-summary.md in the output dir)')
+    parser.add_argument('--no-summary', action='store_true', help='Only keep the per-tool summaries current')
+    parser.add_argument('--formats', type=parse_formats, default=list(REPORT_FORMATS),
+                        help=f"Reports written next to the summary (default: {','.join(REPORT_FORMATS)})")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help='Seconds between scans')
+    parser.add_argument('--policy', default=DEFAULT_POLICY, help='Severity policy, reloaded when it changes')
+    parser.add_argument('--triage', default=DEFAULT_TRIAGE, help='Triage store, reloaded when it changes')
+    parser.add_argument('--no-triage', action='store_true', help='Report every finding, ignoring the triage store')
+    parser.add_argument('--once', action='store_true', help='Process the current reports and exit')
+    add_snippet_arguments(parser)
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.reports_dir):
+        print(f"Error: Reports directory {args.reports_dir} not found")
+        sys.exit(1)
+
+    output_dir = args.output_dir or args.reports_dir
+    os.makedirs(output_dir, exist_ok=True)
+    summary_path = None if args.no_summary else args.summary or os.path.join(output_dir, 'security-summary.md')
+    watcher = ReportWatcher(args.reports_dir, output_dir, summary_path, args.formats,
+                            None if args.no_triage else args.triage, args.policy, snippets_from_args(args))
+
+    print(f"👀 Watching {args.reports_dir} every {args.interval}s (Ctrl-C to stop)")
+    try:
+        watch(watcher, args.interval, args.once)
+    except KeyboardInterrupt:
+        print("Stopped watching")
+
+if __name__ == "__main__":
+    main()